@@ -17,6 +17,12 @@ try:
 except:
     print("python numpy package not found");
 
+try:
+    import scipy;
+    print("python scipy package found");
+except:
+    print("python scipy package not found");
+
 try:
     import pandas;
     print("python pandas package found");
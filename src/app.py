@@ -32,17 +32,25 @@ V1.1.1 : March 28, 2020 By Akshay Arvind Laturkar
 V1.1.2 : Marxh 29, 2020 By Akshay Arvind Laturkar
          Bug Fix, If redundant lines are present between buses, P was same
          Bug Fix, When Bus order is changed, YBus was wrongly referenced (No changes in this file)
+V1.2.0 : October 19, 2026
+         Networks split into islands are solved island by island, one slack bus per island
+         Network is compiled once on validation and shared by every load flow run
+         Validated feeds are kept as a compact network.Network, built once and passed to the solver as is
+         Bus No may be any distinct integers, no longer required to be 1..N
+         Editable Bus and Line feed views, edits re-solved incrementally in the background
 '''
 
 
 import sys; 
 import gi;
 gi.require_version('Gtk', '3.0');
-from gi.repository import Gtk;
+from gi.repository import Gtk,GLib;
 import numpy as np;
 import pandas as pd;
 from collections import Counter;
-import loadflow as solver;
+import network;
+import incremental;
+import threading;
 import signal;
 import os;
 import shutil;
@@ -122,6 +130,12 @@ class LoadFlowApp:
             self.busfilestatus = 0;
             self.buses = 0;
             self.YBus = None;
+            self.case = None;
+            self.net = None;
+            self.inc = None;
+            self.last = None;
+            self.whatif = {'busy':False,'pending':False};
+            self.views = {'bus':[],'line':[]};
             self.iter = 0;
             self.OriginalBT = None;
             self.VLimit = True;
@@ -131,16 +145,10 @@ class LoadFlowApp:
             self.rnwdata = None;
 
             # App Constants
-            self.NW_HEADER = {'Line No':'int64','From Bus':'int64','To Bus':'int64',
-                    'R':'float64','X':'float64','B/2':'float64','T':'float64'};
-            self.BUS_HEADER = {'Bus No':'int64','Bus Type':'str','Pd':'float64','Qd':'float64',
-                    'Pg':'float64','Qg':'float64','V':'float64','Shunt Feed':'float64','Qg (min)':'float64',
-                    'Qg (max)':'float64','V (min)':'float64','V (max)':'float64'};
-            self.NW_HEADER_DEFAULT = {'Line No':0,'From Bus':0,'To Bus':0,
-                    'R':0.0,'X':0.0,'B/2':0.0,'T':1.0};
-            self.BUS_HEADER_DEFAULT = {'Bus No':0,'Bus Type':'','Pd':0.0,'Qd':0.0,
-                    'Pg':0.0,'Qg':0.0,'V':1.0,'Shunt Feed':0.0,'Qg (min)':0.0,
-                    'Qg (max)':0.0,'V (min)':0.0,'V (max)':0.0};
+            self.NW_HEADER = network.NW_HEADER;
+            self.BUS_HEADER = network.BUS_HEADER;
+            self.NW_HEADER_DEFAULT = network.NW_HEADER_DEFAULT;
+            self.BUS_HEADER_DEFAULT = network.BUS_HEADER_DEFAULT;
 
             # Attach filters to file upload
             filter_file = Gtk.FileFilter();
@@ -481,13 +489,12 @@ class LoadFlowApp:
                                 self.msgdialog("Error","'" + col + "' cannot be negative in Bus Feed File");
                                 return;
                             if col == 'Bus No':
-                                res = np.unique(list(Counter(self.busdata[col]).values()));
-                                if(len(res) == 1 and res[0] == 1 and np.min(self.busdata[col]) == 1 
-                                        and np.max(self.busdata[col]) == len(self.busdata[col])):
-                                    self.buses = np.max(self.busdata[col]);
+                                # Any distinct Bus No are accepted, buses are indexed by their row
+                                if len(np.unique(self.busdata[col])) == len(self.busdata[col]):
+                                    self.buses = len(self.busdata[col]);
                                 else:
                                     self.widgets['status'].set_text('Ready');
-                                    self.msgdialog("Error","Bus No's are not in proper sequence");
+                                    self.msgdialog("Error","Bus No's are repeated in Bus Feed");
                                     return;
                                 if self.buses < 2:
                                     self.widgets['status'].set_text('Ready');
@@ -498,9 +505,10 @@ class LoadFlowApp:
                                 self.widgets['status'].set_text('Ready');
                                 self.msgdialog("Error","Unknown bus type detected in Bus Feed");
                                 return;
-                            if Counter(self.busdata[col])['Slack'] != 1:
+                            # One slack per island is checked by the topology processor
+                            if Counter(self.busdata[col])['Slack'] < 1:
                                 self.widgets['status'].set_text('Ready');
-                                self.msgdialog("Error","More than 1 slack bus is not supported by the application.");
+                                self.msgdialog("Error","Atleast 1 slack bus is required by the application.");
                                 return;
                     except ValueError:
                         self.widgets['status'].set_text('Ready');
@@ -528,14 +536,14 @@ class LoadFlowApp:
                                 self.msgdialog("Error","'" + col + "' cannot be negative in Line Feed File");
                                 return;
                         if col == 'From Bus':
-                            if np.min(self.nwdata[col]) in list(self.busdata['Bus No']) and np.max(self.nwdata[col]) in list(self.busdata['Bus No']):
+                            if np.all(np.isin(self.nwdata[col],self.busdata['Bus No'])):
                                 pass;
                             else:
                                 self.widgets['status'].set_text('Ready');
                                 self.msgdialog("Error","Invalid 'Bus No' in 'From Bus' of Line Feed");
                                 return;
                         if col == 'To Bus':
-                            if np.min(self.nwdata[col]) in list(self.busdata['Bus No']) and np.max(self.nwdata[col]) in list(self.busdata['Bus No']):
+                            if np.all(np.isin(self.nwdata[col],self.busdata['Bus No'])):
                                 pass;
                             else:
                                 self.widgets['status'].set_text('Ready');
@@ -551,22 +559,13 @@ class LoadFlowApp:
                     return;
             self.nwdata = nw.copy();
 
-            self.YBus = np.zeros((self.buses,self.buses),dtype=complex);
-            for idx in range(0,len(self.nwdata)):
-                i = int(self.nwdata.iloc[idx]['From Bus']-1);
-                j = int(self.nwdata.iloc[idx]['To Bus']-1);
-                y = 1/(self.nwdata.iloc[idx]['R']+self.nwdata.iloc[idx]['X']*1j);
-                b = self.nwdata.iloc[idx]['B/2']*1j;
-                a = 1/self.nwdata.iloc[idx]['T'];
-                self.YBus[i][i] += (a**2)*(y+b);
-                self.YBus[i][j] -= a*y;
-                self.YBus[j][i] -= a*y;
-                self.YBus[j][j] += y+b;
-
-            for idx in range(0,len(self.busdata)):
-                i = int(self.busdata.iloc[idx]['Bus No']-1);
-                b = self.busdata.iloc[idx]['Shunt Feed']*1j;
-                self.YBus[i][i] += b;
+            # Compact network built once from the validated feeds, YBus and compiled case with it
+            self.net = network.Network.FromFrames(self.busdata,self.nwdata);
+            self.YBus = self.net.YBus();
+            self.case = self.net.Compile();
+            # What-if edits from the feed views are applied to this editor
+            self.inc = incremental.Incremental(*self.net.Args(self.MaxIter,self.VLimit,self.QLimit),self.net.T);
+            self.last = None;
 
             # Set Widget status
             self.widgets['nonetworkfileimg'].hide();
@@ -594,47 +593,171 @@ class LoadFlowApp:
     def on_beginloadflow_clicked(self,widget):
         try:
             self.widgets['status'].set_text('Performing Load Flow');
-            data = self.busdata;
-            P = np.array(data['Pg']-data['Pd']).reshape((self.buses,1));
-            Q = np.array(data['Qg']-data['Qd']).reshape((self.buses,1));
-            Qmin = np.array(data['Qg (min)']).reshape((self.buses,1));
-            Qmax = np.array(data['Qg (max)']).reshape((self.buses,1));
-            Qd = np.array(data['Qd']).reshape((self.buses,1));
-            Q = np.c_[Q,Qmin,Qmax,Qd];
-            V = np.array(data['V']).reshape((self.buses,1));
-            Vmin = np.array(data['V (min)']).reshape((self.buses,1));
-            Vmax = np.array(data['V (max)']).reshape((self.buses,1));
-            V = np.c_[V,Vmin,Vmax];
-            BT = np.array(data['Bus Type']).reshape((self.buses,1));
-            self.OriginalBT = BT.copy();
-            Line = np.array(self.nwdata[['Line No','From Bus','To Bus','B/2','R','X']]).reshape((len(self.nwdata),6));
-
-            # Added BNo data as part of Bug Fix -V1.1.2
-            BNo = np.array(data['Bus No']).reshape((self.buses,1));
+            self.OriginalBT = self.net.BusTypes();
 
             # Call Load Flow Solver
-            lf = solver.LoadFlow(self.buses,P,Q,V,BT,self.YBus,self.MaxIter,self.VLimit,self.QLimit,Line,BNo);
-
-            [rIter,rBT,rP,rQ,rV,rD,Pavg,Qavg,Ploss,Qloss] = lf.Solve();
-            self.rbusdata = self.busdata.copy();
-            self.rnwdata = self.nwdata.copy();
-            self.rbusdata['Pg'] = rP + np.array(self.rbusdata['Pd']).reshape((self.buses,1));
-            self.rbusdata['Qg'] = rQ[:,0].reshape((self.buses,1)) + Qd;
-            self.rbusdata['V'] = rV[:,0];
-            self.rbusdata['D'] = rD[:,0]*180/np.pi;
-            self.rbusdata['Bus Type'] = rBT[:,0];
-            self.rnwdata['Pavg'] = Pavg;
-            self.rnwdata['Ploss'] = Ploss;
-            self.rnwdata['Qavg'] = Qavg;
-            self.rnwdata['Qloss'] = Qloss;
-            self.iter = rIter;
-            self.msgdialog("Success","Load Flow Completed. Iterations taken : "+str(rIter));
+            # Islands are solved independently, with one slack bus each
+            # The editor holds the validated network with any what-if edits made in the feed views
+            self.__Settings();
+            result = self.inc.Solve();
+            self.__StoreResults(result);
+            self.msgdialog("Success","Load Flow Completed. Iterations taken : "+str(result[0]));
             self.widgets['viewresults'].set_sensitive(True);
             self.widgets['status'].set_text('Ready');
             self.widgets['results'].set_sensitive(True);
         except Exception as err:
             self.msglog(err);
 
+    def __Settings(self):
+        self.inc.Max = self.MaxIter;
+        self.inc.Vlimit = self.VLimit;
+        self.inc.Qlimit = self.QLimit;
+
+    '''
+    Keep a LoadFlow.Solve() result as the results tables
+    '''
+    def __StoreResults(self,result):
+        [rIter,rBT,rP,rQ,rV,rD,Pavg,Qavg,Ploss,Qloss] = result;
+        self.last = result;
+        self.rbusdata = self.busdata.copy();
+        self.rnwdata = self.nwdata.copy();
+        self.rbusdata['Pg'] = rP[:,0] + np.array(self.busdata['Pd']);
+        self.rbusdata['Qg'] = rQ[:,0] + np.array(self.busdata['Qd']);
+        self.rbusdata['V'] = rV[:,0];
+        self.rbusdata['D'] = rD[:,0]*180/np.pi;
+        self.rbusdata['Bus Type'] = rBT[:,0];
+        self.rnwdata['Pavg'] = Pavg;
+        self.rnwdata['Ploss'] = Ploss;
+        self.rnwdata['Qavg'] = Qavg;
+        self.rnwdata['Qloss'] = Qloss;
+        self.iter = rIter;
+
+    '''
+    Re-solve after a what-if edit in a background thread, warm started from the last results
+    Edits made while a solve runs are picked up by one more solve when it finishes
+    '''
+    def __WhatIf(self):
+        if self.last is None:
+            self.widgets['status'].set_text('Ready');
+            return;
+        if self.whatif['busy']:
+            self.whatif['pending'] = True;
+            return;
+        self.whatif['busy'] = True;
+        self.whatif['pending'] = False;
+        self.__Settings();
+        job = self.inc.Copy();      # Snapshot, edits can go on while it is solved
+        warm = (self.last[4][:,0],self.last[5][:,0]);
+        self.widgets['status'].set_text('Solving what-if...');
+        threading.Thread(target=self.__WhatIfSolve,args=(job,warm),daemon=True).start();
+
+    def __WhatIfSolve(self,job,warm):
+        try:
+            result = job.Solve(Warm=warm);
+            GLib.idle_add(self.__WhatIfDone,result,None);
+        except Exception as err:
+            GLib.idle_add(self.__WhatIfDone,None,err);
+
+    def __WhatIfDone(self,result,err):
+        self.whatif['busy'] = False;
+        if err is not None:
+            self.widgets['status'].set_text('What-if solve failed : '+str(err));
+        else:
+            self.__StoreResults(result);
+            self.__RefreshViews();
+            self.widgets['status'].set_text('What-if solved. Iterations taken : '+str(result[0]));
+        if self.whatif['pending']:
+            self.__WhatIf();
+        return False;
+
+    '''
+    Bus feed entry edited, column col of row i
+    '''
+    def on_busentry_edited(self,widget,*args):
+        i,col = args[-1];
+        try:
+            old = self.busdata[col].iloc[i];
+            # Focus leaving an untouched cell is no edit, the cell shows old rounded as below
+            text = widget.get_text().strip();
+            if text == "{0:.5f}".format(old):
+                return False;
+            try:
+                val = float(text);
+            except ValueError:
+                widget.set_text("{0:.5f}".format(old));
+                self.widgets['status'].set_text("Incorrect value for '" + col + "'");
+                return False;
+            if val == old:
+                return False;
+            row = {c:np.array([self.busdata[c].iloc[i]]) for c in ['Bus No','Bus Type','V','V (min)','V (max)']};
+            if col in row:
+                row[col] = np.array([val]);
+            msg = network.CheckBus(row);
+            if msg is not None:
+                widget.set_text("{0:.5f}".format(old));
+                self.widgets['status'].set_text(msg);
+                return False;
+
+            self.busdata.iloc[i,self.busdata.columns.get_loc(col)] = val;
+            bus = self.busdata.iloc[i];
+            self.inc.SetBus(bus['Bus No'],P=bus['Pg']-bus['Pd'],Q=bus['Qg']-bus['Qd'],Qmin=bus['Qg (min)'],Qmax=bus['Qg (max)'],
+                    Qd=bus['Qd'],V=bus['V'],Vmin=bus['V (min)'],Vmax=bus['V (max)']);
+            self.__WhatIf();
+        except Exception as err:
+            self.msglog(err,quit=False,msg=str(err));
+        return False;
+
+    '''
+    Line feed entry edited, column col of row k
+    '''
+    def on_lineentry_edited(self,widget,*args):
+        k,col = args[-1];
+        try:
+            old = self.nwdata[col].iloc[k];
+            # Focus leaving an untouched cell is no edit, the cell shows old rounded as below
+            text = widget.get_text().strip();
+            if text == "{0:.5f}".format(old):
+                return False;
+            try:
+                val = float(text);
+            except ValueError:
+                widget.set_text("{0:.5f}".format(old));
+                self.widgets['status'].set_text("Incorrect value for '" + col + "'");
+                return False;
+            if val == old:
+                return False;
+            row = {c:np.array([self.nwdata[c].iloc[k]]) for c in self.NW_HEADER};
+            row[col] = np.array([val]);
+            msg = network.CheckLine(row,self.busdata['Bus No']);
+            if msg is None and (row['T'][0] == 0 or (row['R'][0] == 0 and row['X'][0] == 0)):
+                msg = "'" + col + "' makes the line admittance undefined";
+            if msg is not None:
+                widget.set_text("{0:.5f}".format(old));
+                self.widgets['status'].set_text(msg);
+                return False;
+
+            self.nwdata.iloc[k,self.nwdata.columns.get_loc(col)] = val;
+            line = self.nwdata.iloc[k];
+            self.inc.EditLine(line['Line No'],R=line['R'],X=line['X'],B2=line['B/2'],T=line['T']);
+            self.__WhatIf();
+        except Exception as err:
+            self.msglog(err,quit=False,msg=str(err));
+        return False;
+
+    '''
+    Line taken out of or put back in service from the Line feed view
+    '''
+    def on_linestatus_toggled(self,widget,k):
+        try:
+            lno = self.nwdata['Line No'].iloc[k];
+            if widget.get_active():
+                self.inc.AddLine(lno);
+            else:
+                self.inc.RemoveLine(lno);
+            self.__WhatIf();
+        except Exception as err:
+            self.msglog(err,quit=False,msg=str(err));
+
     '''
     Remove Line Feed from filechooser dialog
     '''
@@ -698,21 +821,24 @@ class LoadFlowApp:
     '''
     Display Bus Data for Results as well as Input Data
     mode = Results => Final Output Data
-    mode = Data => Input Data
+    mode = Data => Input Data, values are editable and every edit is re-solved
     '''
     def __DisplayBusData(self,mode):
         try:
             dialog = None;
             if mode == 'Data':
-                dialog = Gtk.Dialog(title="Bus Feed",parent=self.app,modal=True,destroy_with_parent = True);
+                dialog = Gtk.Dialog(title="Bus Feed",parent=self.app,modal=False,destroy_with_parent = True);
                 height = (self.buses+2)*30;
-                shift = 0;
                 data = self.busdata;
+                columns = [('Bus No','Bus No'),('Bus Type','Bus Type'),('V (pu)','V'),('Pg (pu)','Pg'),('Pd (pu)','Pd'),
+                        ('Qg (pu)','Qg'),('Qd (pu)','Qd'),('Qg (min)','Qg (min)'),('Qg (max)','Qg (max)'),
+                        ('V (min)','V (min)'),('V (max)','V (max)')];
             else:
-                dialog = Gtk.Dialog(title="BUS V,Q Profile",parent=self.app,modal=True,destroy_with_parent = True);
+                dialog = Gtk.Dialog(title="BUS V,Q Profile",parent=self.app,modal=False,destroy_with_parent = True);
                 height = (self.buses+4)*30;
-                shift = 1;
                 data = self.rbusdata;
+                columns = [('Bus No','Bus No'),('Bus Type','Bus Type'),('V (pu)','V'),('D (deg)','D'),('Pg (pu)','Pg'),
+                        ('Pd (pu)','Pd'),('Qg (pu)','Qg'),('Qd (pu)','Qd')];
 
             dialog.set_resizable(False);
             
@@ -731,125 +857,23 @@ class LoadFlowApp:
 
             offset = 3;
 
-            titleBNo = Gtk.Label();
-            titleBNo.set_markup('<b>Bus No</b>');
-            grid.attach(titleBNo,0,offset,1,1);
-
-            titleBT = Gtk.Label();
-            titleBT.set_markup('<b>Bus Type</b>');
-            grid.attach(titleBT,1,offset,1,1);
-
-            titleV = Gtk.Label();
-            titleV.set_markup('<b>V (pu)</b>');
-            grid.attach(titleV,2,offset,1,1);
-
-            if mode == 'Results':
-                titleD = Gtk.Label();
-                titleD.set_markup('<b>D (deg)</b>');
-                grid.attach(titleD,3,offset,1,1);
-
-            titlePg = Gtk.Label();
-            titlePg.set_markup('<b>Pg (pu)</b>');
-            grid.attach(titlePg,3+shift,offset,1,1);
-
-            titlePd = Gtk.Label();
-            titlePd.set_markup('<b>Pd (pu)</b>');
-            grid.attach(titlePd,4+shift,offset,1,1);
-
-            titleQg = Gtk.Label();
-            titleQg.set_markup('<b>Qg (pu)</b>');
-            grid.attach(titleQg,5+shift,offset,1,1);
-
-            titleQd = Gtk.Label();
-            titleQd.set_markup('<b>Qd (pu)</b>');
-            grid.attach(titleQd,6+shift,offset,1,1);
-
-            if mode == 'Data':
-                titleQmin = Gtk.Label();
-                titleQmin.set_markup('<b>Qg (min)</b>');
-                grid.attach(titleQmin,7+shift,offset,1,1);
-
-                titleQmax = Gtk.Label();
-                titleQmax.set_markup('<b>Qg (max)</b>');
-                grid.attach(titleQmax,8+shift,offset,1,1);
-
-                titleVmin = Gtk.Label();
-                titleVmin.set_markup('<b>V (min)</b>');
-                grid.attach(titleVmin,9+shift,offset,1,1);
-
-                titleVmax = Gtk.Label();
-                titleVmax.set_markup('<b>V (max)</b>');
-                grid.attach(titleVmax,10+shift,offset,1,1);
-
-            for i in range(0,self.buses):
-
-                label = Gtk.Label();
-                label.set_text(str(data['Bus No'][i]));
-                grid.attach(label,0,i+1+offset,1,1);
-
+            for c,(title,col) in enumerate(columns):
                 label = Gtk.Label();
-                val = str(data['Bus Type'][i]);
-                if mode == 'Results' and val != str(self.OriginalBT[i][0]):
-                    label.set_markup('<span foreground="red">'+val+'</span>');
-                else:
-                    label.set_text(val);
-                grid.attach(label,1,i+1+offset,1,1);
-
-                label = Gtk.Label();
-                Vval = data['V'][i];
-                Vmin = data['V (min)'][i];
-                Vmax = data['V (max)'][i];
-                if ((Vval-Vmin)<-1e-6 or (Vval-Vmax)>1e-6) and abs(Vmax-Vmin)>1e-3 and mode == 'Results':
-                    label.set_markup('<span foreground="red">'+"{0:8.5f}".format(Vval)+'</span>');
-                else:
-                    label.set_text("{0:8.5f}".format(Vval));
-                grid.attach(label,2,i+1+offset,1,1);
-
-                if mode == 'Results':
-                    label = Gtk.Label();
-                    label.set_text("{0:8.4f}".format(data['D'][i]));
-                    grid.attach(label,3,i+1+offset,1,1);
-
-                label = Gtk.Label();
-                label.set_text("{0:8.5f}".format(data['Pg'][i]));
-                grid.attach(label,3+shift,i+1+offset,1,1);
-
-                label = Gtk.Label();
-                label.set_text("{0:8.5f}".format(data['Pd'][i]));
-                grid.attach(label,4+shift,i+1+offset,1,1);
-
-                label = Gtk.Label();
-                Qval = data['Qg'][i];
-                Qmin = data['Qg (min)'][i];
-                Qmax = data['Qg (max)'][i];
-                if ((Qval-Qmin)<-1e-6 or (Qval-Qmax)>1e-6) and abs(Qmax-Qmin)>1e-3 and mode =='Results':
-                    label.set_markup('<span foreground="red">'+"{0:8.5f}".format(Qval)+'</span>');
-                else:
-                    label.set_text("{0:8.5f}".format(Qval));
-                grid.attach(label,5+shift,i+1+offset,1,1);
-
-                label = Gtk.Label();
-                label.set_text("{0:8.5f}".format(data['Qd'][i]));
-                grid.attach(label,6+shift,i+1+offset,1,1);
-
-                if mode == 'Data':
-
-                    label = Gtk.Label();
-                    label.set_text("{0:8.5f}".format(Qmin));
-                    grid.attach(label,7+shift,i+1+offset,1,1);
-
-                    label = Gtk.Label();
-                    label.set_text("{0:8.5f}".format(Qmax));
-                    grid.attach(label,8+shift,i+1+offset,1,1);
-
-                    label = Gtk.Label();
-                    label.set_text("{0:8.5f}".format(Vmin));
-                    grid.attach(label,9+shift,i+1+offset,1,1);
-
-                    label = Gtk.Label();
-                    label.set_text("{0:8.5f}".format(Vmax));
-                    grid.attach(label,10+shift,i+1+offset,1,1);
+                label.set_markup('<b>'+title+'</b>');
+                grid.attach(label,c,offset,1,1);
 
+            cells = {};
+            for i in range(0,self.buses):
+                for c,(title,col) in enumerate(columns):
+                    if mode == 'Data' and col not in ['Bus No','Bus Type']:
+                        cell = Gtk.Entry(width_chars=9);
+                        cell.connect('activate',self.on_busentry_edited,(i,col));
+                        cell.connect('focus-out-event',self.on_busentry_edited,(i,col));
+                    else:
+                        cell = Gtk.Label();
+                    cells[(i,col)] = cell;
+                    grid.attach(cell,c,i+1+offset,1,1);
+            self.__FillBusCells(cells,data,mode);
 
             box = dialog.get_content_area();
             scroll.add(grid);
@@ -867,38 +891,80 @@ class LoadFlowApp:
                 box.add(button);
                 self.tempdata = data;
 
+                # Refreshed in place by what-if solves until closed
+                view = (cells,mode);
+                self.views['bus'].append(view);
+                dialog.connect('destroy',lambda widget: self.views['bus'].remove(view));
 
             dialog.show_all();
         except Exception as err:
             self.msglog(err,parent=dialog);
 
+    '''
+    Set the text of the Bus table cells from data, out of limit values in red for Results
+    '''
+    def __FillBusCells(self,cells,data,mode):
+        for (i,col),cell in cells.items():
+            val = data[col][i];
+            red = False;
+            if col == 'Bus No' or col == 'Bus Type':
+                text = str(val);
+                red = col == 'Bus Type' and mode == 'Results' and text != str(self.OriginalBT[i][0]);
+            else:
+                text = ("{0:8.4f}" if col == 'D' else "{0:8.5f}").format(val);
+            if mode == 'Results' and (col == 'V' or col == 'Qg'):
+                lo = data['V (min)' if col == 'V' else 'Qg (min)'][i];
+                hi = data['V (max)' if col == 'V' else 'Qg (max)'][i];
+                red = ((val-lo)<-1e-6 or (val-hi)>1e-6) and abs(hi-lo)>1e-3;
+            if isinstance(cell,Gtk.Entry):
+                cell.set_text(text.strip());
+            elif red:
+                cell.set_markup('<span foreground="red">'+text+'</span>');
+            else:
+                cell.set_text(text);
+
+    '''
+    Refresh the open result views with the latest results
+    '''
+    def __RefreshViews(self):
+        for cells,mode in self.views['bus']:
+            self.__FillBusCells(cells,self.rbusdata,mode);
+        for cells,totals in self.views['line']:
+            self.__FillLineCells(cells,totals,self.rnwdata,'Results');
+        self.tempdata = self.rbusdata if len(self.views['line']) == 0 else self.rnwdata;
+
     def on_savebusdata(self,widget):
         self.saveresultsfiledialog(None,self.tempdata);
 
     '''
     Display Line data for both Input and Results
     mode = Results => Final Output Data
-    mode = Data => Input Data
+    mode = Data => Input Data, values and line status are editable and every edit is re-solved
     '''
     def __DisplayLineData(self,mode):
         try:
             dialog = None;
             if mode == 'Data':
-                dialog = Gtk.Dialog(title="Line Feed",parent=self.app,modal=True,destroy_with_parent = True);
+                dialog = Gtk.Dialog(title="Line Feed",parent=self.app,modal=False,destroy_with_parent = True);
                 data = self.nwdata;
                 if data is not None:
                     height = (len(data)+2)*30;
                 else:
                     height = 60;
                 width = 650;
+                columns = [('Line No','Line No'),('From Bus','From Bus'),('To Bus','To Bus'),('R (pu)','R'),('X (pu)','X'),
+                        ('B/2 (pu)','B/2'),('T','T'),('In Service','Status')];
             else:
-                dialog = Gtk.Dialog(title="Line Power Flows",parent=self.app,modal=True,destroy_with_parent = True);
+                dialog = Gtk.Dialog(title="Line Power Flows",parent=self.app,modal=False,destroy_with_parent = True);
                 data = self.rnwdata;
                 if data is not None:
                     height = (len(data)+6)*30;
                 else:
                     height = 60;
                 width = 750
+                columns = [('Line No','Line No'),('From Bus','From Bus'),('To Bus','To Bus'),('R (pu)','R'),('X (pu)','X'),
+                        ('B/2 (pu)','B/2'),('Avg P (pu)','Pavg'),('P loss (pu)','Ploss'),('Avg Q (pu)','Qavg'),
+                        ('Q consumed (pu)','Qloss')];
 
             dialog.set_resizable(False);
 
@@ -917,115 +983,44 @@ class LoadFlowApp:
 
             offset = 3;
 
-            label = Gtk.Label();
-            label.set_markup('<b>Line No</b>');
-            grid.attach(label,0,offset,1,1);
-
-            label = Gtk.Label();
-            label.set_markup('<b>From Bus</b>');
-            grid.attach(label,1,offset,1,1);
-
-            label = Gtk.Label();
-            label.set_markup('<b>To Bus</b>');
-            grid.attach(label,2,offset,1,1);
-
-            label = Gtk.Label();
-            label.set_markup('<b>R (pu)</b>');
-            grid.attach(label,3,offset,1,1);
-
-            label = Gtk.Label();
-            label.set_markup('<b>X (pu)</b>');
-            grid.attach(label,4,offset,1,1);
-
-            label = Gtk.Label();
-            label.set_markup('<b>B/2 (pu)</b>');
-            grid.attach(label,5,offset,1,1);
-
-            if mode == 'Data':
-                label = Gtk.Label();
-                label.set_markup('<b>T</b>');
-                grid.attach(label,6,offset,1,1);
-            else:
-                label = Gtk.Label();
-                label.set_markup('<b>Avg P (pu)</b>');
-                grid.attach(label,6,offset,1,1);
-
-                label = Gtk.Label();
-                label.set_markup('<b>P loss (pu)</b>');
-                grid.attach(label,7,offset,1,1);
-
-                label = Gtk.Label();
-                label.set_markup('<b>Avg Q (pu)</b>');
-                grid.attach(label,8,offset,1,1);
-
+            for c,(title,col) in enumerate(columns):
                 label = Gtk.Label();
-                label.set_markup('<b>Q consumed (pu)</b>');
-                grid.attach(label,9,offset,1,1);
+                label.set_markup('<b>'+title+'</b>');
+                grid.attach(label,c,offset,1,1);
 
             if data is not None:
                 n = len(data);
             else:
                 n = 0;
 
-            for i in range(0,n):
-                
-                label = Gtk.Label();
-                label.set_text(str(data['Line No'][i]));
-                grid.attach(label,0,i+1+offset,1,1);
-
-                label = Gtk.Label();
-                label.set_text(str(data['From Bus'][i]));
-                grid.attach(label,1,i+1+offset,1,1);
-
-                label = Gtk.Label();
-                label.set_text(str(data['To Bus'][i]));
-                grid.attach(label,2,i+1+offset,1,1);
-
-                label = Gtk.Label();
-                label.set_text("{0:8.5f}".format(data['R'][i]));
-                grid.attach(label,3,i+1+offset,1,1);
-
-                label = Gtk.Label();
-                label.set_text("{0:8.5f}".format(data['X'][i]));
-                grid.attach(label,4,i+1+offset,1,1);
-
-                label = Gtk.Label();
-                label.set_text("{0:8.5f}".format(data['B/2'][i]));
-                grid.attach(label,5,i+1+offset,1,1);
-
-                if mode == 'Data':
-
-                    label = Gtk.Label();
-                    label.set_text("{0:8.5f}".format(data['T'][i]));
-                    grid.attach(label,6,i+1+offset,1,1);
-                
-                if mode == 'Results':
-
-                    label = Gtk.Label();
-                    label.set_text("{0:8.5f}".format(data['Pavg'][i]));
-                    grid.attach(label,6,i+1+offset,1,1);
-
-                    label = Gtk.Label();
-                    label.set_text("{0:8.5f}".format(data['Ploss'][i]));
-                    grid.attach(label,7,i+1+offset,1,1);
-
-                    label = Gtk.Label();
-                    label.set_text("{0:8.5f}".format(data['Qavg'][i]));
-                    grid.attach(label,8,i+1+offset,1,1);
-
-                    label = Gtk.Label();
-                    label.set_text("{0:8.5f}".format(data['Qloss'][i]));
-                    grid.attach(label,9,i+1+offset,1,1);
-
-
+            cells = {};
+            for k in range(0,n):
+                for c,(title,col) in enumerate(columns):
+                    if mode == 'Data' and col == 'Status':
+                        cell = Gtk.CheckButton();
+                        cell.set_active(bool(self.inc.status[k]));
+                        cell.connect('toggled',self.on_linestatus_toggled,k);
+                        grid.attach(cell,c,k+1+offset,1,1);
+                        continue;
+                    if mode == 'Data' and col in ['R','X','B/2','T']:
+                        cell = Gtk.Entry(width_chars=9);
+                        cell.connect('activate',self.on_lineentry_edited,(k,col));
+                        cell.connect('focus-out-event',self.on_lineentry_edited,(k,col));
+                    else:
+                        cell = Gtk.Label();
+                    cells[(k,col)] = cell;
+                    grid.attach(cell,c,k+1+offset,1,1);
+
+            totals = [];
             if mode == 'Results':
                 label = Gtk.Label(xalign=0);
-                label.set_text("Total line losses : {0:8.5f}".format(np.sum(data['Ploss'])));
-                grid.attach(label,0,i+2+offset,3,1);
+                grid.attach(label,0,n+1+offset,3,1);
+                totals.append(label);
 
                 label = Gtk.Label(xalign=0);
-                label.set_text("Total Q consumed by lines : {0:8.5f}".format(np.sum(data['Qloss'])));
-                grid.attach(label,0,i+3+offset,3,1);
+                grid.attach(label,0,n+2+offset,3,1);
+                totals.append(label);
+            self.__FillLineCells(cells,totals,data,mode);
 
 
             box = dialog.get_content_area();
@@ -1042,10 +1037,33 @@ class LoadFlowApp:
                 self.tempdata = data;
                 box.add(button);
 
+                # Refreshed in place by what-if solves until closed
+                view = (cells,totals);
+                self.views['line'].append(view);
+                dialog.connect('destroy',lambda widget: self.views['line'].remove(view));
+
             dialog.show_all();
         except Exception as err:
             self.msglog(err,parent=dialog);
 
+    '''
+    Set the text of the Line table cells and totals from data
+    '''
+    def __FillLineCells(self,cells,totals,data,mode):
+        for (k,col),cell in cells.items():
+            val = data[col][k];
+            if col in ['Line No','From Bus','To Bus']:
+                text = str(val);
+            else:
+                text = "{0:8.5f}".format(val);
+            if isinstance(cell,Gtk.Entry):
+                cell.set_text(text.strip());
+            else:
+                cell.set_text(text);
+        if len(totals) != 0:
+            totals[0].set_text("Total line losses : {0:8.5f}".format(np.sum(data['Ploss'])));
+            totals[1].set_text("Total Q consumed by lines : {0:8.5f}".format(np.sum(data['Qloss'])));
+
     def on_savelinedata(self,widget):
         self.saveresultsfiledialog(None,self.tempdata);
 
@@ -1080,11 +1098,11 @@ class LoadFlowApp:
 
             for i in range(0,self.buses):
                 label = Gtk.Label();
-                label.set_markup('<b>'+str(i+1)+'</b>');
+                label.set_markup('<b>'+str(self.net.BNo[i,0])+'</b>');
                 grid.attach(label,0,i+1,1,1);
 
                 label = Gtk.Label();
-                label.set_markup('<b>'+str(i+1)+'</b>');
+                label.set_markup('<b>'+str(self.net.BNo[i,0])+'</b>');
                 grid.attach(label,i+1,0,1,1);
 
             for i in range(0,self.buses):
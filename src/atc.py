@@ -0,0 +1,148 @@
+'''
+Load FLow Analyser
+Copyright (C) 2020 Akshay Arvind Laturkar
+
+Date Created : 19 October 2026 -- Version 1.2.0
+
+This program is free software: you can redistribute it
+and/or modify it under the terms of the GNU General
+Public License as published by the Free Software
+Foundation, either version 3 of the License, or
+any later version.
+
+This program is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the
+implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE.  See the GNU General Public License
+for more details.
+
+You should have received a copy of the GNU General Public
+License along with this program.
+If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+File Version History
+V1.2.0 : October 19, 2026
+         Available transfer capability sweep between bus groups
+         All solves share one compiled Case of the network
+         Network arrays taken without copying, bus types may be given as codes
+         Transfer buses looked up through the Bus No map
+         Verify returns the transfer it solved last with its result
+'''
+
+
+import numpy as np;
+import loadflow as solver;
+from resultstore import EncodeBusType,SLACK;
+import sensitivity;
+
+class ATC:
+
+    '''
+    Arguments are the same as for loadflow.LoadFlow and
+    Rate is Lx1 Matrix of line ratings in pu
+
+    A direction is a tuple (source,sink) or (source,sink,swt,kwt) where source
+    and sink are lists of Bus No and swt,kwt their participation weights
+    '''
+    def __init__(self,N,P,Q,V,BT,YBus,MaxIter,Vlimit,Qlimit,Line,BNo,Rate):
+        self.n = N;
+        self.P = np.asarray(P).reshape((N,1));
+        self.Q = np.asarray(Q).reshape((N,4));
+        self.V = np.asarray(V).reshape((N,3));
+        self.BT = EncodeBusType(BT).reshape((N,1));
+        self.YBus = np.asarray(YBus).reshape((N,N));
+        self.Max = MaxIter;
+        self.Vlimit = Vlimit;
+        self.Qlimit = Qlimit;
+        self.Line = np.asarray(Line).reshape((len(Line),6));
+        self.BNo = np.asarray(BNo).reshape((N,1));
+        self.case = solver.Compile(self.YBus,self.Line,self.BNo);
+        self.l = len(self.Line);
+        self.Rate = np.array(Rate,dtype=float).flatten().copy();
+        self.base = None;
+        slack = self.BNo[np.where(self.BT.flatten() == SLACK)[0][0],0];
+        self.sens = sensitivity.Sensitivity(self.Line,self.BNo,slack);
+
+    '''
+    Solve the base case once and keep its results
+    '''
+    def Base(self):
+        if self.base is None:
+            lf = solver.LoadFlow(self.n,self.P,self.Q,self.V,self.BT,self.YBus,self.Max,self.Vlimit,self.Qlimit,self.Line,self.BNo,Case=self.case);
+            self.base = lf.Solve();
+        return self.base;
+
+    def __direction(self,direction):
+        if len(direction) == 2:
+            return (direction[0],direction[1],None,None);
+        return tuple(direction);
+
+    '''
+    Linear ATC for all directions in one batched solve
+    Returns dictionary with ATC (K), limit (Line No of limiting element, -1 if none),
+    ptdf (flow sensitivity of limiting element) and the full LxK transfer PTDF Matrix
+    '''
+    def Sweep(self,directions):
+        directions = [self.__direction(d) for d in directions];
+        f = self.Base()[6].reshape((self.l,1));
+        rate = self.Rate.reshape((self.l,1));
+        H = self.sens.TransferMatrix(directions);
+
+        # Transfer at which every line reaches its rating in the direction it is pushed
+        with np.errstate(divide='ignore',invalid='ignore'):
+            amount = np.where(H > 1e-6,(rate-f)/H,np.where(H < -1e-6,(-rate-f)/H,np.inf));
+        amount[amount < 0] = 0;   # Lines already beyond rating limit any transfer that loads them further
+        k = np.argmin(amount,axis=0);
+        ATC = amount[k,np.arange(len(directions))];
+        limit = np.where(np.isinf(ATC),-1,self.Line[k,0].astype(np.int64));
+        return {'ATC':ATC,'limit':limit,'ptdf':H[k,np.arange(len(directions))],'PTDF':H};
+
+    '''
+    Full AC solve with amount (pu) transferred from source to sink
+    '''
+    def SolveTransfer(self,direction,amount):
+        source,sink,swt,kwt = self.__direction(direction);
+        P = self.P.copy();
+        P[:,0] += amount*self.__weights(source,swt);
+        P[:,0] -= amount*self.__weights(sink,kwt);
+        lf = solver.LoadFlow(self.n,P,self.Q,self.V,self.BT,self.YBus,self.Max,self.Vlimit,self.Qlimit,self.Line,self.BNo,Case=self.case);
+        return lf.Solve();
+
+    def __weights(self,buses,wt):
+        buses = np.array(buses,dtype=np.int64).flatten();
+        if wt is None:
+            wt = np.ones(len(buses));
+        wt = np.asarray(wt,dtype=float).flatten();
+        w = np.zeros(self.n);
+        np.add.at(w,self.sens.bpos[buses],wt/np.sum(wt));
+        return w;
+
+    '''
+    Refine the linear ATC of one direction with full AC solves around the limit
+    Each step corrects the transfer by the smallest AC margin over the direction's PTDF
+    Returns (ATC, Line No of limiting element, LoadFlow.Solve() result at the limit),
+    the last amount solved when MaxSteps run out, and (inf, -1, result) when no line
+    is loaded further by the transfer
+    '''
+    def Verify(self,direction,amount=None,tol=1e-3,MaxSteps=5):
+        direction = self.__direction(direction);
+        H = self.sens.TransferMatrix([direction])[:,0];
+        if amount is None:
+            amount = self.Sweep([direction])['ATC'][0];
+        if np.isinf(amount):
+            return (amount,-1,None);
+        for step in range(0,MaxSteps):
+            result = self.SolveTransfer(direction,amount);
+            margin = self.Rate-abs(result[6]);
+            growth = np.sign(result[6])*H;     # Rate of change of |flow| with transfer
+            with np.errstate(divide='ignore',invalid='ignore'):
+                dt = np.where(growth > 1e-6,margin/growth,np.inf);
+            k = np.argmin(dt);
+            if np.isinf(dt[k]):
+                return (np.inf,-1,result);
+            if abs(margin[k]) < tol or step == MaxSteps-1:
+                break;
+            amount = max(amount+dt[k],0.0);
+        return (amount,int(self.Line[k,0]),result);
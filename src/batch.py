@@ -0,0 +1,190 @@
+'''
+Load FLow Analyser
+Copyright (C) 2020 Akshay Arvind Laturkar
+
+Date Created : 19 October 2026 -- Version 1.2.0
+
+This program is free software: you can redistribute it
+and/or modify it under the terms of the GNU General
+Public License as published by the Free Software
+Foundation, either version 3 of the License, or
+any later version.
+
+This program is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the
+implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE.  See the GNU General Public License
+for more details.
+
+You should have received a copy of the GNU General Public
+License along with this program.
+If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+File Version History
+V1.2.0 : October 19, 2026
+         Vectorized Newton-Raphson solve of many scenarios of one network at once
+         Scenarios can be warm started
+'''
+
+
+import numpy as np;
+import scipy.sparse as sp;
+import scipy.sparse.linalg as spla;
+import loadflow as solver;
+from resultstore import DecodeBusType,PQ,PV;
+
+class BatchLoadFlow:
+
+    '''
+    Scenarios of one network (same YBus and bus types) solved together
+
+    Arguments are the same as for loadflow.LoadFlow except that P, Q and V are
+    stacked over S scenarios as SxN, SxNx4 and SxNx3.
+    Warm is (V,D) to start every scenario from, N or SxN each, as for loadflow.LoadFlow
+
+    Power injections and mismatches of all scenarios are computed with one sparse
+    product per iteration, the Jacobians of the scenarios not yet converged are
+    stacked into one block diagonal matrix (same pattern as loadflow.LoadFlow uses,
+    repeated) and factorized with a single sparse LU. Limits are checked on the
+    batch solution, scenarios where a limit binds are finished by loadflow.LoadFlow
+    warm started from it.
+    '''
+    def __init__(self,N,P,Q,V,BT,YBus,MaxIter,Vlimit,Qlimit,Line,BNo,Case=None,Warm=None):
+        self.n = N;
+        self.P = np.asarray(P,dtype=float).reshape((-1,N));
+        self.s = len(self.P);
+        self.Q = np.asarray(Q,dtype=float).reshape((self.s,N,4));
+        self.V = np.asarray(V,dtype=float).reshape((self.s,N,3));
+        self.BT = BT;
+        self.Max = MaxIter;
+        self.Vlimit = Vlimit;
+        self.Qlimit = Qlimit;
+        self.Line = np.asarray(Line,dtype=float).reshape((-1,6));
+        self.BNo = np.asarray(BNo).reshape((N,1));
+        if Case is None:
+            Case = solver.Compile(np.asarray(YBus).reshape((N,N)),self.Line,self.BNo);
+        self.case = Case;
+        self.warm = Warm;
+        # Solver of the first scenario, its bus order and Jacobian pattern are shared by all
+        self.lf = solver.LoadFlow(N,self.P[0],self.Q[0],self.V[0],BT,None,MaxIter,False,False,self.Line,self.BNo,Case=Case);
+
+    def __Power(self,Vm,D):
+        lf = self.lf;
+        Vc = np.zeros((len(Vm),self.n),dtype=complex);
+        Vc[:,lf.bindx] = Vm*np.exp(1j*D);
+        S = Vc*np.conj(self.case.Ysp.dot(Vc.T).T);
+        return Vc,S;
+
+    def __Jacobian(self,Vc,S):
+        case = self.case;
+        nnz = len(case.Ysp.data);
+        Vm = abs(Vc);
+        W = np.conj(Vc[:,case.Yc]*case.Ysp.data)*Vc[:,case.Yr];
+        Vmc = Vm[:,case.Yc];
+        vals = np.zeros((len(Vc),4*nnz));
+        vals[:,0:nnz] = W.real/Vmc;
+        vals[:,nnz:2*nnz] = W.imag;
+        vals[:,2*nnz:3*nnz] = W.imag/Vmc;
+        vals[:,3*nnz:] = -W.real;
+        d = case.Ydiag;
+        vals[:,d] += S.real/Vm;
+        vals[:,nnz+d] -= S.imag;
+        vals[:,2*nnz+d] += S.imag/Vm;
+        vals[:,3*nnz+d] += S.real;
+        return vals[:,self.lf.jsrc];
+
+    '''
+    Solve every scenario
+    Returns list of loadflow.LoadFlow.Solve() results, one per scenario
+    '''
+    def Solve(self):
+        lf = self.lf;
+        n = self.n;
+        n_pq = lf.pq;
+        m = n_pq+n-1;
+        o = lf.indx;
+        ns = self.s;
+        P = self.P[:,o];
+        Qs = self.Q[:,o,0];
+        Vm = self.V[:,o,0].copy();
+        Vm[:,0:n_pq] = 1.0;
+        D = np.zeros((ns,n));
+        if self.warm is not None:
+            Vw = np.broadcast_to(np.asarray(self.warm[0],dtype=float).reshape((-1,n)),(ns,n))[:,o[0:n_pq]];
+            Vm[:,0:n_pq] = np.where(Vw > 0,Vw,1.0);
+            D[:,:] = np.broadcast_to(np.asarray(self.warm[1],dtype=float).reshape((-1,n)),(ns,n))[:,o];
+            D -= D[:,-1:];
+        iters = np.zeros(ns,dtype=np.int64);
+        active = np.ones(ns,dtype=bool);
+        Jp = lf.Jp;
+        nzJ = Jp.nnz;
+
+        for it in range(0,self.Max):
+            idx = np.where(active)[0];
+            iters[idx] += 1;
+            Vc,Sy = self.__Power(Vm[idx],D[idx]);
+            S = Sy[:,lf.bindx];
+            Err = np.c_[P[idx,:n-1]-S.real[:,:n-1],Qs[idx,:n_pq]-S.imag[:,:n_pq]];
+            done = np.max(abs(Err),axis=1) < 1e-6;
+            active[idx[done]] = False;
+            idx = idx[~done];
+            if len(idx) == 0:
+                break;
+            Err = Err[~done];
+            k = len(idx);
+
+            # Block diagonal Jacobian of the scenarios still iterating, one LU for all
+            data = self.__Jacobian(Vc[~done],Sy[~done]).ravel();
+            indices = (Jp.indices[None,:]+m*np.arange(k)[:,None]).ravel();
+            indptr = np.r_[(Jp.indptr[None,:-1]+nzJ*np.arange(k)[:,None]).ravel(),nzJ*k];
+            J = sp.csc_matrix((data,indices,indptr),shape=(m*k,m*k));
+            try:
+                lu = spla.splu(J,permc_spec='NATURAL',diag_pivot_thresh=0.1);
+            except RuntimeError:
+                break;
+            rhs = Err[:,lf.rperm].ravel();
+            delta = np.zeros((k,m));
+            delta[:,lf.cperm] = lu.solve(rhs).reshape((k,m));
+            Vm[idx,0:n_pq] += delta[:,0:n_pq];
+            D[idx,0:n-1] += delta[:,n_pq:];
+
+        Vc,S = self.__Power(Vm,D);
+        S = S[:,lf.bindx];
+        rev = np.argsort(o);
+        BT = lf.BT[rev,0];
+        results = [];
+        for s in range(0,ns):
+            rP = self.P[s].reshape((n,1)).copy();
+            rQ = self.Q[s].copy();
+            rV = self.V[s].copy();
+            rV[:,0] = Vm[s,rev];
+            rD = D[s,rev].reshape((n,1));
+            rP[o[-1],0] = S[s,-1].real;
+            rQ[o[n_pq:],0] = S[s,n_pq:].imag;
+            if active[s] or self.__Binding(BT,rQ,rV):
+                # Not converged, or a limit binds, finish with the full limit logic
+                full = solver.LoadFlow(n,self.P[s],self.Q[s],self.V[s],self.BT,None,self.Max,self.Vlimit,self.Qlimit,
+                        self.Line,self.BNo,Case=self.case,Warm=(rV[:,0],rD[:,0])).Solve();
+                full[0] = int(full[0]+iters[s]);
+                results.append(full);
+                continue;
+            Pij,Pji,Qij,Qji = self.case.LineFlows(rV[:,0],rD[:,0]);
+            results.append([int(iters[s]),DecodeBusType(BT).reshape((n,1)),rP,rQ,rV,rD,(Pij-Pji)/2,Qij-Qji,abs(Pij+Pji),Qij+Qji]);
+        return results;
+
+    '''
+    True if a Q limit of a PV bus or a V limit of a PQ bus is violated by the solution
+    '''
+    def __Binding(self,BT,Q,V):
+        if self.Qlimit:
+            Qg = Q[:,0]+Q[:,3];
+            band = abs(Q[:,1]-Q[:,2]) > 1e-10;
+            if np.any((BT == PV) & band & ((Qg > Q[:,2]) | (Qg < Q[:,1]))):
+                return True;
+        if self.Vlimit:
+            band = abs(V[:,1]-V[:,2]) > 1e-10;
+            if np.any((BT == PQ) & band & ((V[:,0] > V[:,2]) | (V[:,0] < V[:,1]))):
+                return True;
+        return False;
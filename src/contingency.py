@@ -0,0 +1,224 @@
+'''
+Load FLow Analyser
+Copyright (C) 2020 Akshay Arvind Laturkar
+
+Date Created : 19 October 2026 -- Version 1.2.0
+
+This program is free software: you can redistribute it
+and/or modify it under the terms of the GNU General
+Public License as published by the Free Software
+Foundation, either version 3 of the License, or
+any later version.
+
+This program is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the
+implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE.  See the GNU General Public License
+for more details.
+
+You should have received a copy of the GNU General Public
+License along with this program.
+If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+File Version History
+V1.2.0 : October 19, 2026
+         N-1 line outage screening and ranking with full AC solve of critical outages
+         LODFs taken from the cached sensitivity engine
+         Outages are solved through the island aware topology solver
+         Base case solved on the compiled Case of the network
+         Network arrays taken without copying, bus types may be given as codes
+         Arbitrary Bus No, YBus taken by bus feed row
+         Outages solved as incremental patches of the base case YBus
+         Outages can be solved over a process pool sharing the network through memory mapped files
+         Outage results can be reduced as they are solved
+         Outages can be solved in chord mode on the factorization of the base case
+'''
+
+
+import numpy as np;
+import loadflow as solver;
+from resultstore import EncodeBusType,SLACK;
+import sensitivity;
+import incremental;
+import shared;
+
+class Contingency:
+
+    '''
+    Arguments are the same as for loadflow.LoadFlow and
+    T is Lx1 Matrix of tap ratios (defaults to 1.0), needed to remove a line from YBus
+    Rate is Lx1 Matrix of line ratings in pu, defaults to the base case flow of each line
+    (floored at the mean base case flow), so the flow index measures redistribution
+    Exp is the exponent n used in the performance index sum((x/xlim)^(2n))
+    '''
+    def __init__(self,N,P,Q,V,BT,YBus,MaxIter,Vlimit,Qlimit,Line,BNo,T=None,Rate=None,Exp=1):
+        self.n = N;
+        self.P = np.asarray(P).reshape((N,1));
+        self.Q = np.asarray(Q).reshape((N,4));
+        self.V = np.asarray(V).reshape((N,3));
+        self.BT = EncodeBusType(BT).reshape((N,1));
+        self.YBus = np.asarray(YBus).reshape((N,N));
+        self.Max = MaxIter;
+        self.Vlimit = Vlimit;
+        self.Qlimit = Qlimit;
+        self.Line = np.asarray(Line).reshape((len(Line),6));
+        self.BNo = np.asarray(BNo).reshape((N,1));
+        self.l = len(self.Line);
+        if T is None:
+            self.T = np.ones(self.l);
+        else:
+            self.T = np.array(T,dtype=float).flatten().copy();
+        self.Rate = Rate;
+        self.Exp = Exp;
+        self.base = None;
+        self.factor = None;
+        self.rank = None;
+        self.sens = None;
+        self.inc = None;
+
+        # Line end positions in bus order
+        bmap = solver.IndexMap(self.BNo);
+        self.fidx = bmap[self.Line[:,1]];
+        self.tidx = bmap[self.Line[:,2]];
+
+    '''
+    Solve the base case once and keep its results
+    '''
+    def Base(self):
+        if self.base is None:
+            lf = solver.LoadFlow(self.n,self.P,self.Q,self.V,self.BT,self.YBus,self.Max,self.Vlimit,self.Qlimit,self.Line,self.BNo,
+                    Case=solver.Compile(self.YBus,self.Line,self.BNo));
+            self.base = lf.Solve();
+            self.factor = lf.Factor();
+        return self.base;
+
+    '''
+    DC sensitivity engine for the line feed, built once
+    '''
+    def Sensitivity(self):
+        if self.sens is None:
+            slack = self.BNo[np.where(self.BT.flatten() == SLACK)[0][0],0];
+            self.sens = sensitivity.Sensitivity(self.Line,self.BNo,slack);
+        return self.sens;
+
+    '''
+    Rank all single line outages by severity
+    Flow index uses DC LODFs applied to the base case AC flows
+    Voltage index uses a single fast decoupled Q-V step with the Q the outaged line carried at its ends
+    Returns dictionary with order (most severe first), PI, PIflow, PIvolt, island (bool) per line
+    '''
+    def Rank(self):
+        if self.rank is not None:
+            return self.rank;
+
+        [rIter,rBT,rP,rQ,rV,rD,Pavg,Qavg,Ploss,Qloss] = self.Base();
+        V = rV[:,0];
+        Pij,Pji,Qij,Qji = solver.LineFlows(rV[:,0],rD[:,0],self.Line,self.BNo);
+        f = Pavg;
+
+        # Post outage flows for every outage as one matrix product, column k is outage k
+        F = self.Sensitivity().OutageFlows(f);
+        island = np.isnan(F[0,:]);
+        if self.Rate is None:
+            rate = np.maximum(abs(f),np.mean(abs(f)));
+        else:
+            rate = np.array(self.Rate,dtype=float).flatten();
+        rate = np.maximum(rate,1e-6).reshape((self.l,1));
+        PIflow = np.nansum((F/rate)**(2*self.Exp),axis=0);
+
+        # Voltage estimate at PQ buses of the base case, dV = inv(B'') dQ/V
+        pq = np.where(rBT.flatten() == 'PQ')[0];
+        PIvolt = np.zeros(self.l);
+        if len(pq) != 0:
+            Bpp = -self.YBus[np.ix_(pq,pq)].imag;
+            Xpp = np.linalg.inv(Bpp);
+            loc = np.full(self.n,-1,dtype=np.int64);
+            loc[pq] = np.arange(len(pq));
+            dQ = np.zeros((len(pq),self.l));
+            fpq = loc[self.fidx] >= 0;
+            tpq = loc[self.tidx] >= 0;
+            dQ[loc[self.fidx[fpq]],np.where(fpq)[0]] += Qij[fpq]/V[self.fidx[fpq]];
+            dQ[loc[self.tidx[tpq]],np.where(tpq)[0]] += Qji[tpq]/V[self.tidx[tpq]];
+            dV = np.matmul(Xpp,dQ);
+            Vpost = V[pq].reshape((len(pq),1))+dV;
+            Vmin = self.V[pq,1].reshape((len(pq),1));
+            Vmax = self.V[pq,2].reshape((len(pq),1));
+            limited = (abs(Vmax-Vmin) > 1e-10).flatten();
+            if np.any(limited):
+                Vnom = (Vmin+Vmax)/2;
+                Vdev = (Vmax-Vmin)/2;
+                PIvolt = np.sum(((Vpost[limited]-Vnom[limited])/Vdev[limited])**(2*self.Exp),axis=0);
+
+        PI = PIflow+PIvolt;
+        PI[island] = np.inf;
+        order = np.argsort(-PI,kind='stable');
+        self.rank = {'order':order,'PI':PI,'PIflow':PIflow,'PIvolt':PIvolt,'island':island};
+        return self.rank;
+
+    '''
+    Select outages for a full AC solve
+    topk keeps the k most severe outages, threshold keeps outages with PI above it
+    If both are given an outage has to pass both. Islanding outages are never selected
+    Returns Line No of selected outages, most severe first
+    '''
+    def Screen(self,topk=None,threshold=None):
+        rank = self.Rank();
+        order = rank['order'][~rank['island'][rank['order']]];
+        if threshold is not None:
+            order = order[rank['PI'][order] > threshold];
+        if topk is not None:
+            order = order[:topk];
+        return self.Line[order,0].astype(np.int64);
+
+    '''
+    Incremental editor on the base case, built once
+    '''
+    def Incremental(self):
+        if self.inc is None:
+            self.inc = incremental.Incremental(self.n,self.P,self.Q,self.V,self.BT,self.YBus,self.Max,self.Vlimit,self.Qlimit,
+                    self.Line,self.BNo,self.T);
+        return self.inc;
+
+    '''
+    Full AC solve of the given outages (Line No), defaults to Screen()
+    Line results are returned for all lines with zero flow on the outaged line
+    Outages that split the network are solved island by island
+    If store is given, outage number s of the list is written to scenario s of the store
+    Workers > 1 solves the outages over that many processes, the network is published
+    once with shared.SharedCase and each task ships only its Line No
+    Returns dictionary of Line No to LoadFlow.Solve() results, or if Reducer is given
+    (reducers.Reducer) the results are added to it as scenario s instead and it is returned
+    Method 'chord' solves the outages in this process warm started from the base case and
+    reusing the factorization of its Jacobian (loadflow.LoadFlow Method 'chord')
+    '''
+    def Solve(self,outages=None,store=None,Workers=None,Reducer=None,Method='newton'):
+        if outages is None:
+            outages = self.Screen();
+        if Workers is not None and Workers > 1 and Method != 'chord':
+            with shared.SharedCase(self.n,self.P,self.Q,self.V,self.BT,self.YBus,self.Max,self.Vlimit,self.Qlimit,
+                    self.Line,self.BNo,self.T,Case=solver.Compile(self.YBus,self.Line,self.BNo)) as case:
+                if Reducer is not None:
+                    return case.Map([{'outages':[lno]} for lno in outages],store,Workers,Reducer);
+                results = case.Map([{'outages':[lno]} for lno in outages],Workers=Workers);
+            for s,result in enumerate(results):
+                if store is not None:
+                    store.Write(s,result);
+            return dict(zip(outages,results));
+        inc = self.Incremental();
+        results = {};
+        warm = None;
+        if Method == 'chord':
+            base = self.Base();
+            warm = (base[4][:,0],base[5][:,0]);
+        for s,lno in enumerate(outages):
+            inc.Reset();
+            inc.RemoveLine(lno);
+            result = inc.Solve(store,s,warm,Method,self.factor);
+            if Reducer is None:
+                results[lno] = result;
+            else:
+                Reducer.Add(result,s);
+        inc.Reset();
+        return results if Reducer is None else Reducer;
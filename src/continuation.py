@@ -0,0 +1,206 @@
+'''
+Load FLow Analyser
+Copyright (C) 2020 Akshay Arvind Laturkar
+
+Date Created : 19 October 2026 -- Version 1.2.0
+
+This program is free software: you can redistribute it
+and/or modify it under the terms of the GNU General
+Public License as published by the Free Software
+Foundation, either version 3 of the License, or
+any later version.
+
+This program is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the
+implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE.  See the GNU General Public License
+for more details.
+
+You should have received a copy of the GNU General Public
+License along with this program.
+If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+File Version History
+V1.2.0 : October 19, 2026
+         Continuation power flow for PV (nose) curves and loadability margins
+         Bordered system solved sparse, on the sparse Newton Jacobian
+         All solves share one compiled Case of the network
+         Network arrays taken without copying, bus types may be given as codes
+'''
+
+
+import numpy as np;
+import scipy.sparse as sp;
+import scipy.sparse.linalg as spla;
+import loadflow as solver;
+from resultstore import EncodeBusType;
+
+class Continuation:
+
+    '''
+    Arguments are the same as for loadflow.LoadFlow and
+    dP is Nx1 Matrix of P injection change per unit of loading parameter lambda
+    dQ is Nx1 Matrix of Q injection change per unit of lambda
+    Default direction scales every net load (P < 0) and Qd, so lambda = 1 doubles the load
+
+    The base case is solved with the limits enabled, the bus types it ends up
+    with are then held fixed along the curve.
+    '''
+    def __init__(self,N,P,Q,V,BT,YBus,MaxIter,Vlimit,Qlimit,Line,BNo,dP=None,dQ=None):
+        self.n = N;
+        self.P = np.asarray(P).reshape((N,1));
+        self.Q = np.asarray(Q).reshape((N,4));
+        self.V = np.asarray(V).reshape((N,3));
+        self.BT = EncodeBusType(BT).reshape((N,1));
+        self.YBus = np.asarray(YBus).reshape((N,N));
+        self.Max = MaxIter;
+        self.Vlimit = Vlimit;
+        self.Qlimit = Qlimit;
+        self.Line = np.asarray(Line).reshape((len(Line),6));
+        self.BNo = np.asarray(BNo).reshape((N,1));
+        self.case = solver.Compile(self.YBus,self.Line,self.BNo);
+        if dP is None:
+            dP = np.minimum(self.P,0);
+        if dQ is None:
+            dQ = -self.Q[:,3];
+        self.dP = np.array(dP,dtype=float).reshape((N,1)).copy();
+        self.dQ = np.array(dQ,dtype=float).reshape((N,1)).copy();
+        self.base = None;
+
+    '''
+    Solve the base case once and keep its results
+    '''
+    def Base(self):
+        if self.base is None:
+            lf = solver.LoadFlow(self.n,self.P,self.Q,self.V,self.BT,self.YBus,self.Max,self.Vlimit,self.Qlimit,self.Line,self.BNo,Case=self.case);
+            self.base = lf.Solve();
+        return self.base;
+
+    '''
+    Solver set up at the converged base case with the final bus types
+    '''
+    def __Solver(self):
+        [rIter,rBT,rP,rQ,rV,rD,Pavg,Qavg,Ploss,Qloss] = self.Base();
+        lf = solver.LoadFlow(self.n,self.P,rQ,rV,rBT,self.YBus,self.Max,False,False,self.Line,self.BNo,Case=self.case);
+        lf.V[:,0] = rV[lf.indx,0];
+        lf.D[:,0] = rD[lf.indx,0];
+        return lf;
+
+    def __State(self,lf):
+        return np.r_[lf.V[:lf.pq,0],lf.D[:-1,0]];
+
+    def __SetState(self,lf,x,lam,P0,Q0,dP,dQ):
+        lf.V[:lf.pq,0] = x[:lf.pq];
+        lf.D[:-1,0] = x[lf.pq:];
+        lf.P[:,0] = P0+lam*dP;
+        lf.Q[:lf.pq,0] = Q0[:lf.pq]+lam*dQ[:lf.pq];
+
+    '''
+    Jacobian bordered with the load direction column and the continuation parameter row
+    '''
+    def __Augmented(self,J,d,k):
+        m = J.shape[0];
+        e = sp.csr_matrix((np.ones(1),(np.zeros(1),np.array([k]))),shape=(1,m+1));
+        return sp.vstack([sp.hstack([J,sp.csc_matrix(-d.reshape((m,1)))]),e]).tocsc();
+
+    '''
+    Trace the PV curve along the load increase direction
+    Step is the initial arc length step, adapted between MinStep and MaxStep
+    The curve is traced until lambda falls below StopRatio*lambda(max) past the nose,
+    or only up to the nose if StopAtNose is True
+    Returns dictionary with lambda (K), V (KxN, bus order of the feed), lambdamax,
+    margin (lambdamax times total load change in pu), steps and corrector iterations
+    '''
+    def Trace(self,Step=0.2,MinStep=1e-4,MaxStep=1.0,MaxPoints=200,Tol=1e-6,MaxCorr=8,StopRatio=0.0,StopAtNose=False):
+        lf = self.__Solver();
+        m = lf.pq+self.n-1;
+        P0 = lf.P[:,0].copy();
+        Q0 = lf.Q[:,0].copy();
+        dP = self.dP[lf.indx,0];
+        dQ = self.dQ[lf.indx,0];
+        d = np.r_[dP[:-1],dQ[:lf.pq]];
+
+        x = self.__State(lf);
+        lam = 0.0;
+        lams = [lam];
+        Vs = [lf.V[:,0].copy()];
+        k = m;              # Continuation parameter index, m is lambda
+        sigma = 1.0;
+        tprev = None;
+        h = Step;
+        corr = 0;
+        steps = 0;
+        nosed = False;
+
+        while len(lams) < MaxPoints and h >= MinStep:
+            # Predictor, tangent from the augmented Jacobian
+            self.__SetState(lf,x,lam,P0,Q0,dP,dQ);
+            rhs = np.zeros(m+1);
+            rhs[m] = sigma;
+            t = spla.spsolve(self.__Augmented(lf.Jacobian(),d,k),rhs);
+            t = t/np.linalg.norm(t);
+            if tprev is not None and np.dot(t,tprev) < 0:
+                t = -t;
+
+            z = np.r_[x,lam]+h*t;
+            zk = z[k];
+
+            # Corrector with the continuation parameter held at its predicted value
+            converged = False;
+            for it in range(0,MaxCorr):
+                self.__SetState(lf,z[:m],z[m],P0,Q0,dP,dQ);
+                Err = lf.Mismatch()[:,0];
+                if np.max(abs(Err)) < Tol:
+                    converged = True;
+                    break;
+                z += spla.spsolve(self.__Augmented(lf.Jacobian(),d,k),np.r_[Err,zk-z[k]]);
+            corr += it;
+            steps += 1;
+
+            if not converged:
+                h = h/2;
+                continue;
+
+            if z[m] < lam:
+                nosed = True;
+            x = z[:m];
+            lam = z[m];
+            lams.append(lam);
+            Vs.append(lf.V[:,0].copy());
+            tprev = t;
+
+            if nosed and (StopAtNose or lam <= StopRatio*np.max(lams)):
+                break;
+
+            # Adapt step and switch to the fastest changing parameter
+            if it <= 3:
+                h = min(h*1.5,MaxStep);
+            k = int(np.argmax(abs(t)));
+            sigma = np.sign(t[k]);
+
+        # Back to bus order of the feed
+        revindx = np.argsort(lf.indx);
+        V = np.array(Vs)[:,revindx];
+        lams = np.array(lams);
+        lmax = np.max(lams);
+        return {'lambda':lams,'V':V,'lambdamax':lmax,'margin':lmax*np.sum(abs(self.dP)),
+                'nose':nosed,'steps':steps,'corrector':corr};
+
+    '''
+    Loadability margin for several load increase directions
+    directions is a list of (dP,dQ) tuples
+    Returns array of lambda(max) per direction
+    '''
+    def Margins(self,directions,**kwargs):
+        dP,dQ = self.dP,self.dQ;
+        margins = [];
+        try:
+            for (sdP,sdQ) in directions:
+                self.dP = np.array(sdP,dtype=float).reshape((self.n,1));
+                self.dQ = np.array(sdQ,dtype=float).reshape((self.n,1));
+                margins.append(self.Trace(StopAtNose=True,**kwargs)['lambdamax']);
+        finally:
+            self.dP,self.dQ = dP,dQ;
+        return np.array(margins);
@@ -0,0 +1,258 @@
+'''
+Load FLow Analyser
+Copyright (C) 2020 Akshay Arvind Laturkar
+
+Date Created : 19 October 2026 -- Version 1.2.0
+
+This program is free software: you can redistribute it
+and/or modify it under the terms of the GNU General
+Public License as published by the Free Software
+Foundation, either version 3 of the License, or
+any later version.
+
+This program is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the
+implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE.  See the GNU General Public License
+for more details.
+
+You should have received a copy of the GNU General Public
+License along with this program.
+If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+File Version History
+V1.2.0 : October 19, 2026
+         Ward and REI network equivalents by sparse Kron reduction of YBus
+         Reduced case as Bus and Line feed tables solved by LoadFlow
+'''
+
+
+import numpy as np;
+import pandas as pd;
+import scipy.sparse as sp;
+import scipy.sparse.linalg as spla;
+import time;
+import loadflow as solver;
+import network;
+import topology;
+from resultstore import DecodeBusType,BUS_TYPES,PV,SLACK;
+
+METHODS = ['ward','rei'];
+
+'''
+Sparse bus admittance matrix (MxM CSR) of lines between rows fidx and tidx, shunt is the
+susceptance added on the diagonal of the first len(shunt) rows, as network.Network.YBus()
+'''
+def Admittance(M,fidx,tidx,R,X,B2,T,shunt):
+    y = 1/(R+X*1j);
+    b = B2*1j;
+    a = 1/T;
+    k = np.arange(len(shunt));
+    rows = np.r_[fidx,fidx,tidx,tidx,k];
+    cols = np.r_[fidx,tidx,fidx,tidx,k];
+    vals = np.r_[(a**2)*(y+b),-a*y,-a*y,y+b,shunt*1j];
+    return sp.csr_matrix((vals,(rows,cols)),shape=(M,M));
+
+class Equivalent:
+
+    '''
+    Equivalent of a network.Network seen from the Retained buses (list of Bus No)
+
+    Every other bus is eliminated by Kron reduction of YBus,
+        Yeq = Y[r,r] - Y[r,e] inv(Y[e,e]) Y[e,r]
+    with one sparse LU of Y[e,e] solved for the boundary columns only (retained buses
+    with a line to an eliminated one), so only the boundary block of YBus changes.
+    The change is written as equivalent lines between boundary buses and equivalent
+    shunts on them. Loads and generation of the eliminated buses are moved to the
+    boundary as constant power injections (Ward) from the currents of the base case
+    Result (LoadFlow.Solve() of net, solved here if not given), so the reduced case
+    gives the base case voltages of the retained buses exactly and tracks changes
+    inside the retained area closely.
+
+    Method
+        'ward' -- every eliminated injection becomes a boundary injection
+        'rei'  -- the generators of the eliminated PV buses of each connected eliminated
+                  area are first gathered on one new PV bus (REI bus) through a zero
+                  power balance network, so the equivalent keeps their voltage support
+                  and Q limits
+
+    Equivalent admittances below Tol (pu) are not written as lines but kept in the
+    shunts of their ends. Equivalent shunts are reactive in the Shunt Feed, their
+    conductance becomes load at the base case voltage. Equivalent lines may have
+    negative R, as Kron reduction does not keep the resistances positive.
+    The Slack bus must be retained.
+    '''
+    def __init__(self,net,Retained,Result=None,Method='ward',Tol=1e-6,MaxIter=20):
+        if Method not in METHODS:
+            raise ValueError("Unknown method '" + str(Method) + "'");
+        t = time.time();
+        self.net = net;
+        self.method = Method;
+        self.tol = Tol;
+        n = net.n;
+        pos = net.bmap[np.asarray(Retained,dtype=np.int64).flatten()];
+        if np.any(pos < 0):
+            raise ValueError("Invalid 'Bus No' in retained buses");
+        keep = np.zeros(n,dtype=bool);
+        keep[pos] = True;
+        if np.any(~keep & (net.BT[:,0] == SLACK)):
+            raise ValueError("Slack bus should be retained");
+        if Result is None:
+            Result = solver.LoadFlow(*net.Args(MaxIter,False,False),Case=net.Compile()).Solve();
+        self.result = Result;
+        self.__Reduce(keep);
+        self.stats = {'buses':n,'retained':int(np.sum(keep)),'boundary':len(self.boundary),
+                'equivalent_lines':len(self.eqline),'rei':len(self.rei),'time':time.time()-t};
+
+    '''
+    Kron reduction of the network (with the REI network for Method 'rei')
+    '''
+    def __Reduce(self,keep):
+        net = self.net;
+        n = net.n;
+        b = net.bus;
+        l = net.line;
+        Vc = self.result[4][:,0]*np.exp(1j*self.result[5][:,0]);
+        S = self.result[2][:,0]+1j*self.result[3][:,0];
+        fidx = net.bmap[l['From Bus']];
+        tidx = net.bmap[l['To Bus']];
+        Y = Admittance(n,fidx,tidx,l['R'],l['X'],l['B/2'],l['T'],b['Shunt Feed']).tocoo();
+        rows,cols,vals = [Y.row],[Y.col],[Y.data];
+        I = np.conj(S/Vc);
+        M = n;
+
+        # REI: generators of eliminated PV buses of each eliminated area fed from a bus R
+        # through a bus G at zero voltage, G and R are added after the buses of the network
+        self.rei = [];
+        outside = ~keep[fidx] & ~keep[tidx];
+        count,area = topology.Islands(n,net.Line[outside],net.BNo);
+        gen = np.where(~keep & (net.BT[:,0] == PV))[0] if self.method == 'rei' else np.zeros(0,dtype=np.int64);
+        Vx = [];
+        for k in np.unique(area[gen]):
+            buses = gen[area[gen] == k];
+            Sg = S[buses]+b['Pd'][buses]+1j*b['Qd'][buses];
+            Ig = np.conj(Sg/Vc[buses]);
+            SR = np.sum(Sg);
+            IR = np.sum(Ig);
+            if abs(SR) < 1e-9 or abs(IR) < 1e-9:
+                continue;
+            VR = SR/np.conj(IR);
+            yk = -Ig/Vc[buses];
+            yR = IR/VR;
+            G,R = M,M+1;
+            rows += [buses,np.full(len(buses),G),buses,np.full(len(buses),G),[R,R,G,G]];
+            cols += [buses,np.full(len(buses),G),np.full(len(buses),G),buses,[R,G,R,G]];
+            vals += [yk,yk,-yk,-yk,[yR,-yR,-yR,yR]];
+            I[buses] -= Ig;
+            Vx += [0.0,VR];
+            M += 2;
+            self.rei.append({'buses':buses,'S':SR,'V':VR});
+        I = np.r_[I,np.zeros(M-n)];
+        Vc = np.r_[Vc,Vx];
+        keep = np.r_[keep,np.tile([False,True],(M-n)//2)];
+        Y = sp.csr_matrix((np.concatenate(vals),(np.concatenate(rows),np.concatenate(cols))),shape=(M,M));
+
+        r = np.where(keep)[0];
+        e = np.where(~keep)[0];
+        Yre = Y[r][:,e].tocsr();
+        cut = np.diff(Yre.indptr) > 0;
+        bnd = r[cut];
+        self.retained = r;
+        self.boundary = bnd;
+        Ybe = Yre[cut];
+        Yee = Y[e][:,e].tocsc();
+        Yeb = Y[e][:,bnd].tocsc();
+
+        # One LU of the eliminated block, solved for the boundary columns in blocks
+        K = np.zeros((len(bnd),len(bnd)),dtype=complex);
+        Ieq = np.zeros(len(bnd),dtype=complex);
+        if len(e) > 0:
+            try:
+                lu = spla.splu(Yee);
+            except RuntimeError:
+                raise ValueError("Eliminated buses not connected to the retained buses");
+            for k in range(0,len(bnd),64):
+                K[:,k:k+64] = Ybe.dot(lu.solve(Yeb[:,k:k+64].toarray()));
+            Ieq = -Ybe.dot(lu.solve(I[e]));
+
+        # Change of the boundary block against the retained lines and shunts
+        inside = keep[fidx] & keep[tidx];
+        Yint = Admittance(M,fidx[inside],tidx[inside],l['R'][inside],l['X'][inside],l['B/2'][inside],l['T'][inside],
+                np.where(keep[0:n],b['Shunt Feed'],0.0));
+        dY = (Y[bnd][:,bnd]-Yint[bnd][:,bnd]).toarray()-K;
+        i,j = np.triu_indices(len(bnd),1);
+        big = abs(dY[i,j]) > self.tol;
+        i,j = i[big],j[big];
+        self.eqline = np.c_[bnd[i],bnd[j]];
+        self.eqz = -1/dY[i,j];
+        ysh = np.diag(dY).copy();
+        np.add.at(ysh,i,dY[i,j]);
+        np.add.at(ysh,j,dY[i,j]);
+        self.eqshunt = ysh;
+        self.eqinj = Vc[bnd]*np.conj(Ieq);
+        self.Vb = abs(Vc[bnd]);
+
+    '''
+    Bus feed and Line feed DataFrames of the reduced case, columns as network.BUS_HEADER
+    and network.NW_HEADER
+    Retained buses and lines keep their rows, REI buses take the next free Bus Nos
+    and equivalent lines the next free Line Nos
+    '''
+    def Frames(self):
+        net = self.net;
+        n = net.n;
+        r = self.retained[self.retained < n];
+        bus = {col:np.array(val[r],dtype=float) for col,val in net.bus.items()};
+        bus['Bus No'] = bus['Bus No'].astype(np.int64);
+        btype = DecodeBusType(net.BT[r,0]);
+        for k,rei in enumerate(self.rei):
+            gen = rei['buses'];
+            row = {'Bus No':np.max(net.bus['Bus No'])+1+k,'Pd':0.0,'Qd':0.0,'Pg':rei['S'].real,
+                    'Qg':rei['S'].imag,'V':abs(rei['V']),'Shunt Feed':0.0,
+                    'Qg (min)':np.sum(net.bus['Qg (min)'][gen]),'Qg (max)':np.sum(net.bus['Qg (max)'][gen]),
+                    'V (min)':np.min(net.bus['V (min)'][gen]),'V (max)':np.max(net.bus['V (max)'][gen])};
+            for col in bus:
+                bus[col] = np.r_[bus[col],row[col]];
+            btype = np.append(btype,BUS_TYPES[PV]);
+        # Boundary rows in the reduced table, REI buses are the last ones
+        brow = np.searchsorted(self.retained,self.boundary);
+        bus['Pd'][brow] -= self.eqinj.real-self.eqshunt.real*self.Vb**2;
+        bus['Qd'][brow] -= self.eqinj.imag;
+        bus['Shunt Feed'][brow] += self.eqshunt.imag;
+        bus['Bus Type'] = btype;
+
+        l = net.line;
+        keep = np.zeros(n,dtype=bool);
+        keep[r] = True;
+        inside = keep[net.bmap[l['From Bus']]] & keep[net.bmap[l['To Bus']]];
+        BNo = bus['Bus No'];
+        k = len(self.eqline);
+        line = {col:val[inside] for col,val in l.items()};
+        eq = {'Line No':np.max(l['Line No'])+1+np.arange(k),'From Bus':BNo[np.searchsorted(self.retained,self.eqline[:,0])],
+                'To Bus':BNo[np.searchsorted(self.retained,self.eqline[:,1])],'R':self.eqz.real,'X':self.eqz.imag,
+                'B/2':np.zeros(k),'T':np.ones(k)};
+        line = {col:np.r_[line[col],eq[col]] for col in network.NW_HEADER};
+        busdata = pd.DataFrame({col:bus[col] for col in network.BUS_HEADER});
+        return busdata,pd.DataFrame(line);
+
+    '''
+    Reduced case as network.Network, ready for loadflow.LoadFlow
+    '''
+    def Network(self):
+        return network.Network.FromFrames(*self.Frames());
+
+    '''
+    Save the reduced case as Bus feed and Line feed files (xls, xlsx or csv), readable
+    by network.Read() and the application
+    '''
+    def Save(self,busfile,nwfile):
+        for data,filename in zip(self.Frames(),[busfile,nwfile]):
+            ext = filename.split('.')[-1];
+            if ext == 'xls' or ext == 'xlsx':
+                data.to_excel(filename,index=False);
+            elif ext == 'csv':
+                data.to_csv(filename,index=False);
+            else:
+                raise ValueError("Unknown file type '" + ext + "'");
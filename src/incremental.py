@@ -0,0 +1,318 @@
+'''
+Load FLow Analyser
+Copyright (C) 2020 Akshay Arvind Laturkar
+
+Date Created : 19 October 2026 -- Version 1.2.0
+
+This program is free software: you can redistribute it
+and/or modify it under the terms of the GNU General
+Public License as published by the Free Software
+Foundation, either version 3 of the License, or
+any later version.
+
+This program is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the
+implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE.  See the GNU General Public License
+for more details.
+
+You should have received a copy of the GNU General Public
+License along with this program.
+If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+File Version History
+V1.2.0 : October 19, 2026
+         Branch and shunt edits applied as low rank patches to a cached YBus
+         Bus injection and setpoint edits, line end changes and warm started solves
+         Snapshot copies for solving in the background while editing goes on
+         Can be built on a given compiled Case, YBus is then not needed
+         Solves can use the chord mode and a factorization of a nearby case
+         Radial networks are solved by backward/forward sweeps
+         Sweeps used only with the Q and V limits off, bus types are then those of LoadFlow
+'''
+
+
+import numpy as np;
+import copy;
+import scipy.sparse as sp;
+import loadflow as solver;
+import sensitivity;
+import topology;
+import radial;
+from resultstore import EncodeBusType,SLACK;
+
+'''
+Primitive admittance of a branch as 2x2 Matrix over its From and To bus
+'''
+def Stamp(R,X,B2,T):
+    y = 1/(R+X*1j);
+    b = B2*1j;
+    a = 1/T;
+    return np.array([[(a**2)*(y+b),-a*y],[-a*y,y+b]]);
+
+class Incremental:
+
+    '''
+    Arguments are the same as for loadflow.LoadFlow and
+    T is Lx1 Matrix of tap ratios (defaults to 1.0)
+    Case is the compiled loadflow.Case of the network, compiled from YBus if not given
+
+    Edits (RemoveLine, AddLine, EditLine, SetShunt) are applied to the YBus
+    nonzeros of the base case as 2x2 (branch) or 1x1 (shunt) patches, so an
+    edit costs O(1) and the compiled Case of the base, with its bus ordering
+    and pattern, is reused. Removed lines stay in the line table out of
+    service, so results keep one row per line with zero flow on them.
+    A line between buses not connected in the base case extends the pattern,
+    only then is the Case compiled again.
+    The DC sensitivities of the edited network reuse the base factorization
+    through a Sherman-Morrison-Woodbury update.
+    '''
+    def __init__(self,N,P,Q,V,BT,YBus,MaxIter,Vlimit,Qlimit,Line,BNo,T=None,Case=None):
+        self.n = N;
+        self.P0 = np.asarray(P).reshape((N,1));
+        self.Q0 = np.asarray(Q).reshape((N,4));
+        self.V0 = np.asarray(V).reshape((N,3));
+        self.BT0 = EncodeBusType(BT).reshape((N,1));
+        self.Max = MaxIter;
+        self.Vlimit = Vlimit;
+        self.Qlimit = Qlimit;
+        self.BNo = np.asarray(BNo).reshape((N,1));
+        self.Line0 = np.asarray(Line,dtype=float).reshape((-1,6));
+        self.l0 = len(self.Line0);
+        if T is None:
+            self.T0 = np.ones(self.l0);
+        else:
+            self.T0 = np.array(T,dtype=float).flatten();
+        if Case is None:
+            Case = solver.Compile(np.asarray(YBus).reshape((N,N)),self.Line0,self.BNo);
+        self.base = Case;
+        self.bmap = self.base.bmap;
+        self.sens = None;
+        self.lf = None;
+
+        # Bus shunts are what is left on the diagonal after the branches
+        Ysp = self.base.Ysp;
+        diag = Ysp.diagonal().copy();
+        M = Stamp(self.Line0[:,4],self.Line0[:,5],self.Line0[:,3],self.T0);
+        np.subtract.at(diag,self.base.fidx,M[0,0]);
+        np.subtract.at(diag,self.base.tidx,M[1,1]);
+        self.shunt0 = diag.imag;
+        self.Reset();
+
+    '''
+    Drop all edits and go back to the base case
+    '''
+    def Reset(self):
+        self.P = self.P0.copy();
+        self.Q = self.Q0.copy();
+        self.V = self.V0.copy();
+        self.BT = self.BT0.copy();
+        self.data = np.array(self.base.Ysp.data,dtype=complex);
+        self.extra = {};            # (row,col) -> value outside the base pattern
+        self.Line = self.Line0.copy();
+        self.T = self.T0.copy();
+        self.status = np.ones(self.l0,dtype=bool);
+        self.shunt = self.shunt0.copy();
+        self.lmap = solver.IndexMap(self.Line[:,0]);
+        self.case = self.base;
+        self.dirty = False;
+        self.edits = 0;
+
+    '''
+    Copy of the edited network that later edits of this one do not change
+    The base case and its compiled Case are shared
+    '''
+    def Copy(self):
+        other = copy.copy(self);
+        for name in ['P','Q','V','BT','data','Line','T','status','shunt']:
+            setattr(other,name,getattr(self,name).copy());
+        other.extra = dict(self.extra);
+        other.sens = None;
+        return other;
+
+    def __slot(self,i,j):
+        Y = self.base.Ysp;
+        lo,hi = Y.indptr[i],Y.indptr[i+1];
+        k = lo+np.searchsorted(Y.indices[lo:hi],j);
+        if k < hi and Y.indices[k] == j:
+            return k;
+        return -1;
+
+    def __add(self,i,j,val):
+        k = self.__slot(i,j);
+        if k >= 0:
+            self.data[k] += val;
+        else:
+            self.extra[(i,j)] = self.extra.get((i,j),0)+val;
+        self.dirty = True;
+
+    def __branch(self,k,sign):
+        i = self.bmap[self.Line[k,1]];
+        j = self.bmap[self.Line[k,2]];
+        M = sign*Stamp(self.Line[k,4],self.Line[k,5],self.Line[k,3],self.T[k]);
+        self.__add(i,i,M[0,0]);
+        self.__add(i,j,M[0,1]);
+        self.__add(j,i,M[1,0]);
+        self.__add(j,j,M[1,1]);
+        self.edits += 1;
+
+    def __line(self,LNo):
+        k = self.lmap[LNo];
+        if k < 0:
+            raise KeyError("Line No "+str(LNo)+" not found");
+        return k;
+
+    '''
+    Take a line out of service
+    '''
+    def RemoveLine(self,LNo):
+        k = self.__line(LNo);
+        if self.status[k]:
+            self.__branch(k,-1);
+            self.status[k] = False;
+
+    '''
+    Put a line back in service, or add a new line if LNo is not in the line table
+    '''
+    def AddLine(self,LNo,From=None,To=None,R=None,X=None,B2=0.0,T=1.0):
+        k = self.lmap[LNo];
+        if k < 0:
+            if self.bmap[From] < 0 or self.bmap[To] < 0:
+                raise KeyError("Unknown Bus No for Line No "+str(LNo));
+            self.Line = np.r_[self.Line,[[LNo,From,To,B2,R,X]]];
+            self.T = np.r_[self.T,T];
+            self.status = np.r_[self.status,False];
+            self.lmap = solver.IndexMap(self.Line[:,0]);
+            k = len(self.Line)-1;
+        if not self.status[k]:
+            self.__branch(k,1);
+            self.status[k] = True;
+
+    '''
+    Change parameters of a line, parameters not given are kept
+    '''
+    def EditLine(self,LNo,R=None,X=None,B2=None,T=None,From=None,To=None):
+        k = self.__line(LNo);
+        for bus in [From,To]:
+            if bus is not None and self.bmap[bus] < 0:
+                raise KeyError("Unknown Bus No for Line No "+str(LNo));
+        if self.status[k]:
+            self.__branch(k,-1);
+        for col,val in [(4,R),(5,X),(3,B2),(1,From),(2,To)]:
+            if val is not None:
+                self.Line[k,col] = val;
+        if T is not None:
+            self.T[k] = T;
+        if self.status[k]:
+            self.__branch(k,1);
+
+    '''
+    Set the shunt susceptance (pu) at a bus
+    '''
+    def SetShunt(self,BNo,B):
+        i = self.bmap[BNo];
+        if i < 0:
+            raise KeyError("Bus No "+str(BNo)+" not found");
+        self.__add(i,i,(B-self.shunt[i])*1j);
+        self.shunt[i] = B;
+        self.edits += 1;
+
+    '''
+    Change the data of a bus, values not given are kept
+    P is Pg-Pd, Q is Qg-Qd, BT the bus type (string or code)
+    '''
+    def SetBus(self,BNo,P=None,Q=None,Qmin=None,Qmax=None,Qd=None,V=None,Vmin=None,Vmax=None,BT=None):
+        i = self.bmap[BNo];
+        if i < 0:
+            raise KeyError("Bus No "+str(BNo)+" not found");
+        if P is not None:
+            self.P[i,0] = P;
+        for col,val in [(0,Q),(1,Qmin),(2,Qmax),(3,Qd)]:
+            if val is not None:
+                self.Q[i,col] = val;
+        for col,val in [(0,V),(1,Vmin),(2,Vmax)]:
+            if val is not None:
+                self.V[i,col] = val;
+        if BT is not None:
+            self.BT[i,0] = EncodeBusType([BT])[0];
+
+    '''
+    Compiled Case of the edited network
+    '''
+    def Case(self):
+        if self.dirty:
+            extra = {key:val for key,val in self.extra.items() if abs(val) > 1e-12};
+            if len(extra) == 0:
+                self.case = self.base.Patch(self.data,self.Line,self.status);
+            else:
+                Y = sp.csr_matrix((self.data,self.base.Ysp.indices,self.base.Ysp.indptr),shape=self.base.Ysp.shape).tocoo();
+                r = np.r_[Y.row,[key[0] for key in extra]];
+                c = np.r_[Y.col,[key[1] for key in extra]];
+                y = np.r_[Y.data,list(extra.values())];
+                self.case = solver.Case(sp.coo_matrix((y,(r,c)),shape=Y.shape),self.Line,self.BNo,self.base.ordering);
+                self.case = self.case.Patch(self.case.Ysp.data,self.Line,self.status);
+            self.dirty = False;
+        return self.case;
+
+    '''
+    Edited YBus as dense NxN Matrix
+    '''
+    def YBus(self):
+        return self.Case().Ysp.toarray();
+
+    '''
+    Line table of the lines in service
+    '''
+    def Lines(self):
+        return self.Line[self.status];
+
+    '''
+    DC sensitivities (sensitivity.Sensitivity) of the edited network
+    '''
+    def Sensitivity(self):
+        if self.sens is None:
+            slack = self.BNo[np.where(self.BT0.flatten() == SLACK)[0][0],0];
+            self.sens = sensitivity.Sensitivity(self.Line0,self.BNo,slack);
+            self.sensedits = -1;
+        if self.sensedits != self.edits or self.sens.l != len(self.Line):
+            self.sens.Update(self.Line,np.where(self.status,1/self.Line[:,5],0.0));
+            self.sensedits = self.edits;
+        return self.sens;
+
+    '''
+    Load flow of the edited network, same results as loadflow.LoadFlow.Solve()
+    with one row per line of the line table (zero flow on lines out of service)
+    Warm is (V,D) of a previous solution to start from
+    Method and Factor are passed to loadflow.LoadFlow when the network is in one piece,
+    self.lf is then the solver used. If Method is not given and the Q and V limits are off
+    a radial network is solved by radial.Radial sweeps, falling back to loadflow.LoadFlow
+    if those do not converge
+    '''
+    def Solve(self,store=None,scenario=None,Warm=None,Method=None,Factor=None):
+        Line = self.Lines();
+        count,labels = topology.Islands(self.n,Line,self.BNo);
+        self.lf = None;
+        if count == 1 and np.sum(self.BT == SLACK) == 1:
+            if Method is None and not self.Vlimit and not self.Qlimit and len(Line) == self.n-1:
+                self.lf = radial.Radial(self.n,self.P,self.Q,self.V,self.BT,None,self.Max,self.Vlimit,self.Qlimit,
+                        self.Line,self.BNo,self.T,self.status,Case=self.Case(),Warm=Warm);
+                result = self.lf.Solve();
+                if self.lf.converged:
+                    if store is not None:
+                        store.Write(scenario,result);
+                    return result;
+            self.lf = solver.LoadFlow(self.n,self.P,self.Q,self.V,self.BT,None,self.Max,self.Vlimit,self.Qlimit,
+                    self.Line,self.BNo,Case=self.Case(),Warm=Warm,Method=Method or 'newton',Factor=Factor);
+            return self.lf.Solve(store,scenario);
+
+        result = topology.Solve(self.n,self.P,self.Q,self.V,self.BT,self.YBus(),self.Max,self.Vlimit,self.Qlimit,
+                Line,self.BNo,Workers=1,Warm=Warm);
+        for idx in range(6,10):
+            flows = np.zeros(len(self.Line));
+            flows[self.status] = result[idx];
+            result[idx] = flows;
+        if store is not None:
+            store.Write(scenario,result);
+        return result;
@@ -0,0 +1,182 @@
+'''
+Load FLow Analyser
+Copyright (C) 2020 Akshay Arvind Laturkar
+
+Date Created : 19 October 2026 -- Version 1.2.0
+
+This program is free software: you can redistribute it
+and/or modify it under the terms of the GNU General
+Public License as published by the Free Software
+Foundation, either version 3 of the License, or
+any later version.
+
+This program is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the
+implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE.  See the GNU General Public License
+for more details.
+
+You should have received a copy of the GNU General Public
+License along with this program.
+If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+File Version History
+V1.2.0 : October 19, 2026
+         Delta reload of updated feed files with incremental, warm started re-solve
+         Feed file times recorded only once their contents are applied
+'''
+
+
+import numpy as np;
+import os;
+import time;
+import network;
+import incremental;
+
+class Ingest:
+
+    '''
+    Bus feed and Line feed files kept validated in memory and re-read as deltas
+
+    The first load validates both feeds in full, builds the network and solves it.
+    On Reload the updated file is diffed against the validated version by
+    'Bus No' / 'Line No', only the added and changed rows are validated, and
+    the changes are applied to the incremental editor (YBus patches and solver
+    inputs) before a re-solve warm started from the previous solution.
+    Adding or removing buses rebuilds the network.
+
+    Errors in the feeds raise ValueError with the validation message, the last
+    valid version is kept and a file is read again on every Reload until its
+    contents are applied.
+
+    This is a library API for scripts and services watching feed files, the
+    application reads the feeds itself.
+    '''
+    def __init__(self,busfile,nwfile,MaxIter,Vlimit,Qlimit):
+        self.busfile = busfile;
+        self.nwfile = nwfile;
+        self.Max = MaxIter;
+        self.Vlimit = Vlimit;
+        self.Qlimit = Qlimit;
+        mtime = self.__Times();
+        self.__Load(self.__Read(busfile,network.BUS_HEADER,network.BUS_HEADER_DEFAULT),
+                self.__Read(nwfile,network.NW_HEADER,network.NW_HEADER_DEFAULT));
+        # mtime -- times of the applied feeds, seen -- times of the feeds last read
+        self.mtime = mtime;
+        self.seen = dict(mtime);
+
+    def __Times(self):
+        return {f:os.path.getmtime(f) for f in [self.busfile,self.nwfile]};
+
+    def __Read(self,filename,header,default):
+        try:
+            return network.Columns(network.Read(filename,default),header);
+        except (KeyError,ValueError) as err:
+            raise ValueError(str(err));
+
+    def __Load(self,bus,line):
+        for msg in [network.CheckBuses(bus),network.CheckBus(bus),network.CheckLine(line,bus['Bus No'])]:
+            if msg is not None:
+                raise ValueError(msg);
+        self.bus = bus;
+        self.line = line;
+        self.net = network.Network(bus,line);
+        self.inc = incremental.Incremental(*self.net.Args(self.Max,self.Vlimit,self.Qlimit),self.net.T);
+        self.raw = self.inc.Solve();
+
+    '''
+    True if either feed file was saved since it was last read
+    '''
+    def Changed(self):
+        return any(os.path.getmtime(f) != t for f,t in self.seen.items());
+
+    '''
+    Re-read the feed files that changed and apply only the differences
+    Returns dictionary with the counts of added, removed and changed buses and lines,
+    rebuilt (True if the network was built again) and time taken
+    '''
+    def Reload(self):
+        t = time.time();
+        mtime = self.__Times();
+        self.seen = mtime;
+        bus,line = self.bus,self.line;
+        if mtime[self.busfile] != self.mtime[self.busfile]:
+            bus = self.__Read(self.busfile,network.BUS_HEADER,network.BUS_HEADER_DEFAULT);
+        if mtime[self.nwfile] != self.mtime[self.nwfile]:
+            line = self.__Read(self.nwfile,network.NW_HEADER,network.NW_HEADER_DEFAULT);
+
+        badd,bdel,bchg,bold = network.Diff(self.bus,bus,'Bus No');
+        ladd,ldel,lchg,lold = network.Diff(self.line,line,'Line No');
+        summary = {'bus':(len(badd),len(bdel),len(bchg)),'line':(len(ladd),len(ldel),len(lchg)),'rebuilt':False};
+
+        if len(badd) != 0 or len(bdel) != 0:
+            self.__Load(bus,line);
+            summary['rebuilt'] = True;
+        else:
+            msg = network.CheckBuses(bus);
+            if msg is None:
+                msg = network.CheckBus(network.Rows(bus,bchg));
+            if msg is None:
+                msg = network.CheckLine(network.Rows(line,np.r_[ladd,lchg]),bus['Bus No']);
+            if msg is not None:
+                raise ValueError(msg);
+
+            inc = self.inc;
+            for i in bchg:
+                bno = bus['Bus No'][i];
+                inc.SetBus(bno,P=bus['Pg'][i]-bus['Pd'][i],Q=bus['Qg'][i]-bus['Qd'][i],Qmin=bus['Qg (min)'][i],
+                        Qmax=bus['Qg (max)'][i],Qd=bus['Qd'][i],V=bus['V'][i],Vmin=bus['V (min)'][i],
+                        Vmax=bus['V (max)'][i],BT=bus['Bus Type'][i]);
+                inc.SetShunt(bno,bus['Shunt Feed'][i]);
+            for k in ldel:
+                inc.RemoveLine(self.line['Line No'][k]);
+            for k in lchg:
+                inc.EditLine(line['Line No'][k],R=line['R'][k],X=line['X'][k],B2=line['B/2'][k],T=line['T'][k],
+                        From=line['From Bus'][k],To=line['To Bus'][k]);
+            for k in ladd:
+                lno = line['Line No'][k];
+                if inc.lmap[lno] >= 0:
+                    # Line taken out by an earlier reload, back with the new data
+                    inc.EditLine(lno,R=line['R'][k],X=line['X'][k],B2=line['B/2'][k],T=line['T'][k],
+                            From=line['From Bus'][k],To=line['To Bus'][k]);
+                    inc.AddLine(lno);
+                else:
+                    inc.AddLine(lno,line['From Bus'][k],line['To Bus'][k],line['R'][k],line['X'][k],line['B/2'][k],line['T'][k]);
+            self.bus = bus;
+            self.line = line;
+            self.raw = inc.Solve(Warm=(self.raw[4][:,0],self.raw[5][:,0]));
+
+        self.mtime = mtime;
+        summary['time'] = time.time()-t;
+        return summary;
+
+    '''
+    Reload when a feed file changes, polling every interval seconds
+    callback is called with the Reload() summary and Result(), errors are passed as
+    ValueError instead of the summary. Stops after count reloads if count is given
+    '''
+    def Watch(self,callback=None,interval=1.0,count=None):
+        done = 0;
+        while count is None or done < count:
+            time.sleep(interval);
+            if not self.Changed():
+                continue;
+            try:
+                summary = self.Reload();
+                if callback is not None:
+                    callback(summary,self.Result());
+            except ValueError as err:
+                if callback is not None:
+                    callback(err,None);
+            done += 1;
+
+    '''
+    Latest LoadFlow.Solve() results in the row order of the present feeds
+    '''
+    def Result(self):
+        bidx = self.inc.bmap[self.bus['Bus No']];
+        lidx = self.inc.lmap[self.line['Line No']];
+        result = [self.raw[0]]+[arr[bidx] for arr in self.raw[1:6]]+[arr[lidx] for arr in self.raw[6:10]];
+        return result;
@@ -31,11 +31,260 @@ V1.1.1 : March 28, 2020 By Akshay Arvind Laturkar
 V1.1.2 : March 29, 2020 By Akshay Arvind Laturkar
          Bug Fix, Two redudant lines present between two buses, P was same
          Bug Fix, When Bus order is changed, YBus was wrongly referenced
+V1.2.0 : October 19, 2026
+         Solve can write results straight into a ResultStore scenario slice
+         Added vectorized LineFlows for analysis modules
+         Mismatch and Jacobian split out of Solve so other modes can reuse them
+         Newton step solved by sparse LU on a cached fill reducing bus ordering
+         Jacobian assembled into a preallocated sparse workspace, values overwritten in place
+         Compiled Case holds the network only data, shared read only by all solves of a network
+         Bus types are integer coded inside the solver, network arrays are taken without copying
+         Arbitrary Bus No, YBus is indexed by bus feed row through a vectorized Bus No map
+         Cases can be patched with new YBus values and line admittances on the same pattern
+         Warm start from a previous solution
+         Vectorized Q and V limit enforcement with switching policies and switch counts
+         Cases can be taken apart into arrays and put back together without recomputing
+         Inexact Newton-Krylov mode, ILU preconditioned GMRES or BiCGStab with adaptive forcing terms
+         Chord mode reusing the last Jacobian factorization, factorizations can be handed to nearby cases
+         Factorization of the Jacobian at the solution kept for post solution sensitivities
+         Mismatch, power injections and Jacobian evaluated in workspace buffers, no per iteration arrays
+         Bus ordering cache bounded to the most recent topologies
 '''
 
 
 import numpy as np;
-from collections import Counter;
+import scipy.sparse as sp;
+import scipy.sparse.linalg as spla;
+from scipy.sparse.csgraph import reverse_cuthill_mckee;
+from collections import OrderedDict;
+import time;
+import copy;
+from resultstore import EncodeBusType,DecodeBusType,PQ,PV;
+
+# Fill reducing bus orderings of the most recently compiled topologies, per method
+ORDERINGS = OrderedDict();
+MAX_ORDERINGS = 64;
+
+# Limit enforcement policy
+# start_mismatch -- limits are checked once the largest mismatch is below it
+# back_switch -- a bus switched at a limit goes back to its own type once the limit no longer binds
+# max_switches -- a bus switched this many times keeps its present type
+LIMITS = {'start_mismatch':1e-1,'back_switch':True,'max_switches':4};
+
+# Newton step solvers
+METHODS = ['newton','krylov','chord'];
+
+# Chord (Method 'chord') settings
+# max_ratio -- the kept factorization is used while every step brings the largest mismatch
+#              below max_ratio times that of the step before, otherwise the Jacobian is factorized again
+CHORD = {'max_ratio':0.25};
+
+# Inexact Newton (Method 'krylov') settings
+# linear -- 'gmres' or 'bicgstab' for the Newton step
+# eta_max, eta_min -- bounds of the forcing term, the relative tolerance of each linear solve
+# gamma, alpha -- forcing term gamma*(|F(k)|/|F(k-1)|)^alpha (Eisenstat-Walker choice 2)
+# drop_tol, fill_factor -- incomplete LU preconditioner
+# rebuild_ratio -- preconditioner is rebuilt when a step reduces the mismatch norm by less than this
+# rebuild_inner -- or when the last linear solve took more than this many iterations
+# restart, max_inner -- GMRES restart length and the iteration cap of one linear solve
+KRYLOV = {'linear':'gmres','eta_max':0.1,'eta_min':1e-8,'gamma':0.9,'alpha':2.0,'drop_tol':1e-3,'fill_factor':10,
+        'rebuild_ratio':0.5,'rebuild_inner':40,'restart':50,'max_inner':200};
+
+'''
+Fill reducing elimination order of the buses for the sparsity pattern of YBus
+method is 'MMD' (minimum degree on YBus pattern), 'COLAMD', 'RCM' or 'NATURAL'
+Cached for the MAX_ORDERINGS most recent topologies and methods, returns rank of each
+YBus row in the order
+'''
+def BusOrdering(YBus,method='MMD'):
+    pattern = sp.csc_matrix(YBus != 0);
+    n = pattern.shape[0];
+    key = (method,n,hash(pattern.indptr.tobytes()),hash(pattern.indices.tobytes()));
+    if key in ORDERINGS:
+        ORDERINGS.move_to_end(key);
+        return ORDERINGS[key];
+
+    if method == 'NATURAL':
+        rank = np.arange(n);
+    elif method == 'RCM':
+        rank = np.argsort(reverse_cuthill_mckee(pattern.tocsr(),symmetric_mode=True));
+    elif method == 'MMD' or method == 'COLAMD':
+        # Diagonally dominant matrix on the pattern so SuperLU does not pivot away from the ordering
+        A = pattern.astype(float);
+        A = (sp.diags(np.asarray(A.sum(axis=1)).flatten()+1)-A).tocsc();
+        spec = 'MMD_AT_PLUS_A' if method == 'MMD' else 'COLAMD';
+        rank = spla.splu(A,permc_spec=spec).perm_c.copy();
+    else:
+        raise ValueError("Unknown bus ordering '"+str(method)+"'");
+
+    ORDERINGS[key] = rank;
+    if len(ORDERINGS) > MAX_ORDERINGS:
+        ORDERINGS.popitem(last=False);
+    return rank;
+
+class IndexMap:
+
+    '''
+    Vectorized map from integer IDs (Bus No, Line No) to their position in ids
+    Compact IDs are looked up in a dense table, sparse IDs by binary search
+    over the sorted IDs, so a lookup never scans. Unknown IDs map to -1
+    '''
+    def __init__(self,ids):
+        ids = np.asarray(ids).flatten().astype(np.int64);
+        self.n = len(ids);
+        self.lo = int(np.min(ids)) if self.n != 0 else 0;
+        span = int(np.max(ids))-self.lo+1 if self.n != 0 else 0;
+        if span <= 4*self.n+1024:
+            self.table = np.full(span,-1,dtype=np.int64);
+            self.table[ids-self.lo] = np.arange(self.n);
+            self.table.flags.writeable = False;
+            self.order = None;
+        else:
+            self.table = None;
+            self.order = np.argsort(ids,kind='stable');
+            self.sorted = ids[self.order];
+
+    def __getitem__(self,ids):
+        scalar = np.ndim(ids) == 0;
+        ids = np.asarray(ids).astype(np.int64);
+        if self.table is not None:
+            k = ids-self.lo;
+            valid = (k >= 0) & (k < len(self.table));
+            idx = np.where(valid,self.table[np.where(valid,k,0)],-1);
+        else:
+            k = np.minimum(np.searchsorted(self.sorted,ids),max(self.n-1,0));
+            idx = np.where(self.sorted[k] == ids,self.order[k],-1);
+        return int(idx) if scalar else idx;
+
+    def __len__(self):
+        return self.n;
+
+# Compiled cases of the most recently solved networks
+CASES = OrderedDict();
+MAX_CASES = 8;
+
+class Case:
+
+    '''
+    Network only data of a case, built once and shared read only by every solve
+    YBus is NxN Matrix in bus feed row order, Line is Lx6 Matrix as LNo,From Bus,To Bus,B/2,R,X,
+    BNo is Nx1 Matrix of Bus No (any integers)
+
+    Ysp is YBus as CSR with the diagonal always present, G and B its conductance and
+    susceptance, Yr/Yc the YBus row/col of every nonzero and Ydiag the nonzeros on the
+    diagonal. brank is the fill reducing bus ordering. bmap maps Bus No to bus feed row.
+    Line ends are kept as bus feed rows (fidx,tidx) with series (yij) and shunt (yi0) admittances.
+    '''
+    def __init__(self,YBus,Line,BNo,Ordering='MMD'):
+        t = time.time();
+        if sp.issparse(YBus):
+            YBus = sp.coo_matrix(YBus);
+            r,c,y = YBus.row,YBus.col,YBus.data;
+        else:
+            YBus = np.asarray(YBus);
+            r,c = np.nonzero(YBus);
+            y = YBus[r,c];
+        n = YBus.shape[0];
+        self.n = n;
+        self.ordering = Ordering;
+        self.brank = BusOrdering(YBus,Ordering);
+
+        Y = sp.csr_matrix((np.r_[y,np.zeros(n)],(np.r_[r,np.arange(n)],np.r_[c,np.arange(n)])),shape=(n,n));
+        Y.sort_indices();
+        self.Ysp = Y;
+        self.G = Y.data.real.copy();
+        self.B = Y.data.imag.copy();
+        self.Yr = np.repeat(np.arange(n),np.diff(Y.indptr));
+        self.Yc = Y.indices.astype(np.int64);
+        self.Ydiag = np.where(self.Yr == self.Yc)[0];
+
+        Line = np.asarray(Line,dtype=float).reshape((-1,6));
+        BNo = np.asarray(BNo).flatten().astype(np.int64);
+        self.bmap = IndexMap(BNo);
+        self.__Lines(Line,None);
+
+        for arr in [Y.data,Y.indices,Y.indptr,self.G,self.B,self.Yr,self.Yc,self.Ydiag]:
+            arr.flags.writeable = False;
+        self.compile_time = time.time()-t;
+
+    def __Lines(self,Line,status):
+        self.fidx = self.bmap[Line[:,1]];
+        self.tidx = self.bmap[Line[:,2]];
+        self.yij = 1/(Line[:,4]+Line[:,5]*1j);
+        self.yi0 = Line[:,3]*1j;
+        if status is not None:
+            self.yij[~status] = 0;
+            self.yi0[~status] = 0;
+        for arr in [self.fidx,self.tidx,self.yij,self.yi0]:
+            arr.flags.writeable = False;
+
+    '''
+    Case with the YBus nonzeros replaced by data (same pattern as Ysp) and the lines by Line
+    status is L length bool, lines out of service carry no flow
+    Ordering, index maps and pattern are shared with this case, nothing is recomputed
+    '''
+    def Patch(self,data,Line,status=None):
+        case = copy.copy(self);
+        data = np.array(data,dtype=complex);
+        case.Ysp = sp.csr_matrix((data,self.Ysp.indices,self.Ysp.indptr),shape=self.Ysp.shape);
+        case.G = data.real.copy();
+        case.B = data.imag.copy();
+        for arr in [data,case.G,case.B]:
+            arr.flags.writeable = False;
+        case.__Lines(np.asarray(Line,dtype=float).reshape((-1,6)),status);
+        return case;
+
+    '''
+    Arrays of the case as dictionary of name to array, FromArrays() puts them back together
+    '''
+    def Arrays(self):
+        Y = self.Ysp;
+        return {'data':Y.data,'indices':Y.indices,'indptr':Y.indptr,'Yr':self.Yr,'Yc':self.Yc,'Ydiag':self.Ydiag,
+                'brank':self.brank,'fidx':self.fidx,'tidx':self.tidx,'yij':self.yij,'yi0':self.yi0};
+
+    '''
+    Case from the arrays of Arrays() and the Bus No, the arrays are used as they are (no copies),
+    so they may be read only views such as memory mapped files
+    '''
+    @classmethod
+    def FromArrays(cls,arrays,BNo,Ordering='MMD'):
+        case = cls.__new__(cls);
+        n = len(arrays['indptr'])-1;
+        case.n = n;
+        case.ordering = Ordering;
+        case.brank = arrays['brank'];
+        case.Ysp = sp.csr_matrix((arrays['data'],arrays['indices'],arrays['indptr']),shape=(n,n),copy=False);
+        case.G = case.Ysp.data.real;
+        case.B = case.Ysp.data.imag;
+        for name in ['Yr','Yc','Ydiag','fidx','tidx','yij','yi0']:
+            setattr(case,name,arrays[name]);
+        case.bmap = IndexMap(BNo);
+        case.compile_time = 0.0;
+        return case;
+
+    '''
+    Line flows for V,D given as N length arrays in bus feed row order
+    Returns Pij,Pji,Qij,Qji as L length arrays
+    '''
+    def LineFlows(self,V,D):
+        return Flows(V,D,self.fidx,self.tidx,self.yij,self.yi0);
+
+'''
+Compiled Case for a network, reused when the same network is solved again
+'''
+def Compile(YBus,Line,BNo,Ordering='MMD'):
+    YBus = np.ascontiguousarray(YBus);
+    Line = np.ascontiguousarray(Line,dtype=float);
+    BNo = np.ascontiguousarray(BNo,dtype=np.int64);
+    key = (Ordering,YBus.shape,hash(YBus.tobytes()),hash(Line.tobytes()),hash(BNo.tobytes()));
+    if key in CASES:
+        CASES.move_to_end(key);
+        return CASES[key];
+    case = Case(YBus,Line,BNo,Ordering);
+    CASES[key] = case;
+    if len(CASES) > MAX_CASES:
+        CASES.popitem(last=False);
+    return case;
 
 class LoadFlow:
     
@@ -45,191 +294,526 @@ class LoadFlow:
     Q is Nx4 Matrix as Q,Qmin,Qmax,Qd
     V is Nx3 Matrix as V,Vmin,Vmax
     BT is Nx1 Matrix for Bus Type
-    YBus is NxN Matrix
+    YBus is NxN Matrix, rows and columns in the order of the buses in BNo
     MaxIter is Max. No. of Iterations
     Vlimit is True if limits are enabled
     Qlimit is True if limits are disabled
     Line is Lx6 Matrix as LNo,From Bus,To Bus,B/2,R,X
-    BNo is Nx1 Matrix
+    BNo is Nx1 Matrix of Bus No, any distinct integers
+    Ordering is the fill reducing ordering used for the sparse LU of the Jacobian
+    Case is the compiled Case of the network, looked up (or compiled) from YBus,Line,BNo if not given
+    Warm is (V,D) of a previous solution, Nx1 each in bus order, to start from instead of a flat
+    start. PQ bus voltages and all angles are taken from it, PV and Slack buses keep their setpoints
+    Limits is dictionary overriding entries of the module LIMITS policy
+    Method is 'newton' (sparse LU of every Jacobian) or 'krylov' (inexact Newton, each step
+    solved by ILU preconditioned GMRES or BiCGStab to a relative tolerance that tightens as
+    the mismatch falls), Krylov is dictionary overriding entries of the module KRYLOV settings.
+    The ILU is kept over iterations and rebuilt only when convergence degrades, so its fill
+    is the memory of the solve; for very large networks give a Case built from a scipy
+    sparse YBus (Case takes one) and YBus None. Outer (Newton) and inner (linear) iterations
+    and preconditioner builds are counted in stats.
+    Method 'chord' keeps the last LU of the Jacobian and solves later steps with it, the
+    Jacobian is built and factorized again only when a step reduces the mismatch by less than
+    the CHORD max_ratio or a bus changes type, Chord is dictionary overriding entries of CHORD.
+    Factor is the Factor() of a solved nearby case (same network pattern and bus types, such
+    as the base case of an outage or the previous step of a time series) to start from.
+    Steps solved with a kept factorization are counted as reuses in stats.
+
+    Q limits apply to PV buses, a PV bus beyond Qg (min) / Qg (max) becomes PQ at the limit.
+    V limits apply to PQ buses, a PQ bus beyond V (min) / V (max) becomes PV at the limit.
+    Switches per bus are kept in self.switches (Nx1 in bus order) and their total in stats
     '''
-    def __init__(self,N,P,Q,V,BT,YBus,MaxIter,Vlimit,Qlimit,Line,BNo):
+    def __init__(self,N,P,Q,V,BT,YBus,MaxIter,Vlimit,Qlimit,Line,BNo,Ordering='MMD',Case=None,Warm=None,Limits=None,
+            Method='newton',Krylov=None,Chord=None,Factor=None):
+        if Method not in METHODS:
+            raise ValueError("Unknown solver method '"+str(Method)+"'");
         self.n = N;
-        self.BT = np.array(BT).reshape((N,1)).copy();
+        self.BT = EncodeBusType(BT).astype(np.int8).reshape((N,1));
         self.P = np.array(P).reshape((N,1)).copy();
         self.Q = np.array(Q).reshape((N,4)).copy();
         self.V = np.array(V).reshape((N,3)).copy();
-        self.BT = np.array(BT).reshape((N,1)).copy();
-        self.YBus = np.array(YBus).reshape((N,N)).copy();
         self.D = np.zeros((self.n,1));
         self.Max = MaxIter;
         self.Vlimit = Vlimit;
         self.Qlimit = Qlimit;
-        self.Line = np.array(Line).reshape((len(Line),6)).copy(); # As not used in Load flow equations, sorting is not required
-        self.BNo = np.array(BNo).reshape((N,1)).copy(); # As not used in Load flow equations, sorting is not required
+        self.Line = np.asarray(Line).reshape((len(Line),6)); # As not used in Load flow equations, sorting is not required
+        self.BNo = np.asarray(BNo).reshape((N,1)); # As not used in Load flow equations, sorting is not required
+        t = time.time();
+        if Case is None:
+            Case = Compile(np.array(YBus).reshape((N,N)),self.Line,self.BNo,Ordering);
+        self.case = Case;
+        self.brank = Case.brank;
+        self.__Workspace();
+        self.stats = {'ordering':Case.ordering,'ordering_time':time.time()-t,'factorizations':0,'factor_time':0.0,
+                'nnzJ':0,'nnzLU':0,'fill':0.0,'switches':0,'outer':0,'inner':0,'preconditioners':0,
+                'precond_time':0.0,'nnzILU':0,'reuses':0};
+        self.limits = dict(LIMITS);
+        if Limits is not None:
+            self.limits.update(Limits);
+        self.method = Method;
+        self.krylov = dict(KRYLOV);
+        if Krylov is not None:
+            self.krylov.update(Krylov);
+        # Preconditioner and the Jacobian pattern it was built on, forcing term and mismatch norm of the last step
+        self.ilu = None;
+        self.ilu_pattern = None;
+        self.eta = None;
+        self.fnorm = None;
+        self.inner = 0;
+        self.chord = dict(CHORD);
+        if Chord is not None:
+            self.chord.update(Chord);
+        # Last LU with the Jacobian pattern it factorizes, and the mismatch of the last chord step
+        self.lu = None;
+        self.lu_key = None;
+        self.cerr = None;
+        self.final = None;
+        # Setpoints and limit state in bus order, lim is +-1 at Qg (max/min), +-2 at V (max/min)
+        self.Vset = self.V[:,0].copy();
+        self.Qset = self.Q[:,0].copy();
+        self.lim = np.zeros(N,dtype=np.int8);
+        self.switches = np.zeros((N,1),dtype=np.int64);
         self.__Sort();
+        if Factor is not None and Factor['key'] == self.jkey:
+            self.lu = Factor['lu'];
+            self.lu_key = self.jkey;
         self.V[0:self.pq,0] = 1.0;
+        if Warm is not None:
+            Vw = np.asarray(Warm[0],dtype=float).reshape((N,-1))[self.indx[0:self.pq],0];
+            self.V[0:self.pq,0] = np.where(Vw > 0,Vw,1.0);     # Dead buses of the previous solution start flat
+            self.D[:,0] = np.asarray(Warm[1],dtype=float).reshape((N,-1))[self.indx,0];
+            self.D[:,0] -= self.D[-1,0];
 
     def __Sort(self):
-        self.indx = np.argsort(self.BT,axis=0).flatten();
+        self.sorted = True;
+        self.indx = np.argsort(self.BT[:,0],kind='stable');
         self.BT = self.BT[self.indx];
         self.P = self.P[self.indx];
         self.Q = self.Q[self.indx];
         self.V = self.V[self.indx];
         self.D = self.D[self.indx];
-        self.pq = int(Counter(self.BT.flatten())['PQ']);
+        self.pq = int(np.sum(self.BT == PQ));
         # Added Bus Index as part of Bug Fix -V1.1.2
-        self.bindx = np.array(self.BNo[self.indx]).flatten()-1;
+        # YBus row of each sorted bus, YBus follows the bus feed order
+        self.bindx = self.indx.copy();
+        self.__JacobianOrder();
 
-    # Modified on March 29, 2020 -- Bug Fix -V1.1.2 Used bindx as reference in YBus
-    def __P_calc(self,idx):
-        Y = np.transpose(self.YBus[self.bindx[idx]][self.bindx]).reshape((self.n,1));
-        return self.V[idx,0]*np.sum(self.V[:,0].reshape((self.n,1))*abs(Y)*np.cos(np.angle(Y)-self.D[idx,0]+self.D));
+    '''
+    Back to bus order
+    '''
+    def __Unsort(self):
+        self.sorted = False;
+        rev = np.argsort(self.indx);
+        self.BT = self.BT[rev];
+        self.P = self.P[rev];
+        self.Q = self.Q[rev];
+        self.V = self.V[rev];
+        self.D = self.D[rev];
 
-    # Modified on March 29, 2020 -- Bug Fix -V1.1.2 Used bindx as reference in YBus
-    def __Q_calc(self,idx):
-        Y = np.transpose(self.YBus[self.bindx[idx]][self.bindx]).reshape((self.n,1));
-        return -self.V[idx,0]*np.sum(self.V[:,0].reshape((self.n,1))*abs(Y)*np.sin(np.angle(Y)-self.D[idx,0]+self.D));
-
-    # Modified on March 29, 2020 -- Bug Fix - V1.1.2 Fetched R,X from line data instead of YBus
-    def __Pij(self,lidx,rev):
-        lidx = np.where(self.Line[:,0] == lidx)[0][0];  # Line index
-        r = self.Line[lidx,4];
-        x = self.Line[lidx,5]*1j;
-        b = self.Line[lidx,3]*1j;
-        if(rev):
-            busi = self.Line[lidx,2];
-            busj = self.Line[lidx,1];
-        else:
-            busi = self.Line[lidx,1];
-            busj = self.Line[lidx,2];
-        yi0 = b;
-        yij = 1/(r+x);
-        busi_idx = np.where(self.BNo == busi)[0][0];    # Bus i index
-        busj_idx = np.where(self.BNo == busj)[0][0];    # Bus j index
-        p1 = self.V[busi_idx,0]*self.V[busi_idx,0]*abs(yi0+yij)*np.cos(np.angle(yi0+yij));
-        p2 = self.V[busi_idx,0]*self.V[busj_idx,0]*abs(yij)*np.cos(np.angle(yij)-self.D[busi_idx,0]+self.D[busj_idx,0]);
-        return p1-p2;
-
-    # Modified on March 29, 2020 -- Bug Fix -V1.1.2 Fetched R,X from line data instead of YBus
-    def __Qij(self,lidx,rev):
-        lidx = np.where(self.Line[:,0] == lidx)[0][0];  # Line index
-        r = self.Line[lidx,4];
-        x = self.Line[lidx,5]*1j;
-        b = self.Line[lidx,3]*1j;
-        if(rev):
-            busi = self.Line[lidx,2];
-            busj = self.Line[lidx,1];
+    '''
+    Enforce Q and V limits on the present state, all buses at once
+    Buses at a limit are only let go when close is True (mismatch below start_mismatch)
+    and no other bus is switched at the same time
+    Returns the no. of buses switched
+    '''
+    def __Limits(self,close):
+        pol = self.limits;
+        o = self.indx;
+        BT = self.BT[:,0];
+        Q = self.Q;
+        V = self.V;
+        lim = self.lim[o];
+        free = self.switches[o,0] < pol['max_switches'];
+        Qc = self.Power()[self.bindx].imag;
+        pv = free & (BT == PV);
+        pq = free & (BT == PQ);
+        qband = abs(Q[:,1]-Q[:,2]) > 1e-10;
+        vband = abs(V[:,1]-V[:,2]) > 1e-10;
+        back = pol['back_switch'] and close;
+
+        # Stages of (buses, new type, new limit state), only the first stage with a violation is acted on
+        # Generators hit their Q limits first, load bus voltages are judged after that
+        stages = [[],[],[]];
+        if self.Qlimit:
+            gen = pv & (lim == 0) & qband;
+            stages[0] += [(gen & (Qc+Q[:,3] > Q[:,2]),PQ,1),(gen & (Qc+Q[:,3] < Q[:,1]),PQ,-1)];
+            if back:
+                stages[2] += [(pq & (lim == 1) & (V[:,0] > self.Vset[o]),PV,0),(pq & (lim == -1) & (V[:,0] < self.Vset[o]),PV,0)];
+        if self.Vlimit:
+            load = pq & (lim == 0) & vband;
+            stages[1] += [(load & (V[:,0] > V[:,2]),PV,2),(load & (V[:,0] < V[:,1]),PV,-2)];
+            if back:
+                stages[2] += [(pv & (lim == 2) & (Qc > self.Qset[o]),PQ,0),(pv & (lim == -2) & (Qc < self.Qset[o]),PQ,0)];
+        moves = [];
+        for stage in stages:
+            if any(np.any(mask) for mask,bt,state in stage):
+                moves = stage;
+                break;
+
+        count = 0;
+        for mask,bt,state in moves:
+            k = np.where(mask)[0];
+            if len(k) == 0:
+                continue;
+            if state == 1:
+                Q[k,0] = Q[k,2]-Q[k,3];
+            elif state == -1:
+                Q[k,0] = Q[k,1]-Q[k,3];
+            elif state == 2:
+                V[k,0] = V[k,2];
+            elif state == -2:
+                V[k,0] = V[k,1];
+            elif bt == PV:
+                V[k,0] = self.Vset[o[k]];
+            else:
+                Q[k,0] = self.Qset[o[k]];
+            self.BT[k,0] = bt;
+            self.lim[o[k]] = state;
+            self.switches[o[k],0] += 1;
+            count += len(k);
+
+        if count != 0:
+            self.stats['switches'] += count;
+            self.__Unsort();
+            self.__Sort();
+        return count;
+
+    '''
+    Buffers reused by every iteration of this solver
+    '''
+    def __Workspace(self):
+        n = self.n;
+        nnz = len(self.case.Ysp.data);
+        d = self.case.Ydiag;
+        self.work = {'Vc':np.zeros(n,dtype=complex),'W':np.zeros(nnz,dtype=complex),'Vm':np.zeros(n),
+                'vals':np.zeros(4*nnz),'Vmc':np.zeros(nnz),'Vr':np.zeros(nnz,dtype=complex),
+                'S':np.zeros(n,dtype=complex),'Ss':np.zeros(n,dtype=complex),'Sd':np.zeros(n),
+                'rows':self.case.Ysp.indptr[:-1].astype(np.intp),'diag':[d,nnz+d,2*nnz+d,3*nnz+d],
+                # Own writeable copies, take() copies read only index arrays on every call
+                'Yr':self.case.Yr.copy(),'Yc':self.case.Yc.copy()};
+
+    '''
+    Jacobian workspace for the present bus types
+    Row and column permutation from the bus ordering keep the unknowns of a bus
+    together, P/D before Q/V, so only the bus type bookkeeping changes and the
+    bus ordering is reused. The nonzero pattern of the permuted Jacobian and the
+    map from YBus nonzeros to its data array are built here once, iterations
+    only overwrite the values in place.
+    '''
+    def __JacobianOrder(self):
+        n = self.n;
+        n_pq = self.pq;
+        rank = self.brank[self.bindx];
+        rkey = np.r_[2*rank[:n-1],2*rank[:n_pq]+1];
+        ckey = np.r_[2*rank[:n_pq]+1,2*rank[:n-1]];
+        self.rperm = np.argsort(rkey,kind='stable');
+        self.cperm = np.argsort(ckey,kind='stable');
+        self.rinv = np.argsort(self.rperm);
+        self.cinv = np.argsort(self.cperm);
+
+        # Sorted position of every YBus bus
+        self.pos = np.zeros(n,dtype=np.int64);
+        self.pos[self.bindx] = np.arange(n);
+        pr = self.pos[self.case.Yr];
+        pc = self.pos[self.case.Yc];
+        nnz = len(pr);
+        k = np.arange(nnz);
+
+        # Blocks as (mask, row, col, offset into vals) with vals = [Re dS/dVm, Re dS/dD, Im dS/dVm, Im dS/dD]
+        blocks = [((pr < n-1) & (pc < n_pq),pr,pc,0),
+                  ((pr < n-1) & (pc < n-1),pr,n_pq+pc,nnz),
+                  ((pr < n_pq) & (pc < n_pq),n-1+pr,pc,2*nnz),
+                  ((pr < n_pq) & (pc < n-1),n-1+pr,n_pq+pc,3*nnz)];
+        rows = np.concatenate([row[mask] for mask,row,col,off in blocks]);
+        cols = np.concatenate([col[mask] for mask,row,col,off in blocks]);
+        src = np.concatenate([off+k[mask] for mask,row,col,off in blocks]);
+
+        m = n_pq+n-1;
+        ids = sp.csc_matrix((np.arange(len(src),dtype=float),(self.rinv[rows],self.cinv[cols])),shape=(m,m));
+        ids.sort_indices();
+        self.jsrc = src[ids.data.astype(np.int64)];
+        self.Jp = ids;
+        self.Jp.data[:] = 0;
+        self.work['Err'] = np.zeros((m,1));
+        # Identifies the pattern and order of the Jacobian, a factorization only fits the same key
+        self.jkey = (n,n_pq,hash(self.indx.tobytes()),hash(self.rperm.tobytes()),hash(self.cperm.tobytes()),
+                hash(ids.indptr.tobytes()),hash(ids.indices.tobytes()));
+
+    '''
+    Solve J delta = Err with sparse LU, Jp is the permuted Jacobian from Jacobian(True)
+    The column ordering is fixed by the bus ordering, so SuperLU is told not to reorder
+    Returns None if the Jacobian is singular
+    '''
+    def Step(self,Jp,Err):
+        t = time.time();
+        try:
+            lu = spla.splu(Jp,permc_spec='NATURAL',diag_pivot_thresh=0.1);
+        except RuntimeError:
+            return None;
+        self.stats['factor_time'] += time.time()-t;
+        self.stats['factorizations'] += 1;
+        self.stats['nnzJ'] = Jp.nnz;
+        self.stats['nnzLU'] = lu.L.nnz+lu.U.nnz;
+        self.stats['fill'] = self.stats['nnzLU']/max(Jp.nnz,1);
+        self.lu = lu;
+        self.lu_key = self.jkey;
+        delta = np.zeros(Err.shape);
+        delta[self.cperm] = lu.solve(Err[self.rperm]);
+        return delta;
+
+    '''
+    Chord step, J delta = Err solved with the kept LU while it still converges fast enough
+    The Jacobian is only built when it is factorized again
+    Returns None if the Jacobian is singular
+    '''
+    def ChordStep(self,Err):
+        err = np.max(abs(Err));
+        stale = self.cerr is not None and err > self.chord['max_ratio']*self.cerr;
+        self.cerr = err;
+        if self.lu is None or self.lu_key != self.jkey or stale:
+            return self.Step(self.Jacobian(True),Err);
+        self.stats['reuses'] += 1;
+        delta = np.zeros(Err.shape);
+        delta[self.cperm] = self.lu.solve(Err[self.rperm]);
+        return delta;
+
+    '''
+    Factorization of the last Jacobian for Factor of a nearby case, None if there is none
+    '''
+    def Factor(self):
+        if self.lu is None:
+            return None;
+        return {'lu':self.lu,'key':self.lu_key};
+
+    '''
+    Factorization of the Jacobian at the present state, the solution once Solve() is done
+    Built once and kept (Factor() returns it too), None if the Jacobian is singular
+    '''
+    def Final(self):
+        if self.final is None:
+            unsorted = not self.sorted;
+            if unsorted:
+                self.__Sort();
+            Jp = self.Jacobian(True);
+            if self.Step(Jp,np.zeros((Jp.shape[0],1))) is not None:
+                self.final = self.Factor();
+            if unsorted:
+                self.__Unsort();
+        return self.final;
+
+    '''
+    Inexact Newton step, J delta = Err solved by preconditioned GMRES or BiCGStab
+    to the relative tolerance of the forcing term, Jp is the permuted Jacobian
+    Returns None if the Jacobian is singular
+    '''
+    def KrylovStep(self,Jp,Err):
+        k = self.krylov;
+        b = Err[self.rperm,0];
+        norm = np.linalg.norm(b);
+
+        # Forcing term, loose while far from the solution, tighter as the mismatch falls
+        # but never tighter than needed to reach the 1e-6 mismatch tolerance
+        if self.fnorm is None or self.eta is None:
+            eta = k['eta_max'];
         else:
-            busi = self.Line[lidx,1];
-            busj = self.Line[lidx,2];
-        yi0 = b;
-        yij = 1/(r+x);
-        busi_idx = np.where(self.BNo == busi)[0][0];    # Bus i index
-        busj_idx = np.where(self.BNo == busj)[0][0];    # Bus j index
-        p1 = self.V[busi_idx,0]*self.V[busi_idx,0]*abs(yi0+yij)*np.sin(np.angle(yi0+yij));
-        p2 = self.V[busi_idx,0]*self.V[busj_idx,0]*abs(yij)*np.sin(np.angle(yij)-self.D[busi_idx,0]+self.D[busj_idx,0]);
-        return -(p1-p2);
+            eta = k['gamma']*(norm/self.fnorm)**k['alpha'];
+            safe = k['gamma']*self.eta**k['alpha'];
+            if safe > 0.1:
+                eta = max(eta,safe);
+            eta = min(max(eta,k['eta_min'],0.5e-6/max(norm,1e-300)),k['eta_max']);
+
+        rebuild = (self.ilu is None or self.ilu_pattern is not Jp or self.inner > k['rebuild_inner'] or
+                (self.fnorm is not None and norm > k['rebuild_ratio']*self.fnorm));
+        self.fnorm = norm;
+        self.eta = eta;
+        for attempt in range(0,2):
+            if rebuild:
+                t = time.time();
+                try:
+                    self.ilu = spla.spilu(Jp,drop_tol=k['drop_tol'],fill_factor=k['fill_factor'],permc_spec='NATURAL',
+                            diag_pivot_thresh=0.1);
+                except RuntimeError:
+                    self.ilu = None;
+                    return None;
+                self.ilu_pattern = Jp;
+                self.stats['precond_time'] += time.time()-t;
+                self.stats['preconditioners'] += 1;
+                self.stats['nnzILU'] = self.ilu.L.nnz+self.ilu.U.nnz;
+            M = spla.LinearOperator(Jp.shape,self.ilu.solve);
+            count = [0];
+            def Inner(x):
+                count[0] += 1;
+            if k['linear'] == 'bicgstab':
+                x,info = spla.bicgstab(Jp,b,rtol=eta,atol=0.0,maxiter=k['max_inner'],M=M,callback=Inner);
+            else:
+                x,info = spla.gmres(Jp,b,rtol=eta,atol=0.0,restart=k['restart'],
+                        maxiter=int(np.ceil(k['max_inner']/k['restart'])),M=M,callback=Inner,callback_type='pr_norm');
+            self.inner = count[0];
+            self.stats['inner'] += count[0];
+            # A stale preconditioner that does not get there is rebuilt once, a fresh one keeps its best iterate
+            if info == 0 or rebuild:
+                break;
+            rebuild = True;
+        if not np.all(np.isfinite(x)):
+            return None;
+        delta = np.zeros(Err.shape);
+        delta[self.cperm,0] = x;
+        return delta;
+
+    '''
+    Mismatch vector for the present state in sorted bus order
+    (PQ+PV) P mismatches followed by (PQ) Q mismatches
+    Written into the workspace, the vector is overwritten by the next call
+    '''
+    def Mismatch(self):
+        n = self.n;
+        n_pq = self.pq;
+        S = np.take(self.Power(),self.bindx,out=self.work['Ss'],mode='clip');
+        Err = self.work['Err'];
+        np.subtract(self.P[:n-1,0],S.real[:n-1],out=Err[:n-1,0]);
+        np.subtract(self.Q[:n_pq,0],S.imag[:n_pq],out=Err[n-1:,0]);
+        return Err;
+
+    '''
+    Complex power injection at every bus for the present state, in YBus order
+    Written into the workspace, which is left with the complex voltages and the
+    Y_ij V_j product of every YBus nonzero in W
+    '''
+    def Power(self):
+        w = self.work;
+        Vc = w['Vc'];
+        Vm = w['Vm'];
+        W = w['W'];
+        S = w['S'];
+        Vm[self.bindx] = self.V[:,0];
+        Vc.real[:] = 0;
+        Vc.imag[self.bindx] = self.D[:,0];
+        np.exp(Vc,out=Vc);
+        # Parts scaled apart, a complex by float product would cast Vm to a complex temporary
+        np.multiply(Vc.real,Vm,out=Vc.real);
+        np.multiply(Vc.imag,Vm,out=Vc.imag);
+        # Row sums of Y_ij V_j, every row has its diagonal so no row is empty
+        # take() with mode 'clip' writes straight into out, 'raise' goes through a buffer
+        np.take(Vc,w['Yc'],out=W,mode='clip');
+        np.multiply(W,self.case.Ysp.data,out=W);
+        np.add.reduceat(W,w['rows'],out=S);
+        np.conj(S,out=S);
+        np.multiply(S,Vc,out=S);
+        return S;
+
+    '''
+    Newton Jacobian for the present state in sorted bus order
+    Rows are P of (PQ+PV) followed by Q of (PQ), columns are V of (PQ) followed by D of (PQ+PV)
+    permuted is True -> the workspace CSC Matrix in the fill reducing order, updated in place
+    permuted is False -> a CSC copy in the unpermuted order
+    '''
+    def Jacobian(self,permuted=False):
+        w = self.work;
+        Vc = w['Vc'];
+        Vm = w['Vm'];
+        W = w['W'];
+        vals = w['vals'];
+        nnz = len(W);
+
+        case = self.case;
+        S = self.Power();
+        Sd = w['Sd'];
+        d = w['diag'];
+
+        # W = V_i conj(Y_ij V_j) on every YBus nonzero, Power() left Y_ij V_j in W
+        np.conj(W,out=W);
+        np.multiply(W,np.take(Vc,w['Yr'],out=w['Vr'],mode='clip'),out=W);
+        np.take(Vm,w['Yc'],out=w['Vmc'],mode='clip');
+
+        np.divide(W.real,w['Vmc'],out=vals[0:nnz]);
+        vals[nnz:2*nnz] = W.imag;
+        np.divide(W.imag,w['Vmc'],out=vals[2*nnz:3*nnz]);
+        np.negative(W.real,out=vals[3*nnz:]);
+        np.add.at(vals,d[0],np.divide(S.real,Vm,out=Sd));
+        np.subtract.at(vals,d[1],S.imag);
+        np.add.at(vals,d[2],np.divide(S.imag,Vm,out=Sd));
+        np.add.at(vals,d[3],S.real);
+
+        np.take(vals,self.jsrc,out=self.Jp.data,mode='clip');
+        if permuted:
+            return self.Jp;
+        return self.Jp[self.rinv,:][:,self.cinv].tocsc();
 
     # Modified on March 29, 2020 -- Bug Fix -V1.1.2 Used bindx as reference in YBus
-    def Solve(self):
+    # store,scenario -- optional ResultStore and scenario index to write the results into
+    def Solve(self,store=None,scenario=None):
         countVal = 0;
+        self.final = None;
+        limits = self.Qlimit or self.Vlimit;
+        last = np.inf;
         for i in range(0,self.Max):
             countVal += 1;
-            n = self.n;
-            n_pq = self.pq;
 
-            J = np.zeros((n_pq+n-1,n_pq+n-1));
-            Err = np.zeros((n_pq+n-1,1));
+            Err = self.Mismatch();
+            err = np.max(abs(Err));
 
-            Err[:n-1,:] = np.array([[self.P[idx,0]-self.__P_calc(idx)] for idx in range(0,n-1)]).reshape((n-1,1));
-            Err[n-1:,:] = np.array([[self.Q[idx,0]-self.__Q_calc(idx)] for idx in range(0,n_pq)]).reshape((n_pq,1));
+            # Bus types switch once the solution is close, or when Newton stops making progress
+            # without them, every switch costs a few more iterations
+            check = err < self.limits['start_mismatch'] or (i > 1 and err >= last);
+            last = err;
+            if limits and check and self.__Limits(err < self.limits['start_mismatch']) != 0:
+                Err = self.Mismatch();
+                err = np.max(abs(Err));
 
-            if (np.max(abs(Err)) < 1e-6):
+            if (err < 1e-6):
                 break;
-            
-            # J1 = P/V for (PQ+PV)x(PQ)
-            if n_pq != 0:
-                Y = self.YBus[self.bindx[:-1],:][:,self.bindx[:n_pq]];
-                v = self.V[:-1,0].reshape((n-1,1));
-                J[0:n-1,0:n_pq] = v*abs(Y)*np.cos(np.angle(Y)-self.D[:-1,:]+np.transpose(self.D[:n_pq,:]));
-                Y = self.YBus[self.bindx[:n_pq],:][:,self.bindx];
-                J[range(0,n_pq),range(0,n_pq)] += np.transpose(np.sum(np.transpose(self.V[:,0].reshape((self.n,1)))*abs(Y)
-                    *np.cos(np.angle(Y)-self.D[:n_pq,:]+np.transpose(self.D)),axis=1));
-
-            # J2 = Q/V for (PQ)x(PQ)
-            if n_pq != 0:
-                Y = self.YBus[self.bindx[:n_pq],:][:,self.bindx[:n_pq]];
-                v = self.V[:n_pq,0].reshape((n_pq,1));
-                J[n-1:,0:n_pq] = -v*abs(Y)*np.sin(np.angle(Y)-self.D[:n_pq,:]+np.transpose(self.D[:n_pq,:]));
-                Y = self.YBus[self.bindx[:n_pq],:][:,self.bindx];
-                J[n-1+np.array(range(0,n_pq)),range(0,n_pq)] -= np.transpose(np.sum(np.transpose(self.V[:,0].reshape((self.n,1)))*abs(Y)*
-                    np.sin(np.angle(Y)-self.D[:n_pq,:]+np.transpose(self.D)),axis=1));
-
-            # J3 = P/D for (PQ+PV)x(PQ+PV)
-            Y = self.YBus[self.bindx[:-1],:][:,self.bindx[:-1]];
-            v = self.V[:-1,0].reshape((n-1,1));
-            J[0:n-1,n_pq:] = -v*np.transpose(v)*abs(Y)*np.sin(np.angle(Y)-self.D[:-1,:]+np.transpose(self.D[:-1,:]));
-            Y = self.YBus[self.bindx[:n-1],:][:,self.bindx];
-            J[range(0,n-1),n_pq+np.array(range(0,n-1))] += np.transpose(np.sum(v*np.transpose(self.V[:,0].reshape((self.n,1)))*abs(Y)*
-                np.sin(np.angle(Y)-self.D[:n-1,:]+np.transpose(self.D)),axis=1));
-
-            # J4 = Q/D for (PQ)x(PQ+PV)
-            if n_pq != 0:
-                Y = self.YBus[self.bindx[:n_pq],:][:,self.bindx[:-1]];
-                v = self.V[:n_pq,0].reshape((n_pq,1));
-                J[n-1:,n_pq:]=-v*np.transpose(self.V[:-1,0].reshape((n-1,1)))*abs(Y)*np.cos(np.angle(Y)-self.D[:n_pq,:]+np.transpose(self.D[:-1,:]));
-                Y = self.YBus[self.bindx[:n_pq],:][:,self.bindx];
-                J[n-1+np.array(range(0,n_pq)),n_pq+np.array(range(0,n_pq))] += np.transpose(np.sum(v*np.transpose(self.V[:,0].reshape((self.n,1)))
-                    *abs(Y)*np.cos(np.angle(Y)-self.D[:n_pq,:]+np.transpose(self.D)),axis=1));
-            
-            if abs(np.linalg.det(J)) > 1e-3:
-                delta = np.matmul(np.linalg.inv(J),Err);
+
+            self.stats['outer'] += 1;
+            if self.method == 'krylov':
+                delta = self.KrylovStep(self.Jacobian(True),Err);
+            elif self.method == 'chord':
+                delta = self.ChordStep(Err);
+            else:
+                delta = self.Step(self.Jacobian(True),Err);
+            if delta is not None:
+                n_pq = self.pq;
                 self.V[0:n_pq,0] += delta[0:n_pq].flatten();
                 self.D[0:-1,0] += delta[n_pq:].flatten();
-                self.Q[n_pq:-1,0] = [self.__Q_calc(idx) for idx in range(n_pq,n-1)];
-                
-                for i in range(0,self.n):
-                    if self.Qlimit and self.Q[i][0]+self.Q[i][3] < self.Q[i][1] and abs(self.Q[i][1]-self.Q[i][2]) > 1e-10:
-                        self.Q[i][0] = self.Q[i][1]-self.Q[i][3];
-                        self.BT[i][0] = 'PQ';
-                    elif self.Qlimit and self.Q[i][0]+self.Q[i][3] > self.Q[i][2] and abs(self.Q[i][1]-self.Q[i][2]) > 1e-10:
-                        self.Q[i][0] = self.Q[i][2]-self.Q[i][3];
-                        self.BT[i][0] = 'PQ';
-
-                    if self.Vlimit and self.V[i][0] < self.V[i][1] and abs(self.V[i][1]-self.V[i][2]) > 1e-10:
-                        self.V[i][0] = self.V[i][1];
-                        self.BT[i][0] = 'PV';
-                    elif self.Vlimit and self.V[i][0] > self.V[i][2] and abs(self.V[i][1]-self.V[i][2]) > 1e-10:
-                        self.V[i][0] = self.V[i][2];
-                        self.BT[i][0] = 'PV';
-                
-                tmpindx = list(self.indx);
-                revindx = [tmpindx.index(i) for i in range(0,self.n)];
-                self.BT = self.BT[revindx];
-                self.P = self.P[revindx];
-                self.Q = self.Q[revindx];
-                self.V = self.V[revindx];
-                self.D = self.D[revindx];
-                self.__Sort();
-                
-        
-        self.P[-1,0] = self.__P_calc(self.n-1);
-        self.Q[-1,0] = self.__Q_calc(self.n-1);
-
-
-        tmpindx = list(self.indx);
-        revindx = [tmpindx.index(i) for i in range(0,self.n)];
-        self.P = self.P[revindx];
-        self.Q = self.Q[revindx];
-        self.V = self.V[revindx];
-        self.D = self.D[revindx];
-        self.BT = self.BT[revindx];
-
-        PL = [[self.__Pij(lidx,False),-self.__Pij(lidx,True)] for lidx in self.Line[:,0]];
-        QL = [[self.__Qij(lidx,False),self.__Qij(lidx,True)] for lidx in self.Line[:,0]];
-        Pavg = np.mean(PL,axis=1).flatten();
-        Qavg = -np.diff(QL,axis=1).flatten();
-        Ploss = abs(np.diff(PL,axis=1)).flatten();
-        Qloss = np.sum(QL,axis=1).flatten();
-
-        return [countVal,self.BT,self.P,self.Q,self.V,self.D,Pavg,Qavg,Ploss,Qloss];
+
+        S = self.Power()[self.bindx[self.pq:]];
+        self.P[-1,0] = S.real[-1];
+        self.Q[self.pq:,0] = S.imag;
+
+        self.__Unsort();
+
+        Pij,Pji,Qij,Qji = self.case.LineFlows(self.V[:,0],self.D[:,0]);
+        Pavg = (Pij-Pji)/2;
+        Qavg = Qij-Qji;
+        Ploss = abs(Pij+Pji);
+        Qloss = Qij+Qji;
+
+        result = [countVal,DecodeBusType(self.BT[:,0]).reshape((self.n,1)),self.P,self.Q,self.V,self.D,Pavg,Qavg,Ploss,Qloss];
+        if store is not None:
+            store.Write(scenario,result);
+        return result;
+
+
+'''
+Vectorized line flows for all lines at once
+V,D are Nx1 in the order of BNo, Line is Lx6 Matrix as LNo,From Bus,To Bus,B/2,R,X
+Returns Pij,Pji,Qij,Qji as L length arrays
+'''
+def LineFlows(V,D,Line,BNo):
+    Line = np.asarray(Line,dtype=float).reshape((-1,6));
+    bmap = IndexMap(BNo);
+    i = bmap[Line[:,1]];
+    j = bmap[Line[:,2]];
+    return Flows(V,D,i,j,1/(Line[:,4]+Line[:,5]*1j),Line[:,3]*1j);
+
+'''
+Line flows from line end indices i,j, series admittance yij and shunt admittance yi0
+'''
+def Flows(V,D,i,j,yij,yi0):
+    V = np.asarray(V,dtype=float).reshape((-1,1))[:,0];
+    D = np.asarray(D,dtype=float).reshape((-1,1))[:,0];
+    Sii = yi0+yij;
+    Pij = V[i]*V[i]*Sii.real - V[i]*V[j]*abs(yij)*np.cos(np.angle(yij)-D[i]+D[j]);
+    Pji = V[j]*V[j]*Sii.real - V[j]*V[i]*abs(yij)*np.cos(np.angle(yij)-D[j]+D[i]);
+    Qij = -(V[i]*V[i]*Sii.imag - V[i]*V[j]*abs(yij)*np.sin(np.angle(yij)-D[i]+D[j]));
+    Qji = -(V[j]*V[j]*Sii.imag - V[j]*V[i]*abs(yij)*np.sin(np.angle(yij)-D[j]+D[i]));
+    return Pij,Pji,Qij,Qji;
@@ -0,0 +1,173 @@
+'''
+Load FLow Analyser
+Copyright (C) 2020 Akshay Arvind Laturkar
+
+Date Created : 19 October 2026 -- Version 1.2.0
+
+This program is free software: you can redistribute it
+and/or modify it under the terms of the GNU General
+Public License as published by the Free Software
+Foundation, either version 3 of the License, or
+any later version.
+
+This program is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the
+implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE.  See the GNU General Public License
+for more details.
+
+You should have received a copy of the GNU General Public
+License along with this program.
+If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+File Version History
+V1.2.0 : October 19, 2026
+         Asyncio micro-batching of concurrent solve requests into batch solves
+         Compiled outage cases kept per network up to MaxCases most recent
+         Groups sent at MaxBatch cancel their window timer, stats kept on the event loop thread
+'''
+
+
+import numpy as np;
+import asyncio;
+import threading;
+import time;
+from collections import OrderedDict;
+import incremental;
+import topology;
+import batch;
+
+class MicroBatch:
+
+    '''
+    Asyncio front end grouping concurrent solve requests into batch solves
+
+    Networks are registered once by key. Requests for the same network and the same
+    lines out of service (same topology) arriving within Window seconds of the first
+    one are solved together by batch.BatchLoadFlow in an executor thread, and each
+    awaiting caller gets its own LoadFlow.Solve() result.
+    A group is sent as soon as it has MaxBatch requests, so no request waits more
+    than Window for its group to close.
+    The compiled case of each set of lines out of service is kept for the next
+    group on it, the MaxCases most recently used per network.
+
+    A delta is dictionary with any of
+        'P','Q','V' -- (Bus No, values) setting Pg-Pd, Qg-Qd or V (setpoint) of those buses
+        'outages'   -- Line No of lines out of service
+    '''
+    def __init__(self,Window=0.005,MaxBatch=256,executor=None,MaxCases=32):
+        self.window = Window;
+        self.maxbatch = MaxBatch;
+        self.maxcases = MaxCases;
+        self.executor = executor;
+        self.networks = {};
+        self.pending = {};
+        self.timers = {};
+        self.stats = {'requests':0,'batches':0,'largest':0,'solve_time':0.0};
+
+    '''
+    Register a network under key, arguments are the same as for loadflow.LoadFlow
+    and T is Lx1 Matrix of tap ratios
+    '''
+    def Register(self,key,N,P,Q,V,BT,YBus,MaxIter,Vlimit,Qlimit,Line,BNo,T=None,Case=None):
+        self.networks[key] = {'inc':incremental.Incremental(N,P,Q,V,BT,YBus,MaxIter,Vlimit,Qlimit,Line,BNo,T,Case=Case),
+                'cases':OrderedDict(),'lock':threading.Lock()};
+
+    '''
+    Solve network key with delta applied, returns LoadFlow.Solve() result
+    '''
+    async def Solve(self,key,delta=None):
+        if key not in self.networks:
+            raise KeyError("Unknown network '" + str(key) + "'");
+        delta = {} if delta is None else delta;
+        group = (key,tuple(sorted(delta.get('outages',[]))));
+        loop = asyncio.get_running_loop();
+        future = loop.create_future();
+        self.stats['requests'] += 1;
+        if group not in self.pending:
+            self.pending[group] = [];
+            self.timers[group] = loop.call_later(self.window,self.__Flush,group);
+        self.pending[group].append((delta,future));
+        if len(self.pending[group]) >= self.maxbatch:
+            self.__Flush(group);
+        return await future;
+
+    def __Flush(self,group):
+        # A group sent at MaxBatch stops its timer, which would otherwise close the next group early
+        timer = self.timers.pop(group,None);
+        if timer is not None:
+            timer.cancel();
+        requests = self.pending.pop(group,None);
+        if not requests:
+            return;
+        asyncio.get_running_loop().create_task(self.__Run(group,requests));
+
+    async def __Run(self,group,requests):
+        self.stats['batches'] += 1;
+        self.stats['largest'] = max(self.stats['largest'],len(requests));
+        try:
+            results,elapsed = await asyncio.get_running_loop().run_in_executor(self.executor,self.__Batch,group,
+                    [delta for delta,future in requests]);
+            self.stats['solve_time'] += elapsed;
+            for (delta,future),result in zip(requests,results):
+                if not future.done():
+                    future.set_result(result);
+        except Exception as err:
+            for delta,future in requests:
+                if not future.done():
+                    future.set_exception(err);
+
+    '''
+    Batch solve of the deltas of one group, runs in the executor
+    Outages splitting the network are solved one by one, island by island
+    Returns the results and the time taken
+    '''
+    def __Batch(self,group,deltas):
+        t = time.time();
+        key,outages = group;
+        net = self.networks[key];
+        inc = net['inc'];
+        with net['lock']:
+            cases = net['cases'];
+            if outages in cases:
+                cases.move_to_end(outages);
+            else:
+                inc.Reset();
+                for lno in outages:
+                    inc.RemoveLine(lno);
+                count,labels = topology.Islands(inc.n,inc.Lines(),inc.BNo);
+                cases[outages] = inc.Case() if count == 1 else None;
+                inc.Reset();
+                if len(cases) > self.maxcases:
+                    cases.popitem(last=False);
+            case = cases[outages];
+
+        s = len(deltas);
+        P = np.repeat(inc.P0[None],s,axis=0);
+        Q = np.repeat(inc.Q0[None],s,axis=0);
+        V = np.repeat(inc.V0[None],s,axis=0);
+        for k,delta in enumerate(deltas):
+            for name,arr in [('P',P[k]),('Q',Q[k]),('V',V[k])]:
+                if name in delta:
+                    BNo,val = delta[name];
+                    arr[inc.bmap[BNo],0] = val;
+
+        if case is None:
+            results = [];
+            with net['lock']:
+                for k in range(0,s):
+                    inc.Reset();
+                    inc.P[:] = P[k];
+                    inc.Q[:] = Q[k];
+                    inc.V[:] = V[k];
+                    for lno in outages:
+                        inc.RemoveLine(lno);
+                    results.append(inc.Solve());
+                inc.Reset();
+        else:
+            # Lines out of service are in the patched case with no admittance, so they carry no flow
+            results = batch.BatchLoadFlow(inc.n,P,Q,V,inc.BT0,None,inc.Max,inc.Vlimit,inc.Qlimit,inc.Line,inc.BNo,
+                    Case=case).Solve();
+        return results,time.time()-t;
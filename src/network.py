@@ -0,0 +1,229 @@
+'''
+Load FLow Analyser
+Copyright (C) 2020 Akshay Arvind Laturkar
+
+Date Created : 19 October 2026 -- Version 1.2.0
+
+This program is free software: you can redistribute it
+and/or modify it under the terms of the GNU General
+Public License as published by the Free Software
+Foundation, either version 3 of the License, or
+any later version.
+
+This program is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the
+implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE.  See the GNU General Public License
+for more details.
+
+You should have received a copy of the GNU General Public
+License along with this program.
+If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+File Version History
+V1.2.0 : October 19, 2026
+         Compact network model built once from the Bus and Line feeds
+         Arbitrary Bus No and Line No through vectorized ID maps
+         Row level checks and keyed diff of feeds for delta reloads
+         Slack bus check does not depend on the other bus types being valid
+'''
+
+
+import numpy as np;
+import pandas as pd;
+import loadflow as solver;
+from resultstore import EncodeBusType,DecodeBusType,BUS_TYPES,SLACK;
+
+# Feed columns with their types and the values used for blank cells
+BUS_HEADER = {'Bus No':'int64','Bus Type':'str','Pd':'float64','Qd':'float64',
+        'Pg':'float64','Qg':'float64','V':'float64','Shunt Feed':'float64','Qg (min)':'float64',
+        'Qg (max)':'float64','V (min)':'float64','V (max)':'float64'};
+NW_HEADER = {'Line No':'int64','From Bus':'int64','To Bus':'int64',
+        'R':'float64','X':'float64','B/2':'float64','T':'float64'};
+BUS_HEADER_DEFAULT = {'Bus No':0,'Bus Type':'','Pd':0.0,'Qd':0.0,
+        'Pg':0.0,'Qg':0.0,'V':1.0,'Shunt Feed':0.0,'Qg (min)':0.0,
+        'Qg (max)':0.0,'V (min)':0.0,'V (max)':0.0};
+NW_HEADER_DEFAULT = {'Line No':0,'From Bus':0,'To Bus':0,
+        'R':0.0,'X':0.0,'B/2':0.0,'T':1.0};
+
+'''
+Read a Bus or Line feed file (xls, xlsx or csv) into a DataFrame
+'''
+def Read(filename,default):
+    ext = filename.split('.')[-1];
+    if ext == 'xls' or ext == 'xlsx':
+        data = pd.read_excel(filename);
+    elif ext == 'csv':
+        data = pd.read_csv(filename);
+    else:
+        raise ValueError("Unknown file type '" + ext + "'");
+    return data.fillna(value=default);
+
+'''
+Column of a feed by header name, matched ignoring case and surrounding blanks
+'''
+def Column(data,col,dtype):
+    columns = [str(c).strip().lower() for c in data.columns];
+    if col.lower() not in columns:
+        raise KeyError("Column '" + col + "' not found");
+    return np.ascontiguousarray(data[data.columns[columns.index(col.lower())]].astype(dtype).to_numpy());
+
+'''
+All columns of a feed as dictionary of header to typed column
+'''
+def Columns(data,header):
+    return {col:Column(data,col,dtype) for col,dtype in header.items()};
+
+'''
+Checks on Bus feed rows given as dictionary of columns
+Returns the error message or None, messages are the ones of the full validation
+'''
+def CheckBus(bus):
+    for col in ['Bus No','V','V (min)','V (max)']:
+        if len(bus[col]) != 0 and np.min(bus[col]) < 0:
+            return "'" + col + "' cannot be negative in Bus Feed File";
+    if not np.all(np.isin(bus['Bus Type'],BUS_TYPES)):
+        return "Unknown bus type detected in Bus Feed";
+    return None;
+
+'''
+Checks on the Bus feed as a whole, cheap and vectorized
+'''
+def CheckBuses(bus):
+    if len(np.unique(bus['Bus No'])) != len(bus['Bus No']):
+        return "Bus No's are repeated in Bus Feed";
+    if len(bus['Bus No']) < 2:
+        return "System should have atleast two buses";
+    if np.sum(np.asarray(bus['Bus Type']) == BUS_TYPES[SLACK]) < 1:
+        return "Atleast 1 slack bus is required by the application.";
+    return None;
+
+'''
+Checks on Line feed rows given as dictionary of columns, BNo are all Bus No of the Bus feed
+'''
+def CheckLine(line,BNo):
+    for col in ['Line No','From Bus','To Bus','R','X','B/2','T']:
+        if len(line[col]) != 0 and np.min(line[col]) < 0:
+            return "'" + col + "' cannot be negative in Line Feed File";
+    for col in ['From Bus','To Bus']:
+        if not np.all(np.isin(line[col],BNo)):
+            return "Invalid 'Bus No' in '" + col + "' of Line Feed";
+    return None;
+
+'''
+Rows of a feed subset, columns is dictionary of header to column
+'''
+def Rows(columns,idx):
+    return {col:val[idx] for col,val in columns.items()};
+
+'''
+Difference of two versions of a feed by row key ('Bus No' or 'Line No')
+Returns (added rows of new, removed rows of old, changed rows of new, their rows in old)
+'''
+def Diff(old,new,key):
+    opos = solver.IndexMap(old[key])[new[key]];
+    added = np.where(opos < 0)[0];
+    common = np.where(opos >= 0)[0];
+    removed = np.where(solver.IndexMap(new[key])[old[key]] < 0)[0];
+    differ = np.zeros(len(common),dtype=bool);
+    for col in new:
+        differ |= new[col][common] != old[col][opos[common]];
+    changed = common[differ];
+    return added,removed,changed,opos[changed];
+
+class Network:
+
+    '''
+    Network of the Bus and Line feeds as typed contiguous columns, built once
+
+    bus and line are dictionaries of feed header to column array
+    Bus types are integer coded as index in resultstore.BUS_TYPES
+    Bus No and Line No may be any distinct integers, bmap and lmap map them to rows
+
+    The arrays the solvers take are built once as read only blocks
+    BNo (Nx1), BT (Nx1 codes), P (Nx1 as Pg-Pd), Q (Nx4 as Qg-Qd,Qg (min),Qg (max),Qd),
+    V (Nx3 as V,V (min),V (max)), Line (Lx6 as LNo,From Bus,To Bus,B/2,R,X) and T (L)
+    so GUI, scripts and worker processes pass the same arrays without converting them again.
+    YBus and the compiled loadflow.Case are built when first asked for and kept.
+    '''
+    def __init__(self,bus,line):
+        self.bus = {col:np.ascontiguousarray(bus[col],dtype=(np.int64 if dtype == 'int64' else float))
+                for col,dtype in BUS_HEADER.items() if col != 'Bus Type'};
+        self.line = {col:np.ascontiguousarray(line[col],dtype=(np.int64 if dtype == 'int64' else float))
+                for col,dtype in NW_HEADER.items()};
+        self.n = len(self.bus['Bus No']);
+        self.l = len(self.line['Line No']);
+        b = self.bus;
+
+        self.BNo = b['Bus No'].reshape((self.n,1));
+        self.BT = EncodeBusType(bus['Bus Type']).astype(np.int8).reshape((self.n,1));
+        self.P = (b['Pg']-b['Pd']).reshape((self.n,1));
+        self.Q = np.ascontiguousarray(np.c_[b['Qg']-b['Qd'],b['Qg (min)'],b['Qg (max)'],b['Qd']]);
+        self.V = np.ascontiguousarray(np.c_[b['V'],b['V (min)'],b['V (max)']]);
+        self.Line = np.ascontiguousarray(np.c_[self.line['Line No'],self.line['From Bus'],self.line['To Bus'],
+                self.line['B/2'],self.line['R'],self.line['X']],dtype=float);
+        self.T = self.line['T'];
+        self.bmap = solver.IndexMap(b['Bus No']);
+        self.lmap = solver.IndexMap(self.line['Line No']);
+
+        for arr in list(self.bus.values())+list(self.line.values())+[self.BT,self.P,self.Q,self.V,self.Line]:
+            arr.flags.writeable = False;
+        self.ybus = None;
+        self.case = None;
+
+    '''
+    Network from the Bus feed and Line feed DataFrames
+    '''
+    @classmethod
+    def FromFrames(cls,busdata,nwdata):
+        return cls(Columns(busdata,BUS_HEADER),Columns(nwdata,NW_HEADER));
+
+    '''
+    Network straight from the Bus feed and Line feed files
+    '''
+    @classmethod
+    def FromFiles(cls,busfile,nwfile):
+        return cls.FromFrames(Read(busfile,BUS_HEADER_DEFAULT),Read(nwfile,NW_HEADER_DEFAULT));
+
+    '''
+    Bus types as Nx1 Matrix of strings
+    '''
+    def BusTypes(self):
+        return DecodeBusType(self.BT[:,0]).reshape((self.n,1));
+
+    '''
+    Bus admittance matrix in bus feed row order
+    '''
+    def YBus(self):
+        if self.ybus is None:
+            i = self.bmap[self.line['From Bus']];
+            j = self.bmap[self.line['To Bus']];
+            y = 1/(self.line['R']+self.line['X']*1j);
+            b = self.line['B/2']*1j;
+            a = 1/self.T;
+            YBus = np.zeros((self.n,self.n),dtype=complex);
+            np.add.at(YBus,(i,i),(a**2)*(y+b));
+            np.add.at(YBus,(i,j),-a*y);
+            np.add.at(YBus,(j,i),-a*y);
+            np.add.at(YBus,(j,j),y+b);
+            k = np.arange(self.n);
+            YBus[k,k] += self.bus['Shunt Feed']*1j;
+            YBus.flags.writeable = False;
+            self.ybus = YBus;
+        return self.ybus;
+
+    '''
+    Compiled loadflow.Case of the network
+    '''
+    def Compile(self):
+        if self.case is None:
+            self.case = solver.Compile(self.YBus(),self.Line,self.BNo);
+        return self.case;
+
+    '''
+    Arguments for loadflow.LoadFlow (and the studies taking the same arguments)
+    '''
+    def Args(self,MaxIter,Vlimit,Qlimit):
+        return (self.n,self.P,self.Q,self.V,self.BT,self.YBus(),MaxIter,Vlimit,Qlimit,self.Line,self.BNo);
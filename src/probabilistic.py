@@ -0,0 +1,275 @@
+'''
+Load FLow Analyser
+Copyright (C) 2020 Akshay Arvind Laturkar
+
+Date Created : 19 October 2026 -- Version 1.2.0
+
+This program is free software: you can redistribute it
+and/or modify it under the terms of the GNU General
+Public License as published by the Free Software
+Foundation, either version 3 of the License, or
+any later version.
+
+This program is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the
+implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE.  See the GNU General Public License
+for more details.
+
+You should have received a copy of the GNU General Public
+License along with this program.
+If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+File Version History
+V1.2.0 : October 19, 2026
+         Monte Carlo load flow on quasi-random samples with streaming statistics
+         Sample results can be fed to a reducers.Reducer in the workers
+'''
+
+
+import numpy as np;
+import os;
+import time;
+from concurrent.futures import ProcessPoolExecutor,wait,FIRST_COMPLETED;
+from scipy.stats import qmc,norm;
+import batch;
+import shared;
+from reducers import Moments,Histogram;
+from resultstore import EncodeBusType,SLACK;
+
+# Sampled feed columns, in the order of the sample dimensions
+COLUMNS = ['Pd','Qd','Pg'];
+# Results kept as distributions, per bus (V, D), per line (P, Q as Pavg, Qavg) and in total (Ploss)
+QUANTITIES = ['V','D','P','Q','Ploss'];
+
+class Probabilistic:
+
+    '''
+    Probabilistic (Monte Carlo) load flow
+
+    Arguments are the same as for loadflow.LoadFlow and
+    Pd is Nx1 Matrix of the Bus Feed Pd (Pg is then P+Pd and Qd is Q[:,3])
+    Sigma is dictionary of 'Pd', 'Qd' and 'Pg' to the standard deviation as fraction
+    of the feed value, scalar or N vector in bus feed order. Pg of the slack bus is
+    not sampled, it takes up the balance.
+    Dist is 'normal' or 'uniform' (same standard deviation), multipliers are
+    floored at 0 so loads and generation keep their sign.
+    Sampler is 'sobol' (scrambled) or 'lhs' (Latin hypercube, one per chunk), Seed
+    makes the samples repeatable.
+    T is Lx1 Matrix of tap ratios and Case the compiled loadflow.Case of the network.
+
+    Samples are solved in chunks by batch.BatchLoadFlow warm started from the base case
+    solution, over a process pool attached to the network published once by
+    shared.SharedCase. A worker draws its own chunk of the sequence from its position,
+    so a task is only the chunk numbers, and sends back Moments and Histogram
+    estimators of V, D (per bus), P, Q (Pavg, Qavg per line) and Ploss which are merged
+    as chunks complete. The histogram ranges are set from a first pilot chunk.
+    Samples whose solution does not balance the injections are counted as failed
+    and left out.
+    '''
+    def __init__(self,N,P,Q,V,BT,YBus,MaxIter,Vlimit,Qlimit,Line,BNo,Pd,Sigma,Dist='normal',Sampler='sobol',Seed=None,
+            T=None,Case=None):
+        if Dist not in ['normal','uniform']:
+            raise ValueError("Unknown distribution '" + str(Dist) + "'");
+        if Sampler not in ['sobol','lhs']:
+            raise ValueError("Unknown sampler '" + str(Sampler) + "'");
+        self.n = N;
+        self.args = (N,P,Q,V,BT,YBus,MaxIter,Vlimit,Qlimit,Line,BNo);
+        self.T = T;
+        self.Case = Case;
+        self.l = len(np.asarray(Line).reshape((-1,6)));
+        P = np.asarray(P,dtype=float).reshape((N,));
+        Q = np.asarray(Q,dtype=float).reshape((N,4));
+        Pd = np.asarray(Pd,dtype=float).reshape((N,));
+        BT = EncodeBusType(BT).reshape((N,));
+        base = {'Pd':Pd,'Qd':Q[:,3],'Pg':np.where(BT == SLACK,0.0,P+Pd)};
+
+        # One sample dimension per bus and column with a nonzero value and deviation
+        cols = [];
+        rows = [];
+        sigma = [];
+        for c,name in enumerate(COLUMNS):
+            s = np.broadcast_to(np.asarray(Sigma.get(name,0.0),dtype=float).flatten(),(N,));
+            idx = np.where((base[name] != 0) & (s > 0))[0];
+            cols += [c]*len(idx);
+            rows += list(idx);
+            sigma += list(s[idx]);
+        self.spec = {'col':np.array(cols,dtype=np.int64),'row':np.array(rows,dtype=np.int64),
+                'sigma':np.array(sigma),'base':np.c_[base['Pd'],base['Qd'],base['Pg']],
+                'dist':Dist,'sampler':Sampler,'seed':Seed,'warm':None};
+        self.d = len(cols);
+        self.stats = None;
+        self.summary = None;
+
+    '''
+    Probabilistic load flow of a network.Network
+    '''
+    @classmethod
+    def FromNetwork(cls,net,MaxIter,Vlimit,Qlimit,Sigma,Dist='normal',Sampler='sobol',Seed=None):
+        return cls(*net.Args(MaxIter,Vlimit,Qlimit),net.bus['Pd'],Sigma,Dist,Sampler,Seed,T=net.T,Case=net.Compile());
+
+    '''
+    Solve Samples samples, Chunk at a time, over Workers processes (this process if 1)
+    Samples is rounded up to whole chunks, for 'sobol' Chunk is rounded up to a power of 2
+    Bins is the number of histogram bins used for the quantiles
+    If Reducer is given (reducers.Reducer), the result of every sample not failed is also
+    added to it with the sample number as scenario, through an Empty() copy per chunk
+    Returns dictionary with samples solved, failed, iterations per sample and time taken
+    '''
+    def Run(self,Samples,Workers=None,Chunk=256,Bins=512,Reducer=None):
+        t = time.time();
+        if self.spec['sampler'] == 'sobol':
+            Chunk = 1 << int(np.ceil(np.log2(max(Chunk,1))));
+        chunks = max(1,int(np.ceil(Samples/Chunk)));
+        with shared.SharedCase(*self.args,T=self.T,Case=self.Case) as case:
+            handle = case.Handle();
+            inc = shared.Attach(handle);
+            base = inc.Solve();
+            self.spec['warm'] = (base[4][:,0],base[5][:,0]);
+
+            # Pilot chunk in this process, its spread sets the histogram ranges
+            values,iters = SampleChunk(handle,self.spec,0,Chunk,Reducer);
+            edges = {};
+            for name in QUANTITIES:
+                X = values[name];
+                lo = X.min(axis=0) if len(X) else np.zeros(X.shape[1]);
+                hi = X.max(axis=0) if len(X) else np.zeros(X.shape[1]);
+                span = np.maximum(hi-lo,1e-6*np.maximum(abs(lo),1.0));
+                edges[name] = (lo-span,hi+span);
+            self.stats = Reduce(values,edges,Bins);
+            self.summary = {'samples':chunks*Chunk,'failed':Chunk-self.stats['V'][0].count,'iterations':iters};
+
+            tasks = [(handle,self.spec,k,Chunk,edges,Bins,None if Reducer is None else Reducer.Empty())
+                    for k in range(1,chunks)];
+            if Workers == 1:
+                for task in tasks:
+                    self.__Merge(ChunkTask(task),Reducer);
+            elif len(tasks) != 0:
+                # Bounded number of chunks in flight, merged as they complete
+                with ProcessPoolExecutor(max_workers=Workers,initializer=shared.Attach,initargs=(handle,)) as pool:
+                    ahead = 2*(Workers or os.cpu_count() or 1);
+                    pending = set();
+                    for task in tasks:
+                        if len(pending) >= ahead:
+                            done,pending = wait(pending,return_when=FIRST_COMPLETED);
+                            for future in done:
+                                self.__Merge(future.result(),Reducer);
+                        pending.add(pool.submit(ChunkTask,task));
+                    for future in wait(pending)[0]:
+                        self.__Merge(future.result(),Reducer);
+            shared.Detach(handle);
+        self.summary['iterations'] /= max(1,self.summary['samples']);
+        self.summary['time'] = time.time()-t;
+        return self.summary;
+
+    def __Merge(self,result,Reducer):
+        stats,failed,iters,part = result;
+        if Reducer is not None:
+            Reducer.Merge(part);
+        for name in QUANTITIES:
+            self.stats[name][0].Merge(stats[name][0]);
+            self.stats[name][1].Merge(stats[name][1]);
+        self.summary['failed'] += failed;
+        self.summary['iterations'] += iters;
+
+    '''
+    Mean of quantity name ('V','D' per bus, 'P','Q' per line, 'Ploss')
+    '''
+    def Mean(self,name):
+        return self.stats[name][0].Mean();
+
+    '''
+    Standard deviation of quantity name
+    '''
+    def Std(self,name):
+        return self.stats[name][0].Std();
+
+    '''
+    q-th quantile (0 <= q <= 1) of quantity name, within the sampled min and max
+    '''
+    def Quantile(self,name,q):
+        mom,hist = self.stats[name];
+        return np.clip(hist.Quantile(q),mom.min,mom.max);
+
+
+'''
+Estimators of the chunk values, dictionary of quantity to (Moments,Histogram)
+'''
+def Reduce(values,edges,Bins):
+    stats = {};
+    for name in QUANTITIES:
+        mom = Moments(len(edges[name][0]));
+        hist = Histogram(edges[name][0],edges[name][1],Bins);
+        mom.Add(values[name]);
+        hist.Add(values[name]);
+        stats[name] = (mom,hist);
+    return stats;
+
+'''
+Samples k*count to (k+1)*count-1 of the sequence as KxD Matrix of standard scores
+'''
+def Draw(spec,k,count):
+    d = len(spec['col']);
+    if d == 0:
+        return np.zeros((count,0));
+    if spec['sampler'] == 'sobol':
+        sampler = qmc.Sobol(d,scramble=True,seed=spec['seed']);
+        if k != 0:
+            sampler.fast_forward(k*count);
+        u = sampler.random(count);
+    else:
+        seed = None if spec['seed'] is None else [spec['seed'],k];
+        u = qmc.LatinHypercube(d,seed=np.random.default_rng(seed)).random(count);
+    u = np.clip(u,1e-12,1-1e-12);
+    if spec['dist'] == 'normal':
+        return norm.ppf(u);
+    return np.sqrt(3)*(2*u-1);
+
+'''
+Solve chunk k of count samples on an attached network, adding the results to reducer if given
+Returns dictionary of quantity to values (KxM) of the samples solved and total iterations
+'''
+def SampleChunk(handle,spec,k,count,reducer=None):
+    inc = shared.Attach(handle);
+    n = inc.n;
+    Z = Draw(spec,k,count);
+    feed = np.repeat(spec['base'][None],count,axis=0);
+    mult = np.maximum(1+spec['sigma']*Z,0);
+    feed[:,spec['row'],spec['col']] *= mult;
+    P = np.repeat(inc.P0[None],count,axis=0);
+    Q = np.repeat(inc.Q0[None],count,axis=0);
+    base = spec['base'];
+    P[:,:,0] += (feed[:,:,2]-base[:,2])-(feed[:,:,0]-base[:,0]);
+    Q[:,:,0] -= feed[:,:,1]-base[:,1];
+    Q[:,:,3] = feed[:,:,1];
+    V = np.repeat(inc.V0[None],count,axis=0);
+
+    results = batch.BatchLoadFlow(n,P,Q,V,inc.BT0,None,handle['MaxIter'],handle['Vlimit'],handle['Qlimit'],
+            inc.Line0,inc.BNo,Case=inc.base,Warm=spec['warm']).Solve();
+    Vm = np.array([r[4][:,0] for r in results]);
+    D = np.array([r[5][:,0] for r in results]);
+    Sc = np.array([r[2][:,0]+1j*r[3][:,0] for r in results]);
+
+    # Injections the solution gives against the ones it reports
+    Vc = Vm*np.exp(1j*D);
+    S = Vc*np.conj(inc.base.Ysp.dot(Vc.T).T);
+    ok = np.all(np.isfinite(Vc),axis=1);
+    ok[ok] = np.max(abs(S[ok]-Sc[ok]),axis=1) < 1e-4;
+    if reducer is not None:
+        for i in np.where(ok)[0]:
+            reducer.Add(results[i],k*count+i);
+    values = {'V':Vm[ok],'D':D[ok],'P':np.array([r[6].flatten() for r in results])[ok],
+            'Q':np.array([r[7].flatten() for r in results])[ok],
+            'Ploss':np.array([[np.sum(r[8])] for r in results])[ok]};
+    return values,sum(r[0] for r in results);
+
+'''
+Solve one chunk (handle, spec, chunk number, chunk size, histogram ranges, bins, reducer) in a worker
+Returns the estimators of the chunk, samples failed, total iterations and the reducer
+'''
+def ChunkTask(task):
+    handle,spec,k,count,edges,Bins,reducer = task;
+    values,iters = SampleChunk(handle,spec,k,count,reducer);
+    return Reduce(values,edges,Bins),count-len(values['V']),iters,reducer;
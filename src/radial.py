@@ -0,0 +1,282 @@
+'''
+Load FLow Analyser
+Copyright (C) 2020 Akshay Arvind Laturkar
+
+Date Created : 19 October 2026 -- Version 1.2.0
+
+This program is free software: you can redistribute it
+and/or modify it under the terms of the GNU General
+Public License as published by the Free Software
+Foundation, either version 3 of the License, or
+any later version.
+
+This program is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the
+implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE.  See the GNU General Public License
+for more details.
+
+You should have received a copy of the GNU General Public
+License along with this program.
+If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+File Version History
+V1.2.0 : October 19, 2026
+         Backward/forward sweep load flow for radial networks
+         Limit switching documented as one way, unlike loadflow.LoadFlow
+'''
+
+
+import numpy as np;
+import scipy.sparse as sp;
+import scipy.sparse.linalg as spla;
+from scipy.sparse.csgraph import breadth_first_order;
+import loadflow as solver;
+import incremental;
+import topology;
+from resultstore import EncodeBusType,DecodeBusType,PQ,PV,SLACK;
+
+'''
+True if the lines connect the N buses as a tree (one path between any two buses)
+Line is Lx6 Matrix as LNo,From Bus,To Bus,B/2,R,X of the lines in service
+'''
+def IsRadial(N,Line,BNo):
+    Line = np.asarray(Line,dtype=float).reshape((-1,6));
+    if len(Line) != N-1:
+        return False;
+    count,labels = topology.Islands(N,Line,BNo);
+    return count == 1;
+
+class Radial:
+
+    '''
+    Backward/forward sweep load flow of a radial network
+
+    Arguments are the same as for loadflow.LoadFlow and
+    T is Lx1 Matrix of tap ratios (defaults to 1.0)
+    Status is L length bool of the lines in service (defaults to all), those must form a tree
+    Case is the compiled loadflow.Case of the network, compiled from YBus if not given
+    Warm is (V,D) of a previous solution, Nx1 each in bus order, to start from
+
+    The feeder tree is built from the Line feed by one breadth first traversal from the
+    slack bus. Every branch is its pi model (with tap) as a two port between parent and
+    child bus, so the backward sweep (load currents summed towards the slack) and the
+    forward sweep (voltages from the slack outwards) are each one triangular solve over
+    the tree, factorized once: O(N) per iteration and no Jacobian, which stays well
+    conditioned at the high R/X ratios of distribution feeders.
+    PV buses are held at their setpoint by adjusting their Q each iteration through the
+    tree impedances between PV buses. Q and V limits switch bus types once the mismatch
+    is below the LIMITS start_mismatch, without the staged switching and switching back
+    of loadflow.LoadFlow, so with the limits on the bus types (and operating point) can
+    differ from it. With the limits off results are the same as loadflow.LoadFlow.Solve(),
+    converged is False if the mismatch did not fall below 1e-6 within MaxIter iterations.
+    '''
+    def __init__(self,N,P,Q,V,BT,YBus,MaxIter,Vlimit,Qlimit,Line,BNo,T=None,Status=None,Case=None,Warm=None):
+        self.n = N;
+        self.BT = EncodeBusType(BT).astype(np.int8).reshape((N,)).copy();
+        self.P = np.array(P,dtype=float).reshape((N,1));
+        self.Q = np.array(Q,dtype=float).reshape((N,4));
+        self.V = np.array(V,dtype=float).reshape((N,3));
+        self.Max = MaxIter;
+        self.Vlimit = Vlimit;
+        self.Qlimit = Qlimit;
+        self.Line = np.asarray(Line,dtype=float).reshape((-1,6));
+        self.BNo = np.asarray(BNo).reshape((N,1));
+        self.T = np.ones(len(self.Line)) if T is None else np.asarray(T,dtype=float).flatten();
+        self.status = np.ones(len(self.Line),dtype=bool) if Status is None else np.asarray(Status,dtype=bool).flatten();
+        if Case is None:
+            Case = solver.Compile(np.asarray(YBus).reshape((N,N)),self.Line,self.BNo);
+        self.case = Case;
+        self.converged = False;
+        slack = np.where(self.BT == SLACK)[0];
+        if len(slack) != 1:
+            raise ValueError('Radial network needs exactly one Slack bus');
+        self.root = slack[0];
+        self.__Tree();
+
+        self.Vset = self.V[:,0].copy();
+        self.Vc = np.full(N,self.Vset[self.root],dtype=complex);
+        if Warm is not None:
+            Vw = np.asarray(Warm[0],dtype=float).flatten();
+            Dw = np.asarray(Warm[1],dtype=float).flatten();
+            Vw = np.where(self.BT == PQ,np.where(Vw > 0,Vw,1.0),self.Vset);
+            self.Vc = Vw*np.exp(1j*(Dw-Dw[self.root]));
+
+    '''
+    Tree from one traversal and the triangular sweep matrices over it
+    '''
+    def __Tree(self):
+        n = self.n;
+        live = np.where(self.status)[0];
+        Line = self.Line[live];
+        i = self.case.bmap[Line[:,1]];
+        j = self.case.bmap[Line[:,2]];
+        if len(live) != n-1:
+            raise ValueError('Network is not radial');
+        graph = sp.csr_matrix((np.arange(1,len(live)+1,dtype=float),(i,j)),shape=(n,n));
+        graph = graph+graph.T;
+        order,pred = breadth_first_order(graph,self.root,directed=False,return_predecessors=True);
+        if len(order) != n:
+            raise ValueError('Network is not radial');
+        child = order[1:];
+        parent = pred[child];
+        branch = live[np.asarray(graph[parent,child]).flatten().astype(np.int64)-1];
+        self.order = order;
+        self.child = child;
+        self.parent = parent;
+
+        # Two port of every branch from the parent side, Stamp is in From,To order
+        L = self.Line[branch];
+        M = incremental.Stamp(L[:,4],L[:,5],L[:,3],self.T[branch]);
+        fwd = self.case.bmap[L[:,1]] == parent;
+        Ypp = np.where(fwd,M[0,0],M[1,1]);
+        Ypc = np.where(fwd,M[0,1],M[1,0]);
+        Ycp = np.where(fwd,M[1,0],M[0,1]);
+        Ycc = np.where(fwd,M[1,1],M[0,0]);
+
+        # Bus shunts are what is left on the diagonal after the branches
+        shunt = self.case.Ysp.diagonal().copy();
+        np.subtract.at(shunt,parent,Ypp);
+        np.subtract.at(shunt,child,Ycc);
+        self.shunt = shunt;
+
+        # Backward: J(p) = I(p) + sum over children of alpha V(p) + beta J(c)
+        # Forward:  V(c) = F V(p) + g J(c)
+        self.alpha = Ypp-Ypc*Ycp/Ycc;
+        beta = -Ypc/Ycc;
+        self.F = -Ycp/Ycc;
+        self.g = -1/Ycc;
+        pos = np.zeros(n,dtype=np.int64);
+        pos[order] = np.arange(n);
+        self.pos = pos;
+        I = sp.identity(n,dtype=complex,format='csc');
+        B = sp.csc_matrix((beta,(pos[parent],pos[child])),shape=(n,n));
+        Fm = sp.csc_matrix((self.F,(pos[child],pos[parent])),shape=(n,n));
+        self.back = spla.splu((I-B).tocsc(),permc_spec='NATURAL',diag_pivot_thresh=0.0);
+        self.fwd = spla.splu((I-Fm).tocsc(),permc_spec='NATURAL',diag_pivot_thresh=0.0);
+        self.Zpv = None;
+
+    '''
+    Current drawn into every subtree for the bus consumption currents I (backward sweep)
+    and the voltages from the slack at V0 outwards (forward sweep)
+    V is the present voltage for the branch shunt currents, None for the linear part alone
+    '''
+    def __Sweep(self,I,V=None,V0=0.0):
+        rhs = I.copy();
+        if V is not None:
+            np.add.at(rhs,self.parent,self.alpha*V[self.parent]);
+        J = np.zeros(self.n,dtype=complex);
+        J[self.order] = self.back.solve(rhs[self.order]);
+        rhs = np.zeros(self.n,dtype=complex);
+        rhs[self.child] = self.g*J[self.child];
+        rhs[self.root] = V0;
+        Vn = np.zeros(self.n,dtype=complex);
+        Vn[self.order] = self.fwd.solve(rhs[self.order]);
+        return J,Vn;
+
+    '''
+    Voltage change at every bus per unit consumption current at each PV bus, NxPV
+    '''
+    def __Impedance(self,pv):
+        Z = np.zeros((self.n,len(pv)),dtype=complex);
+        for k,bus in enumerate(pv):
+            I = np.zeros(self.n,dtype=complex);
+            I[bus] = 1.0;
+            Z[:,k] = self.__Sweep(I)[1];
+        return Z;
+
+    '''
+    Largest P (non slack) and Q (PQ) mismatch, and PV voltage magnitude error
+    '''
+    def __Mismatch(self):
+        S = self.Vc*np.conj(self.case.Ysp.dot(self.Vc));
+        BT = self.BT;
+        dP = np.where(BT != SLACK,self.P[:,0]-S.real,0.0);
+        dQ = np.where(BT == PQ,self.Q[:,0]-S.imag,0.0);
+        dV = np.where(BT == PV,self.Vset-abs(self.Vc),0.0);
+        return max(np.max(abs(dP)),np.max(abs(dQ)),np.max(abs(dV))),S;
+
+    '''
+    Switch buses beyond their Q or V limits, returns the no. of buses switched
+    '''
+    def __Limits(self,S):
+        Q = self.Q;
+        V = self.V;
+        count = 0;
+        if self.Qlimit:
+            Qg = S.imag+Q[:,3];
+            band = (abs(Q[:,1]-Q[:,2]) > 1e-10) & (self.BT == PV) & ~self.switched;
+            for k,col in [(np.where(band & (Qg > Q[:,2]))[0],2),(np.where(band & (Qg < Q[:,1]))[0],1)]:
+                Q[k,0] = Q[k,col]-Q[k,3];
+                self.BT[k] = PQ;
+                self.switched[k] = True;
+                count += len(k);
+        if self.Vlimit:
+            Vm = abs(self.Vc);
+            band = (abs(V[:,1]-V[:,2]) > 1e-10) & (self.BT == PQ) & ~self.switched;
+            for k,col in [(np.where(band & (Vm > V[:,2]))[0],2),(np.where(band & (Vm < V[:,1]))[0],1)]:
+                self.Vset[k] = V[k,col];
+                self.BT[k] = PV;
+                self.switched[k] = True;
+                count += len(k);
+        return count;
+
+    '''
+    Solve by backward/forward sweeps
+    store,scenario -- optional ResultStore and scenario index to write the results into
+    '''
+    def Solve(self,store=None,scenario=None):
+        countVal = 0;
+        self.switched = np.zeros(self.n,dtype=bool);
+        V0 = self.Vset[self.root];
+        pv = None;
+        for i in range(0,self.Max):
+            countVal += 1;
+            err,S = self.__Mismatch();
+            if (self.Qlimit or self.Vlimit) and err < solver.LIMITS['start_mismatch'] and self.__Limits(S) != 0:
+                err,S = self.__Mismatch();
+            if err < 1e-6:
+                self.converged = True;
+                break;
+
+            I = np.conj(-(self.P[:,0]+1j*self.Q[:,0])/self.Vc)+self.shunt*self.Vc;
+            J,self.Vc = self.__Sweep(I,self.Vc,V0);
+
+            # Q of PV buses corrected by their voltage error through the tree impedances,
+            # the voltages are moved by the change in current so the sweeps start from it
+            buses = np.where(self.BT == PV)[0];
+            if pv is None or not np.array_equal(pv,buses):
+                pv = buses;
+                self.Zpv = self.__Impedance(pv);
+            if len(pv) != 0:
+                Vp = self.Vc[pv];
+                dI = 1j/np.conj(Vp);
+                M = (np.conj(Vp)[:,None]/abs(Vp)[:,None]*self.Zpv[pv]*dI[None,:]).real;
+                dQ = np.linalg.solve(M,self.Vset[pv]-abs(Vp));
+                self.Q[pv,0] += dQ;
+                self.Vc += self.Zpv.dot(dI*dQ);
+
+        err,S = self.__Mismatch();
+        self.converged = err < 1e-6;
+        P = self.P.copy();
+        Q = self.Q.copy();
+        V = self.V.copy();
+        P[self.root,0] = S.real[self.root];
+        ctrl = self.BT != PQ;
+        Q[ctrl,0] = S.imag[ctrl];
+        V[:,0] = abs(self.Vc);
+        D = np.angle(self.Vc).reshape((self.n,1));
+
+        Pij,Pji,Qij,Qji = self.case.LineFlows(V[:,0],D[:,0]);
+        Pavg = (Pij-Pji)/2;
+        Qavg = Qij-Qji;
+        Ploss = abs(Pij+Pji);
+        Qloss = Qij+Qji;
+        for flow in [Pavg,Qavg,Ploss,Qloss]:
+            flow[~self.status] = 0;
+        result = [countVal,DecodeBusType(self.BT).reshape((self.n,1)),P,Q,V,D,Pavg,Qavg,Ploss,Qloss];
+        if store is not None:
+            store.Write(scenario,result);
+        return result;
@@ -0,0 +1,365 @@
+'''
+Load FLow Analyser
+Copyright (C) 2020 Akshay Arvind Laturkar
+
+Date Created : 19 October 2026 -- Version 1.2.0
+
+This program is free software: you can redistribute it
+and/or modify it under the terms of the GNU General
+Public License as published by the Free Software
+Foundation, either version 3 of the License, or
+any later version.
+
+This program is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the
+implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE.  See the GNU General Public License
+for more details.
+
+You should have received a copy of the GNU General Public
+License along with this program.
+If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+File Version History
+V1.2.0 : October 19, 2026
+         Streaming moment and histogram quantile estimators, mergeable across workers
+         Pluggable reducers of LoadFlow.Solve() results for multi-run studies
+'''
+
+
+import numpy as np;
+import copy;
+
+class Moments:
+
+    '''
+    Running count, mean, variance, min and max of M quantities
+
+    Batches of samples (KxM) are added with Add(), the mean and the sum of squared
+    deviations are updated with the pairwise formula of Chan et al, so estimators
+    filled by different workers are combined exactly with Merge() in any order.
+    Memory is O(M) whatever the number of samples.
+    '''
+    def __init__(self,M):
+        self.count = 0;
+        self.mean = np.zeros(M);
+        self.m2 = np.zeros(M);
+        self.min = np.full(M,np.inf);
+        self.max = np.full(M,-np.inf);
+
+    '''
+    Add a batch of samples, KxM Matrix (or M vector for one sample)
+    '''
+    def Add(self,X):
+        X = np.asarray(X,dtype=float).reshape((-1,len(self.mean)));
+        if len(X) == 0:
+            return;
+        other = Moments(len(self.mean));
+        other.count = len(X);
+        other.mean = X.mean(axis=0);
+        other.m2 = ((X-other.mean)**2).sum(axis=0);
+        other.min = X.min(axis=0);
+        other.max = X.max(axis=0);
+        self.Merge(other);
+
+    '''
+    Combine with the estimator of other samples, self then covers both
+    '''
+    def Merge(self,other):
+        n = self.count+other.count;
+        if other.count == 0:
+            return self;
+        delta = other.mean-self.mean;
+        self.mean = self.mean+delta*(other.count/n);
+        self.m2 = self.m2+other.m2+delta**2*(self.count*other.count/n);
+        self.min = np.minimum(self.min,other.min);
+        self.max = np.maximum(self.max,other.max);
+        self.count = n;
+        return self;
+
+    '''
+    Mean of each quantity
+    '''
+    def Mean(self):
+        return self.mean;
+
+    '''
+    Sample standard deviation of each quantity
+    '''
+    def Std(self):
+        if self.count < 2:
+            return np.zeros(len(self.mean));
+        return np.sqrt(self.m2/(self.count-1));
+
+
+class Histogram:
+
+    '''
+    Fixed bin histograms of M quantities for streaming quantiles
+
+    lo and hi are the range (M vectors or scalars) split into Bins equal bins,
+    samples outside fall in an underflow or overflow bin and are counted at the edge.
+    Estimators with the same range merge by adding counts, so Merge() is exact and
+    associative. Quantiles are interpolated within a bin, within (hi-lo)/Bins.
+    '''
+    def __init__(self,lo,hi,Bins=512):
+        self.lo = np.array(lo,dtype=float).flatten();
+        self.hi = np.array(hi,dtype=float).flatten();
+        M = max(len(self.lo),len(self.hi));
+        self.lo = np.broadcast_to(self.lo,(M,)).copy();
+        self.hi = np.broadcast_to(self.hi,(M,)).copy();
+        self.hi = np.maximum(self.hi,self.lo+1e-12);
+        self.bins = Bins;
+        self.counts = np.zeros((M,Bins+2),dtype=np.int64);
+
+    '''
+    Add a batch of samples, KxM Matrix (or M vector for one sample)
+    '''
+    def Add(self,X):
+        M = len(self.lo);
+        X = np.asarray(X,dtype=float).reshape((-1,M));
+        if len(X) == 0:
+            return;
+        k = np.floor((X-self.lo)*(self.bins/(self.hi-self.lo))).astype(np.int64)+1;
+        k = np.clip(k,0,self.bins+1);
+        flat = (np.arange(M)*(self.bins+2)+k).ravel();
+        self.counts += np.bincount(flat,minlength=M*(self.bins+2)).reshape((M,self.bins+2));
+
+    '''
+    Combine with the histogram of other samples over the same range
+    '''
+    def Merge(self,other):
+        if other.bins != self.bins or np.any(other.lo != self.lo) or np.any(other.hi != self.hi):
+            raise ValueError('Histograms of different ranges can not be merged');
+        self.counts += other.counts;
+        return self;
+
+    '''
+    q-th quantile (0 <= q <= 1) of each quantity, as M vector
+    '''
+    def Quantile(self,q):
+        M = len(self.lo);
+        total = self.counts.sum(axis=1);
+        cum = np.cumsum(self.counts,axis=1);
+        target = q*total;
+        k = np.array([np.searchsorted(cum[i],target[i]) for i in range(0,M)]);
+        k = np.clip(k,0,self.bins+1);
+        before = np.where(k > 0,cum[np.arange(M),np.maximum(k-1,0)],0);
+        inbin = self.counts[np.arange(M),k];
+        frac = np.where(inbin > 0,(target-before)/np.maximum(inbin,1),0.0);
+        width = (self.hi-self.lo)/self.bins;
+        value = self.lo+(k-1+np.clip(frac,0,1))*width;
+        value = np.where(k == 0,self.lo,value);
+        value = np.where(k == self.bins+1,self.hi,value);
+        return np.where(total > 0,value,np.nan);
+
+
+class Reducer:
+
+    '''
+    Running aggregate of the LoadFlow.Solve() results of many runs
+
+    Add() takes each result with its scenario number as it is produced and keeps
+    only the aggregate, O(buses+lines) whatever the number of runs.
+    Reducers filled by different workers from Empty() copies are combined with
+    Merge(), which is associative and commutative, so the order in which workers
+    finish changes Result() by rounding at most.
+    '''
+    def __init__(self):
+        self.Reset();
+
+    '''
+    Drop everything added
+    '''
+    def Reset(self):
+        self.count = 0;
+
+    '''
+    Reducer of the same kind and settings with nothing added, to fill in a worker
+    '''
+    def Empty(self):
+        other = copy.deepcopy(self);
+        other.Reset();
+        return other;
+
+    '''
+    Add the result of scenario number scenario
+    '''
+    def Add(self,result,scenario):
+        self.count += 1;
+
+    '''
+    Combine with a reducer of the same kind filled with other runs
+    '''
+    def Merge(self,other):
+        self.count += other.count;
+        return self;
+
+    '''
+    Aggregate as dictionary of name to array
+    '''
+    def Result(self):
+        return {'count':self.count};
+
+
+class BusVoltage(Reducer):
+
+    '''
+    Min, max, mean and standard deviation of V of each of N buses
+    '''
+    def __init__(self,N):
+        self.n = N;
+        Reducer.__init__(self);
+
+    def Reset(self):
+        Reducer.Reset(self);
+        self.moments = Moments(self.n);
+
+    def Add(self,result,scenario):
+        Reducer.Add(self,result,scenario);
+        self.moments.Add(result[4][:,0]);
+
+    def Merge(self,other):
+        Reducer.Merge(self,other);
+        self.moments.Merge(other.moments);
+        return self;
+
+    def Result(self):
+        m = self.moments;
+        return {'count':self.count,'min':m.min,'max':m.max,'mean':m.Mean(),'std':m.Std()};
+
+
+class Exceedance(Reducer):
+
+    '''
+    Number of runs in which V of each of N buses is below V (min) or above V (max)
+    Buses with V (min) equal to V (max) have no band and are not counted,
+    Tol is the margin (pu) a voltage has to be out by
+    '''
+    def __init__(self,N,Tol=1e-6):
+        self.n = N;
+        self.tol = Tol;
+        Reducer.__init__(self);
+
+    def Reset(self):
+        Reducer.Reset(self);
+        self.below = np.zeros(self.n,dtype=np.int64);
+        self.above = np.zeros(self.n,dtype=np.int64);
+
+    def Add(self,result,scenario):
+        Reducer.Add(self,result,scenario);
+        V = result[4];
+        band = abs(V[:,2]-V[:,1]) > 1e-10;
+        self.below += band & (V[:,0] < V[:,1]-self.tol);
+        self.above += band & (V[:,0] > V[:,2]+self.tol);
+
+    def Merge(self,other):
+        Reducer.Merge(self,other);
+        self.below += other.below;
+        self.above += other.above;
+        return self;
+
+    def Result(self):
+        return {'count':self.count,'below':self.below,'above':self.above};
+
+
+class WorstLoading(Reducer):
+
+    '''
+    Worst loading of each of L lines and the scenario it occurred in
+    Loading is the apparent flow |Pavg + jQavg| divided by Rate (Lx1 Matrix of line
+    ratings in pu), or in pu if Rate is not given. Ties keep the lower scenario number.
+    '''
+    def __init__(self,L,Rate=None):
+        self.l = L;
+        self.rate = np.ones(L) if Rate is None else np.asarray(Rate,dtype=float).flatten();
+        Reducer.__init__(self);
+
+    def Reset(self):
+        Reducer.Reset(self);
+        self.loading = np.full(self.l,-np.inf);
+        self.scenario = np.full(self.l,-1,dtype=np.int64);
+
+    def Add(self,result,scenario):
+        Reducer.Add(self,result,scenario);
+        loading = abs(result[6].flatten()+1j*result[7].flatten())/self.rate;
+        self.__Take(loading,np.full(self.l,scenario,dtype=np.int64));
+
+    def __Take(self,loading,scenario):
+        take = (loading > self.loading) | ((loading == self.loading) & (scenario < self.scenario));
+        self.loading = np.where(take,loading,self.loading);
+        self.scenario = np.where(take,scenario,self.scenario);
+
+    def Merge(self,other):
+        Reducer.Merge(self,other);
+        self.__Take(other.loading,other.scenario);
+        return self;
+
+    def Result(self):
+        return {'count':self.count,'loading':self.loading,'scenario':self.scenario};
+
+
+class LossHistogram(Reducer):
+
+    '''
+    Histogram of the total real power loss (sum of Ploss) of the runs
+    Bins equal bins from lo to hi pu, with an underflow and overflow bin at the ends
+    '''
+    def __init__(self,lo,hi,Bins=100):
+        self.lo = lo;
+        self.hi = hi;
+        self.bins = Bins;
+        Reducer.__init__(self);
+
+    def Reset(self):
+        Reducer.Reset(self);
+        self.hist = Histogram(self.lo,self.hi,self.bins);
+        self.moments = Moments(1);
+
+    def Add(self,result,scenario):
+        Reducer.Add(self,result,scenario);
+        loss = np.sum(result[8]);
+        self.hist.Add(loss);
+        self.moments.Add(loss);
+
+    def Merge(self,other):
+        Reducer.Merge(self,other);
+        self.hist.Merge(other.hist);
+        self.moments.Merge(other.moments);
+        return self;
+
+    def Result(self):
+        return {'count':self.count,'edges':np.linspace(self.lo,self.hi,self.bins+1),'counts':self.hist.counts[0],
+                'mean':self.moments.Mean()[0],'min':self.moments.min[0],'max':self.moments.max[0]};
+
+
+class Pipeline(Reducer):
+
+    '''
+    Several reducers fed with the same runs, reducers is dictionary of name to Reducer
+    Result() is dictionary of name to the Result() of that reducer
+    '''
+    def __init__(self,reducers):
+        self.reducers = dict(reducers);
+        Reducer.__init__(self);
+
+    def Reset(self):
+        Reducer.Reset(self);
+        for reducer in self.reducers.values():
+            reducer.Reset();
+
+    def Add(self,result,scenario):
+        Reducer.Add(self,result,scenario);
+        for reducer in self.reducers.values():
+            reducer.Add(result,scenario);
+
+    def Merge(self,other):
+        Reducer.Merge(self,other);
+        for name,reducer in self.reducers.items():
+            reducer.Merge(other.reducers[name]);
+        return self;
+
+    def Result(self):
+        return {name:reducer.Result() for name,reducer in self.reducers.items()};
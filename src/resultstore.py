@@ -0,0 +1,167 @@
+'''
+Load FLow Analyser
+Copyright (C) 2020 Akshay Arvind Laturkar
+
+Date Created : 19 October 2026 -- Version 1.2.0
+
+This program is free software: you can redistribute it
+and/or modify it under the terms of the GNU General
+Public License as published by the Free Software
+Foundation, either version 3 of the License, or
+any later version.
+
+This program is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the
+implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE.  See the GNU General Public License
+for more details.
+
+You should have received a copy of the GNU General Public
+License along with this program.
+If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+File Version History
+V1.2.0 : October 19, 2026
+         Memory mapped result store for multi scenario runs
+         Bus type code constants shared with the solvers
+         Unknown bus types and codes raise ValueError instead of mapping to a wrong type
+'''
+
+
+import numpy as np;
+import os;
+
+# Bus types are stored as integer codes, in the same order the solver sorts them
+BUS_TYPES = ['PQ','PV','Slack'];
+PQ = 0;
+PV = 1;
+SLACK = 2;
+
+class ResultStore:
+
+    '''
+    Result store backed by memory mapped .npy files in a directory
+
+    bus  is SxNx5 array as V,D,P,Q,BT (BT coded as index in BUS_TYPES)
+    line is SxLx4 array as Pavg,Qavg,Ploss,Qloss
+    iter is Sx1 array of iterations taken, -1 for scenarios not yet solved
+
+    Only the pages that are touched are held in memory, so a store can be
+    much larger than RAM. Solvers write straight into Bus(s)/Line(s) slices
+    and analysis code slices the arrays without loading the whole file.
+    '''
+    BUS_QTY = ['V','D','P','Q','BT'];
+    LINE_QTY = ['Pavg','Qavg','Ploss','Qloss'];
+
+    def __init__(self,path,S=None,N=None,L=None,mode='w+'):
+        self.path = path;
+        self.mode = mode;
+        if mode == 'w+':
+            if S is None or N is None or L is None:
+                raise ValueError("S, N and L are required to create a result store");
+            if not os.path.isdir(path):
+                os.makedirs(path);
+            self.bus = np.lib.format.open_memmap(path+'/bus.npy',mode='w+',dtype=np.float64,shape=(S,N,len(self.BUS_QTY)));
+            self.line = np.lib.format.open_memmap(path+'/line.npy',mode='w+',dtype=np.float64,shape=(S,L,len(self.LINE_QTY)));
+            self.iter = np.lib.format.open_memmap(path+'/iter.npy',mode='w+',dtype=np.int32,shape=(S,));
+            self.iter[:] = -1;
+        else:
+            self.bus = np.lib.format.open_memmap(path+'/bus.npy',mode=mode);
+            self.line = np.lib.format.open_memmap(path+'/line.npy',mode=mode);
+            self.iter = np.lib.format.open_memmap(path+'/iter.npy',mode=mode);
+        self.S,self.N = self.bus.shape[:2];
+        self.L = self.line.shape[1];
+
+    '''
+    Open an existing store, read only by default
+    '''
+    @classmethod
+    def Open(cls,path,mode='r'):
+        return cls(path,mode=mode);
+
+    '''
+    Writable NxQty view of scenario s, used by solvers to write results in place
+    '''
+    def Bus(self,s):
+        return self.bus[s];
+
+    '''
+    Writable LxQty view of scenario s
+    '''
+    def Line(self,s):
+        return self.line[s];
+
+    '''
+    Slice one bus quantity for selected scenarios and buses without loading the rest
+    '''
+    def BusQty(self,qty,scenarios=slice(None),buses=slice(None)):
+        return self.bus[scenarios,buses,self.BUS_QTY.index(qty)];
+
+    '''
+    Slice one line quantity for selected scenarios and lines without loading the rest
+    '''
+    def LineQty(self,qty,scenarios=slice(None),lines=slice(None)):
+        return self.line[scenarios,lines,self.LINE_QTY.index(qty)];
+
+    '''
+    Store the output of LoadFlow.Solve() for scenario s
+    '''
+    def Write(self,s,result):
+        [rIter,rBT,rP,rQ,rV,rD,Pavg,Qavg,Ploss,Qloss] = result;
+        bus = self.bus[s];
+        bus[:,0] = np.asarray(rV).reshape((self.N,-1))[:,0];
+        bus[:,1] = np.asarray(rD).reshape((self.N,-1))[:,0];
+        bus[:,2] = np.asarray(rP).reshape((self.N,-1))[:,0];
+        bus[:,3] = np.asarray(rQ).reshape((self.N,-1))[:,0];
+        bus[:,4] = EncodeBusType(rBT);
+        line = self.line[s];
+        line[:,0] = Pavg;
+        line[:,1] = Qavg;
+        line[:,2] = Ploss;
+        line[:,3] = Qloss;
+        self.iter[s] = rIter;
+
+    '''
+    Scenarios which have been written to the store
+    '''
+    def Solved(self):
+        return np.where(np.asarray(self.iter) >= 0)[0];
+
+    def Flush(self):
+        if self.mode != 'r':
+            self.bus.flush();
+            self.line.flush();
+            self.iter.flush();
+
+
+'''
+Convert an array of bus type strings to integer codes, codes are returned as they are
+Raises ValueError for unknown bus types and codes
+'''
+def EncodeBusType(BT):
+    BT = np.asarray(BT).flatten();
+    if BT.dtype.kind in 'iu':
+        code = BT.astype(np.int64);
+        bad = (code < 0) | (code >= len(BUS_TYPES));
+        if np.any(bad):
+            raise ValueError("Unknown bus type code " + str(code[bad][0]));
+        return code;
+    code = np.full(len(BT),-1,dtype=np.int64);
+    for i,btype in enumerate(BUS_TYPES):
+        code[BT == btype] = i;
+    if np.any(code < 0):
+        raise ValueError("Unknown bus type '" + str(BT[code < 0][0]) + "'");
+    return code;
+
+'''
+Convert integer codes back to an array of bus type strings
+Raises ValueError for codes outside range(len(BUS_TYPES))
+'''
+def DecodeBusType(code):
+    code = np.asarray(code).astype(np.int64);
+    bad = (code < 0) | (code >= len(BUS_TYPES));
+    if np.any(bad):
+        raise ValueError("Unknown bus type code " + str(code[bad][0]));
+    return np.array(BUS_TYPES,dtype=object)[code];
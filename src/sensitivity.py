@@ -0,0 +1,380 @@
+'''
+Load FLow Analyser
+Copyright (C) 2020 Akshay Arvind Laturkar
+
+Date Created : 19 October 2026 -- Version 1.2.0
+
+This program is free software: you can redistribute it
+and/or modify it under the terms of the GNU General
+Public License as published by the Free Software
+Foundation, either version 3 of the License, or
+any later version.
+
+This program is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the
+implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE.  See the GNU General Public License
+for more details.
+
+You should have received a copy of the GNU General Public
+License along with this program.
+If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+File Version History
+V1.2.0 : October 19, 2026
+         PTDF/LODF engine on a single factorization of the reduced B matrix
+         Bus No and Line No looked up through vectorized ID maps
+         Line edits applied as Sherman-Morrison-Woodbury updates of the base factorization
+         AC sensitivities of a solved load flow from the factorization of its final Jacobian
+'''
+
+
+import numpy as np;
+import scipy.sparse as sp;
+import scipy.sparse.linalg as spla;
+import loadflow as solver;
+
+class Sensitivity:
+
+    '''
+    DC power transfer (PTDF) and line outage (LODF) distribution factors
+
+    Line is Lx6 Matrix as LNo,From Bus,To Bus,B/2,R,X (only X is used)
+    BNo is Nx1 Matrix of Bus No
+    Slack is the Bus No of the reference bus
+
+    Buses are referred by Bus No and lines by Line No. The reduced B matrix
+    is factorized once, rows and columns are computed only when asked for
+    and cached, so the full LxN matrix is never formed unless requested.
+    Line edits (Update) are applied on top of that factorization.
+    '''
+    def __init__(self,Line,BNo,Slack):
+        self.Line = np.array(Line,dtype=float).reshape((-1,6)).copy();
+        self.BNo = np.array(BNo).flatten().astype(np.int64);
+        self.n = len(self.BNo);
+        self.l = len(self.Line);
+
+        self.bpos = solver.IndexMap(self.BNo);
+        self.slack = self.bpos[int(Slack)];
+        self.__Lines(self.Line,1/self.Line[:,5]);
+        B = self.A.transpose().dot(self.Ab).tocsc();
+
+        # Reduced B without the slack bus, factorized once
+        self.keep = np.delete(np.arange(self.n),self.slack);
+        self.red = np.full(self.n,-1,dtype=np.int64);
+        self.red[self.keep] = np.arange(self.n-1);
+        self.lu = spla.splu(B[self.keep,:][:,self.keep].tocsc());
+        self.l0 = self.l;
+        self.b0 = self.b.copy();
+        self.W = None;      # Woodbury update for line edits, None for the base lines
+
+    '''
+    Line table with series susceptance b of every line, caches are cleared
+    '''
+    def __Lines(self,Line,b):
+        self.Line = Line;
+        self.l = len(Line);
+        self.b = b;
+        self.lpos = solver.IndexMap(self.Line[:,0]);
+        self.fidx = self.bpos[self.Line[:,1]];
+        self.tidx = self.bpos[self.Line[:,2]];
+
+        # Incidence matrix and susceptance weighted incidence, LxN
+        rows = np.r_[np.arange(self.l),np.arange(self.l)];
+        cols = np.r_[self.fidx,self.tidx];
+        vals = np.r_[np.ones(self.l),-np.ones(self.l)];
+        self.A = sp.csr_matrix((vals,(rows,cols)),shape=(self.l,self.n));
+        self.Ab = sp.diags(self.b).dot(self.A).tocsr();
+
+        # Caches of computed rows and columns
+        self.rows = {};     # line index -> PTDF row (N)
+        self.cols = {};     # bus index -> PTDF column (L)
+        self.lcols = {};    # outaged line index -> flow change per unit transfer over it (L)
+
+    '''
+    Apply line edits without refactorizing the reduced B matrix
+    Line is the edited Lx6 Matrix, its first rows are the base lines in their order and
+    added lines follow. b is the series susceptance of every line, 0 for lines out of service.
+    Only the lines whose b differs from the base enter the Sherman-Morrison-Woodbury update,
+    so the cost grows with the number of edits and not with the network.
+    '''
+    def Update(self,Line,b):
+        Line = np.array(Line,dtype=float).reshape((-1,6));
+        b = np.array(b,dtype=float).flatten();
+        self.__Lines(Line,b);
+        db = np.r_[b[:self.l0]-self.b0,b[self.l0:]];
+        chg = np.where(abs(db) > 0)[0];
+        if len(chg) == 0:
+            self.W = None;
+            return;
+
+        # inv(B+U C U^T) = inv(B) - Z C inv(I + U^T Z C) U^T inv(B) with Z = inv(B) U
+        U = np.zeros((self.n,len(chg)));
+        U[self.fidx[chg],np.arange(len(chg))] += 1;
+        U[self.tidx[chg],np.arange(len(chg))] -= 1;
+        U = U[self.keep,:];
+        Z = self.lu.solve(np.ascontiguousarray(U));
+        C = db[chg];
+        M = np.eye(len(chg))+np.matmul(np.transpose(U),Z)*C.reshape((1,len(chg)));
+        if np.linalg.cond(M) > 1e12:
+            raise ValueError("Line edits split the network");
+        self.W = (U,Z,C,np.linalg.inv(M));
+
+    def __lineidx(self,lines):
+        if lines is None:
+            return np.arange(self.l);
+        return self.lpos[np.array(lines,dtype=np.int64).flatten()];
+
+    def __busidx(self,buses):
+        if buses is None:
+            return np.arange(self.n);
+        return self.bpos[np.array(buses,dtype=np.int64).flatten()];
+
+    '''
+    Angles for injection vectors given as NxK Matrix, slack angle is zero
+    '''
+    def Angles(self,inj):
+        inj = np.asarray(inj,dtype=float).reshape((self.n,-1));
+        theta = np.zeros(inj.shape);
+        y = self.lu.solve(np.ascontiguousarray(inj[self.keep,:]));
+        if self.W is not None:
+            U,Z,C,K = self.W;
+            y -= np.matmul(Z,C.reshape((len(C),1))*np.matmul(K,np.matmul(np.transpose(U),y)));
+        theta[self.keep,:] = y;
+        return theta;
+
+    '''
+    PTDF, flow on each line per unit injection at each bus withdrawn at the slack
+    lines given -> rows for those lines, buses given -> columns for those buses
+    Neither given -> full LxN Matrix
+    '''
+    def PTDF(self,lines=None,buses=None):
+        lidx = self.__lineidx(lines);
+        bidx = self.__busidx(buses);
+        if lines is not None or buses is None:
+            # Row of line l is b_l*(e_f-e_t)^T inv(B), B is symmetric so one solve per row
+            need = [k for k in np.unique(lidx) if k not in self.rows];
+            if len(need) != 0:
+                rhs = np.transpose(self.A[need,:].toarray());
+                theta = self.Angles(rhs);
+                for c,k in enumerate(need):
+                    self.rows[k] = self.b[k]*theta[:,c];
+            return np.array([self.rows[k][bidx] for k in lidx]).reshape((len(lidx),len(bidx)));
+        else:
+            need = [k for k in np.unique(bidx) if k not in self.cols];
+            if len(need) != 0:
+                rhs = np.zeros((self.n,len(need)));
+                rhs[need,np.arange(len(need))] = 1;
+                rhs[self.slack,:] = 0;
+                flows = self.Ab.dot(self.Angles(rhs));
+                for c,k in enumerate(need):
+                    self.cols[k] = flows[:,c];
+            return np.transpose(np.array([self.cols[k][lidx] for k in bidx]).reshape((len(bidx),len(lidx))));
+
+    '''
+    Flow on lines per unit transfer injected at source and withdrawn at sink
+    source and sink are Bus No lists with optional participation weights (normalised to 1)
+    Returns L length array (or only for lines if given)
+    '''
+    def Transfer(self,source,sink,swt=None,kwt=None,lines=None):
+        return self.TransferMatrix([(source,sink,swt,kwt)],lines)[:,0];
+
+    '''
+    Transfer PTDFs for many directions in one batched solve
+    directions is a list of (source,sink,swt,kwt) tuples, weights may be None
+    Returns LxK Matrix
+    '''
+    def TransferMatrix(self,directions,lines=None):
+        lidx = self.__lineidx(lines);
+        rhs = np.zeros((self.n,len(directions)));
+        for c,(source,sink,swt,kwt) in enumerate(directions):
+            rhs[:,c] += self.__weights(source,swt);
+            rhs[:,c] -= self.__weights(sink,kwt);
+        rhs[self.slack,:] = 0;
+        return self.Ab[lidx,:].dot(self.Angles(rhs));
+
+    def __weights(self,buses,wt):
+        bidx = self.__busidx(buses);
+        if wt is None:
+            wt = np.ones(len(bidx));
+        wt = np.asarray(wt,dtype=float).flatten();
+        w = np.zeros(self.n);
+        np.add.at(w,bidx,wt/np.sum(wt));
+        return w;
+
+    '''
+    LODF, change of flow on lines per unit of pre-outage flow on outaged line
+    Columns of outages that island the network are nan, diagonal is -1
+    Returns len(lines)xlen(outages) Matrix (full LxL when neither is given)
+    '''
+    def LODF(self,lines=None,outages=None):
+        lidx = self.__lineidx(lines);
+        kidx = self.__lineidx(outages);
+        need = [k for k in np.unique(kidx) if k not in self.lcols];
+        if len(need) != 0:
+            rhs = np.transpose(self.A[need,:].toarray());
+            flows = self.Ab.dot(self.Angles(rhs));
+            for c,k in enumerate(need):
+                self.lcols[k] = flows[:,c];
+        M = np.transpose(np.array([self.lcols[k] for k in kidx]).reshape((len(kidx),self.l)));
+        denom = 1-M[kidx,np.arange(len(kidx))];
+        island = abs(denom) < 1e-6;
+        denom[island] = 1;
+        M = M/denom.reshape((1,len(kidx)));
+        M[kidx,np.arange(len(kidx))] = -1;
+        M[:,island] = np.nan;
+        return M[lidx,:];
+
+    '''
+    Post outage flows for each outage, f is L length pre-outage flow
+    Returns LxK Matrix, column k is flow after outage k
+    '''
+    def OutageFlows(self,f,outages=None):
+        f = np.asarray(f,dtype=float).flatten();
+        kidx = self.__lineidx(outages);
+        LODF = self.LODF(outages=outages);
+        return f.reshape((self.l,1))+LODF*f[kidx].reshape((1,len(kidx)));
+
+    '''
+    Flows after transfer of amount (pu) from source to sink, f is L length base flow
+    '''
+    def TransferFlows(self,f,source,sink,amount,swt=None,kwt=None):
+        return np.asarray(f,dtype=float).flatten()+amount*self.Transfer(source,sink,swt,kwt);
+
+
+class ACSensitivity:
+
+    '''
+    Sensitivities of the AC solution of a solved loadflow.LoadFlow
+
+    The Jacobian at the solution is factorized once (LoadFlow.Final()), every query
+    is then forward and back substitutions with that LU on a block of right hand
+    sides, so K columns cost K triangular solves and no load flow.
+    Buses are referred by Bus No and results are in bus feed order, injections in pu
+    and angles in radians. The slack bus takes up every change of P, V of PV and
+    slack buses and D of the slack are held. Buses switched at a limit by Solve()
+    keep their switched type.
+    '''
+    def __init__(self,lf):
+        final = lf.Final();
+        if final is None:
+            raise ValueError("Jacobian at the solution is singular");
+        self.lu = final['lu'];
+        self.n = lf.n;
+        self.pq = lf.pq;
+        self.rperm = lf.rperm;
+        self.cperm = lf.cperm;
+        self.order = lf.bindx;      # YBus row of each sorted bus, slack last
+        self.spos = np.zeros(self.n,dtype=np.int64);
+        self.spos[lf.bindx] = np.arange(self.n);
+        self.bpos = solver.IndexMap(lf.BNo);
+        Vc = np.zeros(self.n,dtype=complex);
+        if lf.sorted:
+            Vc[lf.bindx] = lf.V[:,0]*np.exp(1j*lf.D[:,0]);
+        else:
+            Vc[:] = lf.V[:,0]*np.exp(1j*lf.D[:,0]);
+
+        # Derivatives of the complex injections in YBus order, NxN
+        Y = lf.case.Ysp;
+        I = Y.dot(Vc);
+        Vn = Vc/abs(Vc);
+        self.dVm = (sp.diags(Vc).dot(np.conj(Y.dot(sp.diags(Vn))))+sp.diags(np.conj(I)*Vn)).tocsr();
+        self.dVa = (1j*sp.diags(Vc).dot(np.conj(sp.diags(I)-Y.dot(sp.diags(Vc))))).tocsr();
+        self.xv = self.order[:self.pq];        # buses of the V unknowns
+        self.xd = self.order[:self.n-1];       # buses of the D unknowns
+        self.loss = None;
+
+    def __busidx(self,buses):
+        return self.bpos[np.array(buses,dtype=np.int64).flatten()];
+
+    '''
+    Solve J X = B for the mismatch ordered right hand sides B (mxK)
+    '''
+    def __Solve(self,B):
+        X = np.zeros(B.shape);
+        X[self.cperm] = self.lu.solve(np.ascontiguousarray(B[self.rperm]));
+        return X;
+
+    '''
+    Unknowns X (mxK) as V and D changes of every bus, NxK each
+    '''
+    def __Unknowns(self,X):
+        dV = np.zeros((self.n,X.shape[1]));
+        dD = np.zeros((self.n,X.shape[1]));
+        dV[self.xv] = X[:self.pq];
+        dD[self.xd] = X[self.pq:];
+        return dV,dD;
+
+    '''
+    Change of V and D of every bus per unit injection of P (kind 'P') or Q (kind 'Q')
+    at each of buses, the slack bus absorbing it
+    Returns dV,dD as NxK Matrices, columns of buses whose injection is not scheduled
+    (P of the slack, Q of PV and slack buses) are zero
+    '''
+    def Injection(self,buses,kind='Q'):
+        s = self.spos[self.__busidx(buses)];
+        k = len(s);
+        if kind == 'P':
+            live = s < self.n-1;
+            row = s;
+        elif kind == 'Q':
+            live = s < self.pq;
+            row = self.n-1+s;
+        else:
+            raise ValueError("Unknown injection '" + str(kind) + "'");
+        B = np.zeros((self.pq+self.n-1,k));
+        B[row[live],np.where(live)[0]] = 1;
+        return self.__Unknowns(self.__Solve(B));
+
+    '''
+    dV/dQ, change of V of every bus per unit Q injection at each of buses (NxK)
+    '''
+    def DVDQ(self,buses):
+        return self.Injection(buses,'Q')[0];
+
+    '''
+    dD/dP, change of D of every bus per unit P injection at each of buses (NxK)
+    '''
+    def DDDP(self,buses):
+        return self.Injection(buses,'P')[1];
+
+    '''
+    Incremental transmission loss factors and penalty factors of every bus
+    The slack P gradient is taken through one transposed solve, dPloss/dPk = 1+dPslack/dPk
+    Returns (dPloss/dP, dPloss/dQ, penalty factor 1/(1-dPloss/dP)) as N length arrays,
+    dPloss/dQ is zero where Q is not scheduled and the slack has factor 0 and penalty 1
+    '''
+    def LossFactors(self):
+        if self.loss is None:
+            slack = self.order[-1];
+            g = np.r_[self.dVm[slack,self.xv].toarray().real.flatten(),self.dVa[slack,self.xd].toarray().real.flatten()];
+            y = np.zeros(len(g));
+            y[self.rperm] = self.lu.solve(np.ascontiguousarray(g[self.cperm]),trans='T');
+            dP = np.zeros(self.n);
+            dQ = np.zeros(self.n);
+            dP[self.xd] = 1+y[:self.n-1];
+            dQ[self.xv] = y[self.n-1:];
+            self.loss = (dP,dQ,1/(1-dP));
+        return self.loss;
+
+    '''
+    Voltage control effectiveness of PV (or slack) buses
+    Change of V of every bus and of the Q generated at each controlling bus per unit
+    change of its V setpoint. Returns dV (NxK, 1 at the controlling bus itself) and
+    dQ (K), columns of PQ buses are zero as they do not control their voltage
+    '''
+    def Control(self,buses):
+        g = self.__busidx(buses);
+        live = self.spos[g] >= self.pq;
+        C = np.r_[self.dVm[self.order[:self.n-1]][:,g].toarray().real,self.dVm[self.xv][:,g].toarray().imag];
+        C[:,~live] = 0;
+        X = -self.__Solve(C);
+        dV,dD = self.__Unknowns(X);
+        k = np.arange(len(g));
+        dV[g[live],k[live]] = 1;
+        dQ = (np.asarray(self.dVm[g,g]).flatten()+
+                np.asarray(self.dVm[g][:,self.xv].multiply(X[:self.pq].T).sum(axis=1)).flatten()+
+                np.asarray(self.dVa[g][:,self.xd].multiply(X[self.pq:].T).sum(axis=1)).flatten()).imag;
+        return dV,np.where(live,dQ,0.0);
@@ -0,0 +1,326 @@
+'''
+Load FLow Analyser
+Copyright (C) 2020 Akshay Arvind Laturkar
+
+Date Created : 19 October 2026 -- Version 1.2.0
+
+This program is free software: you can redistribute it
+and/or modify it under the terms of the GNU General
+Public License as published by the Free Software
+Foundation, either version 3 of the License, or
+any later version.
+
+This program is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the
+implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE.  See the GNU General Public License
+for more details.
+
+You should have received a copy of the GNU General Public
+License along with this program.
+If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+File Version History
+V1.2.0 : October 19, 2026
+         Local load flow service over HTTP/JSON with a warm worker pool
+         Evicted cases are removed only once no request is using them
+         Concurrent registrations of one network keep a single shared case
+'''
+
+
+import numpy as np;
+import pandas as pd;
+import sys;
+import os;
+import io;
+import json;
+import time;
+import hashlib;
+import threading;
+from collections import OrderedDict,deque;
+from concurrent.futures import ProcessPoolExecutor;
+from http.server import ThreadingHTTPServer,BaseHTTPRequestHandler;
+import network;
+import shared;
+
+# Hosts the service may listen on, it is never reachable from other machines
+LOOPBACK = ['127.0.0.1','localhost','::1'];
+
+'''
+Worker process start up, imports and runs the solver once on a two bus network
+so the first real job does not pay for it
+'''
+def WarmUp():
+    bus = {'Bus No':np.array([1,2]),'Bus Type':np.array(['Slack','PQ']),'Pd':np.array([0.0,0.1]),
+            'Qd':np.array([0.0,0.05]),'Pg':np.zeros(2),'Qg':np.zeros(2),'V':np.ones(2),'Shunt Feed':np.zeros(2),
+            'Qg (min)':np.zeros(2),'Qg (max)':np.zeros(2),'V (min)':np.zeros(2),'V (max)':np.zeros(2)};
+    line = {'Line No':np.array([1]),'From Bus':np.array([1]),'To Bus':np.array([2]),'R':np.array([0.01]),
+            'X':np.array([0.1]),'B/2':np.array([0.0]),'T':np.array([1.0])};
+    net = network.Network(bus,line);
+    import loadflow as solver;
+    solver.LoadFlow(*net.Args(10,False,False),Case=net.Compile()).Solve();
+
+class Service:
+
+    '''
+    Validation, network build and load flow behind a long running local service
+
+    Workers processes are started and warmed up once. Networks are validated,
+    built and compiled once, published with shared.SharedCase and kept by the
+    hash of their arrays (MaxCases most recent), so a job on a known network
+    ships only its handle and delta to a worker.
+    Each case counts the requests solving it, an evicted case keeps its files until
+    the last of them is done, then the workers detach it and the files are removed.
+    '''
+    def __init__(self,Workers=None,MaxCases=8):
+        self.pool = ProcessPoolExecutor(max_workers=Workers,initializer=WarmUp);
+        self.workers = Workers or os.cpu_count() or 1;
+        # Start every worker now rather than on the first job
+        list(self.pool.map(time.sleep,[0.0]*self.workers));
+        self.cases = OrderedDict();
+        self.maxcases = MaxCases;
+        self.lock = threading.Lock();
+        self.start = time.time();
+        self.metrics = {'requests':0,'errors':0,'solves':0,'cache_hits':0,'cache_misses':0};
+        self.latency = deque(maxlen=1000);
+        self.done = deque(maxlen=10000);
+
+    '''
+    Validate and build a network from Bus feed and Line feed columns
+    (dictionaries of header to list), or from file names
+    Returns (case id, no. of buses, no. of lines), raises ValueError on invalid feeds
+    '''
+    def Case(self,bus=None,line=None,busfile=None,nwfile=None):
+        try:
+            if busfile is not None:
+                bus = network.Read(busfile,network.BUS_HEADER_DEFAULT);
+                line = network.Read(nwfile,network.NW_HEADER_DEFAULT);
+            else:
+                bus = {col:[network.BUS_HEADER_DEFAULT[col] if val is None else val for val in bus[col]] for col in bus};
+                line = {col:[network.NW_HEADER_DEFAULT[col] if val is None else val for val in line[col]] for col in line};
+            bus = network.Columns(pd.DataFrame(bus),network.BUS_HEADER);
+            line = network.Columns(pd.DataFrame(line),network.NW_HEADER);
+        except (KeyError,TypeError) as err:
+            raise ValueError(str(err).strip('"'));
+        for msg in [network.CheckBuses(bus),network.CheckBus(bus),network.CheckLine(line,bus['Bus No'])]:
+            if msg is not None:
+                raise ValueError(msg);
+
+        h = hashlib.sha1();
+        for cols in [bus,line]:
+            for col in sorted(cols):
+                h.update(col.encode());
+                h.update(np.asarray(cols[col]).astype(str if col == 'Bus Type' else float).tobytes());
+        key = h.hexdigest()[:16];
+        with self.lock:
+            if key in self.cases:
+                self.cases.move_to_end(key);
+                self.metrics['cache_hits'] += 1;
+                case = self.cases[key];
+                return key,case.n,case.l;
+            self.metrics['cache_misses'] += 1;
+        net = network.Network(bus,line);
+        case = shared.SharedCase.FromNetwork(net,20,True,True);
+        case.BNo = net.BNo[:,0];
+        case.LNo = net.line['Line No'];
+        case.refs = 0;
+        case.evicted = False;
+        with self.lock:
+            if key in self.cases:
+                # Registered by a concurrent request while this copy was built
+                self.cases.move_to_end(key);
+                case.Remove();
+                case = self.cases[key];
+                return key,case.n,case.l;
+            self.cases[key] = case;
+            if len(self.cases) > self.maxcases:
+                old = self.cases.popitem(last=False)[1];
+                old.evicted = True;
+                if old.refs == 0:
+                    self.__Release(old);
+        return key,case.n,case.l;
+
+    '''
+    Detach an evicted case in the workers and delete its files, called under the lock
+    once no request is using it
+    '''
+    def __Release(self,case):
+        for k in range(0,self.workers):
+            self.pool.submit(shared.Detach,case.Handle());
+        case.Remove();
+
+    '''
+    Solve network key for each of deltas (see shared.SharedCase) with the given settings
+    Returns list of LoadFlow.Solve() results
+    '''
+    def Solve(self,key,deltas,MaxIter=20,Vlimit=True,Qlimit=True):
+        with self.lock:
+            if key not in self.cases:
+                raise KeyError("Unknown case '" + str(key) + "'");
+            case = self.cases[key];
+            self.cases.move_to_end(key);
+            case.refs += 1;
+        try:
+            handle = dict(case.Handle());
+            handle.update({'MaxIter':int(MaxIter),'Vlimit':bool(Vlimit),'Qlimit':bool(Qlimit)});
+            results = list(self.pool.map(shared.SolveTask,[(handle,s,delta,None) for s,delta in enumerate(deltas)]));
+        finally:
+            with self.lock:
+                case.refs -= 1;
+                if case.evicted and case.refs == 0:
+                    self.__Release(case);
+        now = time.time();
+        with self.lock:
+            self.metrics['solves'] += len(results);
+            self.done.extend([now]*len(results));
+        return case,results;
+
+    '''
+    Counters, latency percentiles (ms, last 1000 requests) and solves per second (last 60 s)
+    '''
+    def Metrics(self):
+        with self.lock:
+            lat = np.array(self.latency) if len(self.latency) != 0 else np.zeros(1);
+            now = time.time();
+            recent = sum(1 for t in self.done if now-t <= 60.0);
+            metrics = dict(self.metrics);
+            metrics.update({'uptime':now-self.start,'workers':self.workers,'cases':len(self.cases),
+                    'latency_ms':{'p50':float(np.percentile(lat,50)*1e3),'p95':float(np.percentile(lat,95)*1e3),
+                    'max':float(np.max(lat)*1e3)},'throughput':recent/min(60.0,max(now-self.start,1e-9))});
+        return metrics;
+
+    def Record(self,latency,error):
+        with self.lock:
+            self.metrics['requests'] += 1;
+            self.metrics['errors'] += int(error);
+            self.latency.append(latency);
+
+    def Close(self):
+        self.pool.shutdown();
+        for case in self.cases.values():
+            case.Remove();
+        self.cases.clear();
+
+
+'''
+Results of a solve as JSON-able dictionary
+'''
+def Encode(case,result):
+    [rIter,rBT,rP,rQ,rV,rD,Pavg,Qavg,Ploss,Qloss] = result;
+    return {'iterations':int(rIter),
+            'bus':{'Bus No':case.BNo.tolist(),'Bus Type':[str(bt) for bt in np.asarray(rBT).flatten()],
+                'V':rV[:,0].tolist(),'D':(rD[:,0]*180/np.pi).tolist(),'P':rP[:,0].tolist(),'Q':rQ[:,0].tolist()},
+            'line':{'Line No':case.LNo.tolist(),'Pavg':np.asarray(Pavg).tolist(),'Qavg':np.asarray(Qavg).tolist(),
+                'Ploss':np.asarray(Ploss).tolist(),'Qloss':np.asarray(Qloss).tolist()}};
+
+'''
+Results of a solve as one .npz archive, quantities stacked over the deltas
+'''
+def EncodeBinary(case,results):
+    buf = io.BytesIO();
+    np.savez(buf,BNo=case.BNo,LNo=case.LNo,iterations=np.array([r[0] for r in results]),
+            BT=np.array([np.asarray(r[1]).flatten() for r in results]).astype('U5'),
+            P=np.array([r[2][:,0] for r in results]),Q=np.array([r[3][:,0] for r in results]),
+            V=np.array([r[4][:,0] for r in results]),D=np.array([r[5][:,0] for r in results]),
+            Pavg=np.array([r[6] for r in results]),Qavg=np.array([r[7] for r in results]),
+            Ploss=np.array([r[8] for r in results]),Qloss=np.array([r[9] for r in results]));
+    return buf.getvalue();
+
+'''
+Delta from its JSON form, lists are turned into arrays
+'''
+def Delta(delta):
+    out = {};
+    for key in ['P','Q','V']:
+        if key in delta:
+            out[key] = (np.asarray(delta[key]['Bus No']),np.asarray(delta[key]['value'],dtype=float));
+    if 'outages' in delta:
+        out['outages'] = list(delta['outages']);
+    return out;
+
+class Handler(BaseHTTPRequestHandler):
+
+    '''
+    HTTP/JSON front of the Service
+
+    POST /case    {"bus":{column:[...]},"line":{column:[...]}} or {"busfile":..,"nwfile":..}
+                  -> {"case":id,"buses":N,"lines":L}
+    POST /solve   {"case":id,"deltas":[delta,...],"MaxIter":20,"Vlimit":true,"Qlimit":true,"format":"json"}
+                  a delta has any of "P"/"Q"/"V":{"Bus No":[...],"value":[...]} and "outages":[Line No]
+                  -> {"results":[...]} or an .npz archive with "format":"npz"
+    GET  /metrics -> counters, latency and throughput
+    GET  /health  -> {"status":"ok"}
+    '''
+    service = None;
+    protocol_version = 'HTTP/1.1';
+
+    def do_GET(self):
+        t = time.time();
+        if self.path == '/metrics':
+            self.__Reply(200,self.service.Metrics(),t);
+        elif self.path == '/health':
+            self.__Reply(200,{'status':'ok'},t);
+        else:
+            self.__Reply(404,{'error':'Unknown path ' + self.path},t);
+
+    def do_POST(self):
+        t = time.time();
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length',0))) or b'{}');
+            if self.path == '/case':
+                key,n,l = self.service.Case(body.get('bus'),body.get('line'),body.get('busfile'),body.get('nwfile'));
+                self.__Reply(200,{'case':key,'buses':n,'lines':l},t);
+            elif self.path == '/solve':
+                deltas = [Delta(delta) for delta in body.get('deltas',[{}])];
+                case,results = self.service.Solve(body['case'],deltas,body.get('MaxIter',20),
+                        body.get('Vlimit',True),body.get('Qlimit',True));
+                if body.get('format','json') == 'npz':
+                    self.__Reply(200,EncodeBinary(case,results),t,'application/octet-stream');
+                else:
+                    self.__Reply(200,{'results':[Encode(case,result) for result in results]},t);
+            else:
+                self.__Reply(404,{'error':'Unknown path ' + self.path},t);
+        except (ValueError,KeyError,TypeError) as err:
+            self.__Reply(400,{'error':str(err).strip('"')},t);
+        except Exception as err:
+            self.__Reply(500,{'error':str(err)},t);
+
+    def __Reply(self,code,body,t,ctype='application/json'):
+        if ctype == 'application/json':
+            body = json.dumps(body).encode();
+        self.service.Record(time.time()-t,code >= 400);
+        self.send_response(code);
+        self.send_header('Content-Type',ctype);
+        self.send_header('Content-Length',str(len(body)));
+        self.end_headers();
+        self.wfile.write(body);
+
+    def log_message(self,format,*args):
+        pass;
+
+'''
+Start the service on host:port, host has to be a loopback address
+Returns the HTTP server, serve_forever() runs it
+'''
+def Serve(port=8642,host='127.0.0.1',Workers=None):
+    if host not in LOOPBACK:
+        raise ValueError("The service only listens on localhost");
+    Handler.service = Service(Workers);
+    server = ThreadingHTTPServer((host,port),Handler);
+    server.daemon_threads = True;
+    return server;
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8642;
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None;
+    server = Serve(port,Workers=workers);
+    print("Load flow service on http://127.0.0.1:" + str(port));
+    try:
+        server.serve_forever();
+    except KeyboardInterrupt:
+        pass;
+    finally:
+        server.server_close();
+        Handler.service.Close();
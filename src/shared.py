@@ -0,0 +1,203 @@
+'''
+Load FLow Analyser
+Copyright (C) 2020 Akshay Arvind Laturkar
+
+Date Created : 19 October 2026 -- Version 1.2.0
+
+This program is free software: you can redistribute it
+and/or modify it under the terms of the GNU General
+Public License as published by the Free Software
+Foundation, either version 3 of the License, or
+any later version.
+
+This program is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the
+implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE.  See the GNU General Public License
+for more details.
+
+You should have received a copy of the GNU General Public
+License along with this program.
+If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+File Version History
+V1.2.0 : October 19, 2026
+         Network published once as memory mapped files for process pool workers
+         Results can be reduced in the workers instead of returned
+         Attachments of removed networks are dropped by the workers
+'''
+
+
+import numpy as np;
+import os;
+import shutil;
+import tempfile;
+from concurrent.futures import ProcessPoolExecutor;
+import loadflow as solver;
+import incremental;
+from resultstore import ResultStore,EncodeBusType;
+
+# Networks attached in this process, by directory
+ATTACHED = {};
+
+class SharedCase:
+
+    '''
+    Network published once as memory mapped .npy files in a directory
+
+    Arguments are the same as for loadflow.LoadFlow, T is Lx1 Matrix of tap ratios
+    and Case the compiled loadflow.Case (compiled from YBus if not given).
+    path is the directory to publish into, a temporary one is made if not given.
+
+    The bus arrays, line table and the arrays of the compiled Case are written once.
+    Worker processes attach them read only with Attach(), the pages are shared through
+    the page cache, so nothing but Handle() and the per task delta is pickled to a worker.
+    A delta is dictionary with any of
+        'P','Q','V' -- (Bus No, values) setting Pg-Pd, Qg-Qd or V (setpoint) of those buses
+        'outages'   -- Line No of lines out of service
+        'Warm'      -- (V,D) to warm start from
+    '''
+    def __init__(self,N,P,Q,V,BT,YBus,MaxIter,Vlimit,Qlimit,Line,BNo,T=None,Case=None,path=None):
+        Line = np.asarray(Line,dtype=float).reshape((-1,6));
+        BNo = np.asarray(BNo).reshape((N,1));
+        if Case is None:
+            Case = solver.Compile(np.asarray(YBus).reshape((N,N)),Line,BNo);
+        if T is None:
+            T = np.ones(len(Line));
+        if path is None:
+            path = tempfile.mkdtemp(prefix='loadflow_');
+        elif not os.path.isdir(path):
+            os.makedirs(path);
+        self.path = path;
+        self.n = N;
+        self.l = len(Line);
+
+        arrays = Case.Arrays();
+        arrays.update({'P':np.asarray(P,dtype=float).reshape((N,1)),'Q':np.asarray(Q,dtype=float).reshape((N,4)),
+                'V':np.asarray(V,dtype=float).reshape((N,3)),'BT':EncodeBusType(BT).reshape((N,1)),
+                'Line':Line,'BNo':BNo,'T':np.asarray(T,dtype=float).flatten()});
+        for name,arr in arrays.items():
+            arr = np.asarray(arr);
+            out = np.lib.format.open_memmap(path+'/'+name+'.npy',mode='w+',dtype=arr.dtype,shape=arr.shape);
+            out[...] = arr;
+            out.flush();
+            del out;
+        self.handle = {'path':path,'names':list(arrays),'ordering':Case.ordering,
+                'MaxIter':MaxIter,'Vlimit':Vlimit,'Qlimit':Qlimit};
+
+    '''
+    SharedCase of a network.Network
+    '''
+    @classmethod
+    def FromNetwork(cls,net,MaxIter,Vlimit,Qlimit,path=None):
+        return cls(*net.Args(MaxIter,Vlimit,Qlimit),T=net.T,Case=net.Compile(),path=path);
+
+    '''
+    Small picklable description of the published network, what a worker needs to attach
+    '''
+    def Handle(self):
+        return self.handle;
+
+    '''
+    Solve the network for every delta in deltas over Workers processes
+    If store is given (resultstore.ResultStore), delta number s is written to scenario s
+    by the worker itself and iterations taken are returned, else LoadFlow.Solve() results
+    If Reducer is given (reducers.Reducer), results are added to it as scenario s instead,
+    each worker fills an Empty() copy over a run of deltas, and Reducer is returned
+    '''
+    def Map(self,deltas,store=None,Workers=None,Reducer=None):
+        spath = None if store is None else store.path;
+        if store is not None:
+            store.Flush();
+        tasks = [(self.handle,s,delta,spath) for s,delta in enumerate(deltas)];
+        chunk = max(1,len(tasks)//(4*(Workers or os.cpu_count() or 1)));
+        if Reducer is not None:
+            tasks = [(tasks[k:k+chunk],Reducer.Empty()) for k in range(0,len(tasks),chunk)];
+            if Workers == 1:
+                parts = [ReduceTask(task) for task in tasks];
+            else:
+                with ProcessPoolExecutor(max_workers=Workers,initializer=Attach,initargs=(self.handle,)) as pool:
+                    parts = list(pool.map(ReduceTask,tasks));
+            for part in parts:
+                Reducer.Merge(part);
+            return Reducer;
+        if Workers == 1:
+            return [SolveTask(task) for task in tasks];
+        with ProcessPoolExecutor(max_workers=Workers,initializer=Attach,initargs=(self.handle,)) as pool:
+            return list(pool.map(SolveTask,tasks,chunksize=chunk));
+
+    '''
+    Delete the published files
+    '''
+    def Remove(self):
+        Detach(self.handle);
+        shutil.rmtree(self.path,ignore_errors=True);
+
+    def __enter__(self):
+        return self;
+
+    def __exit__(self,*args):
+        self.Remove();
+
+
+'''
+Attach a published network in this process, kept for the later tasks of the process
+Returns incremental.Incremental editor on the read only arrays, its Case is not recompiled
+'''
+def Attach(handle):
+    path = handle['path'];
+    if path not in ATTACHED:
+        # Networks whose files were removed while this process had them attached are dropped
+        for old in [old for old in ATTACHED if not os.path.isdir(old)]:
+            ATTACHED.pop(old);
+        arr = {name:np.load(path+'/'+name+'.npy',mmap_mode='r') for name in handle['names']};
+        case = solver.Case.FromArrays(arr,arr['BNo'],handle['ordering']);
+        ATTACHED[path] = incremental.Incremental(len(arr['BNo']),arr['P'],arr['Q'],arr['V'],arr['BT'],None,
+                handle['MaxIter'],handle['Vlimit'],handle['Qlimit'],arr['Line'],arr['BNo'],arr['T'],Case=case);
+    return ATTACHED[path];
+
+'''
+Forget a network attached in this process
+'''
+def Detach(handle):
+    ATTACHED.pop(handle['path'],None);
+
+'''
+Solve one task (handle, scenario, delta, result store directory or None) in a worker
+'''
+def SolveTask(task):
+    handle,s,delta,spath = task;
+    inc = Attach(handle);
+    inc.Reset();
+    inc.Max = handle['MaxIter'];
+    inc.Vlimit = handle['Vlimit'];
+    inc.Qlimit = handle['Qlimit'];
+    for key,col in [('P',inc.P),('Q',inc.Q),('V',inc.V)]:
+        if key in delta:
+            BNo,val = delta[key];
+            col[inc.bmap[BNo],0] = val;
+    for lno in delta.get('outages',[]):
+        inc.RemoveLine(lno);
+    result = inc.Solve(Warm=delta.get('Warm'));
+    if spath is None:
+        return result;
+    store = ResultStore.Open(spath,'r+');
+    store.Write(s,result);
+    store.Flush();
+    return result[0];
+
+'''
+Solve a run of tasks in a worker, adding each result to reducer, returns reducer
+'''
+def ReduceTask(task):
+    tasks,reducer = task;
+    for handle,s,delta,spath in tasks:
+        result = SolveTask((handle,s,delta,None));
+        if spath is not None:
+            store = ResultStore.Open(spath,'r+');
+            store.Write(s,result);
+            store.Flush();
+        reducer.Add(result,s);
+    return reducer;
@@ -0,0 +1,169 @@
+'''
+Load FLow Analyser
+Copyright (C) 2020 Akshay Arvind Laturkar
+
+Date Created : 19 October 2026 -- Version 1.2.0
+
+This program is free software: you can redistribute it
+and/or modify it under the terms of the GNU General
+Public License as published by the Free Software
+Foundation, either version 3 of the License, or
+any later version.
+
+This program is distributed in the hope that it will be
+useful, but WITHOUT ANY WARRANTY; without even the
+implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE.  See the GNU General Public License
+for more details.
+
+You should have received a copy of the GNU General Public
+License along with this program.
+If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+File Version History
+V1.2.0 : October 19, 2026
+         Island detection, slack assignment per island and parallel solve of islands
+         Connected networks are solved directly on the compiled Case
+         Bus types handled as integer codes, network arrays taken without copying
+         Arbitrary Bus No, island YBus taken by bus feed row
+         Warm start passed on to every island
+'''
+
+
+import numpy as np;
+import scipy.sparse as sp;
+from scipy.sparse.csgraph import connected_components;
+from concurrent.futures import ProcessPoolExecutor;
+import loadflow as solver;
+from resultstore import EncodeBusType,DecodeBusType,PV,SLACK;
+
+'''
+Connected components of the network
+Line is Lx6 Matrix as LNo,From Bus,To Bus,B/2,R,X and BNo is Nx1 Matrix
+Returns (no. of islands, Nx1 island label per bus in BNo order)
+'''
+def Islands(N,Line,BNo):
+    Line = np.asarray(Line,dtype=float).reshape((-1,6));
+    bmap = solver.IndexMap(BNo);
+    i = bmap[Line[:,1]];
+    j = bmap[Line[:,2]];
+    graph = sp.csr_matrix((np.ones(len(Line)),(i,j)),shape=(N,N));
+    count,labels = connected_components(graph,directed=False);
+    return count,labels;
+
+class Topology:
+
+    '''
+    Islands of the network with one slack bus per live island
+    An island without a slack gets its PV bus with the largest P as slack,
+    extra slack buses in an island become PV buses.
+    Islands without any Slack or PV bus, and single bus islands, are dead
+    '''
+    def __init__(self,N,P,BT,Line,BNo):
+        self.n = N;
+        self.BT = EncodeBusType(BT).astype(np.int8).reshape((N,1));
+        P = np.asarray(P,dtype=float).reshape((N,1));
+        self.count,self.labels = Islands(N,Line,BNo);
+        self.dead = np.zeros(self.count,dtype=bool);
+        self.slack = np.full(self.count,-1,dtype=np.int64);
+        for isl in range(0,self.count):
+            buses = np.where(self.labels == isl)[0];
+            bt = self.BT[buses,0];
+            slack = buses[bt == SLACK];
+            pv = buses[bt == PV];
+            if len(buses) < 2 or (len(slack) == 0 and len(pv) == 0):
+                self.dead[isl] = True;
+                continue;
+            if len(slack) == 0:
+                self.slack[isl] = pv[np.argmax(P[pv,0])];
+            else:
+                self.slack[isl] = slack[0];
+                self.BT[slack[1:],0] = PV;
+            self.BT[self.slack[isl],0] = SLACK;
+
+    '''
+    Bus indices of every live island
+    '''
+    def LiveIslands(self):
+        return [np.where(self.labels == isl)[0] for isl in range(0,self.count) if not self.dead[isl]];
+
+
+'''
+Solve one island, args are the LoadFlow arguments with buses renumbered 1..n
+followed by the warm start (or None)
+'''
+def SolveIsland(args):
+    return solver.LoadFlow(*args[:11],Warm=args[11]).Solve();
+
+'''
+Solve a network that may be split into islands
+Arguments are the same as for loadflow.LoadFlow, each live island is solved on its
+own (in parallel over Workers processes when there is more than one island) and
+the results are merged back into the usual bus and line outputs.
+Dead buses are reported with V = 0 and lines of dead islands with zero flow.
+Iterations reported are the maximum over islands.
+Case is the compiled loadflow.Case of the whole network, used when it is a single island
+Warm is (V,D) of a previous solution to start from, as for loadflow.LoadFlow
+'''
+def Solve(N,P,Q,V,BT,YBus,MaxIter,Vlimit,Qlimit,Line,BNo,Workers=None,store=None,scenario=None,Case=None,Warm=None):
+    P = np.asarray(P,dtype=float).reshape((N,1));
+    Q = np.asarray(Q,dtype=float).reshape((N,4));
+    V = np.asarray(V,dtype=float).reshape((N,3));
+    YBus = np.asarray(YBus).reshape((N,N));
+    Line = np.asarray(Line,dtype=float).reshape((-1,6));
+    BNo = np.asarray(BNo).reshape((N,1));
+    topo = Topology(N,P,BT,Line,BNo);
+    if topo.count == 1 and not topo.dead[0]:
+        result = solver.LoadFlow(N,P,Q,V,topo.BT,YBus,MaxIter,Vlimit,Qlimit,Line,BNo,Case=Case,Warm=Warm).Solve();
+        if store is not None:
+            store.Write(scenario,result);
+        return result;
+
+    bmap = solver.IndexMap(BNo);
+    lisland = topo.labels[bmap[Line[:,1]]];
+
+    tasks = [];
+    lines = [];
+    islands = topo.LiveIslands();
+    for buses in islands:
+        local = np.zeros(N,dtype=np.int64);
+        local[buses] = np.arange(1,len(buses)+1);
+        lidx = np.where(lisland == topo.labels[buses[0]])[0];
+        L = Line[lidx].copy();
+        L[:,1] = local[bmap[L[:,1]]];
+        L[:,2] = local[bmap[L[:,2]]];
+        tasks.append((len(buses),P[buses],Q[buses],V[buses],topo.BT[buses],YBus[np.ix_(buses,buses)],
+            MaxIter,Vlimit,Qlimit,L,np.arange(1,len(buses)+1).reshape((len(buses),1)),
+            None if Warm is None else (np.asarray(Warm[0]).reshape((N,-1))[buses],np.asarray(Warm[1]).reshape((N,-1))[buses])));
+        lines.append(lidx);
+
+    if len(tasks) > 1 and Workers != 1:
+        with ProcessPoolExecutor(max_workers=Workers) as pool:
+            results = list(pool.map(SolveIsland,tasks));
+    else:
+        results = [SolveIsland(task) for task in tasks];
+
+    rBT = DecodeBusType(topo.BT[:,0]).reshape((N,1));
+    rP = P.copy();
+    rQ = Q.copy();
+    rV = V.copy();
+    rV[:,0] = 0;
+    rD = np.zeros((N,1));
+    flows = [np.zeros(len(Line)) for idx in range(0,4)];
+    countVal = 0;
+    for buses,lidx,result in zip(islands,lines,results):
+        countVal = max(countVal,result[0]);
+        rBT[buses] = result[1];
+        rP[buses] = result[2];
+        rQ[buses] = result[3];
+        rV[buses] = result[4];
+        rD[buses] = result[5];
+        for idx in range(0,4):
+            flows[idx][lidx] = result[6+idx];
+
+    result = [countVal,rBT,rP,rQ,rV,rD]+flows;
+    if store is not None:
+        store.Write(scenario,result);
+    return result;